@@ -18,7 +18,17 @@ st.markdown("A governance intelligence interface for exploring compositions and
 # Load Memory
 # ─────────────────────────────────────────────────────────────
 memory_path = Path("library/domains/urban_permitting/denpasar_v1")
-memory = PolarisMemory(memory_path)
+
+
+@st.cache_resource
+def load_memory(path: str, lazy: bool = True) -> PolarisMemory:
+    # One instance shared by every rerun and session; refresh() below picks up file edits.
+    # Lazy: payloads are read from the snapshot only when a view uses them
+    return PolarisMemory(Path(path), lazy=lazy)
+
+
+memory = load_memory(str(memory_path))
+memory.refresh()
 
 if st.sidebar.checkbox("🛠 Show Debug Info"):
     st.code(f"📁 MEMORY PATH → {memory.memory_path}")
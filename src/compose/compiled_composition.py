@@ -0,0 +1,267 @@
+# src/compose/compiled_composition.py
+
+import json
+import hashlib
+import weakref
+import numpy as np
+import networkx as nx
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from models.typed_edge import TypedEdge
+
+COMPILED_CACHE_SIZE = 64
+
+
+def composition_payload(composition: MemoryObject) -> dict:
+    """
+    Return the inner composition dict.
+    Compositions loaded from disk nest it under `data`; freshly exported ones don't.
+    """
+    return composition.data.get("data", composition.data)
+
+
+def composition_content_hash(composition: MemoryObject) -> str:
+    """
+    Stable SHA-256 of the composition payload (modules, edges, overlays, title...).
+    """
+    blob = json.dumps(composition_payload(composition), sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def normalize_edges(edge_raw: List) -> List[TypedEdge]:
+    """
+    Normalize legacy [from, to] pairs and typed edge dicts into TypedEdges.
+    """
+    typed_edges: List[TypedEdge] = []
+    for edge in edge_raw:
+        if isinstance(edge, (list, tuple)) and len(edge) == 2:
+            # Legacy (from, to) edge
+            typed_edges.append(TypedEdge(from_node=edge[0], to_node=edge[1], type="dependency"))
+        elif isinstance(edge, dict):
+            # Already typed
+            typed_edges.append(TypedEdge(**{"type": "dependency", **edge}))
+        else:
+            print(f"⚠️ Invalid edge format: {edge}")
+    return typed_edges
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, n: int, edge_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build (indptr, indices, edge ids) CSR arrays for the adjacency rows → cols.
+    """
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32), edge_ids[order].astype(np.int32)
+
+
+def _topological_order(indptr: np.ndarray, indices: np.ndarray, in_degree: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Kahn's algorithm over the CSR successor lists. Returns None if the graph has a cycle.
+    """
+    remaining = in_degree.copy()
+    queue = deque(np.flatnonzero(remaining == 0).tolist())
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for succ in indices[indptr[node]:indptr[node + 1]].tolist():
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                queue.append(succ)
+    if len(order) < len(in_degree):
+        return None
+    return np.asarray(order, dtype=np.int32)
+
+
+def _level_groups(
+    order: np.ndarray,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    edge_ids: np.ndarray
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Group nodes by depth along `order` (depth 0 = no neighbours in `indices`).
+
+    For every depth ≥ 1 returns (nodes, neighbours, offsets, edges): the nodes
+    at that depth, their concatenated neighbour lists, the start offset of each
+    node's segment (ready for `np.maximum.reduceat`-style reductions) and the
+    edge id behind each neighbour entry. Group i holds depth i + 1.
+    """
+    depth = np.zeros(len(indptr) - 1, dtype=np.int64)
+    for node in order.tolist():
+        neighbours = indices[indptr[node]:indptr[node + 1]]
+        if len(neighbours):
+            depth[node] = depth[neighbours].max() + 1
+
+    groups = []
+    for level in range(1, int(depth.max(initial=0)) + 1):
+        nodes = np.flatnonzero(depth == level).astype(np.int32)
+        spans = [(indptr[v], indptr[v + 1]) for v in nodes.tolist()]
+        offsets = np.cumsum([0] + [end - start for start, end in spans[:-1]]).astype(np.int64)
+        groups.append((
+            nodes,
+            np.concatenate([indices[start:end] for start, end in spans]).astype(np.int32),
+            offsets,
+            np.concatenate([edge_ids[start:end] for start, end in spans]).astype(np.int32),
+        ))
+    return groups
+
+
+def _read_only(*arrays: np.ndarray) -> None:
+    for arr in arrays:
+        arr.setflags(write=False)
+
+
+class CompiledComposition:
+    """
+    Immutable, pre-indexed view of a Composition SDMO.
+
+    Nodes are the declared modules followed by any edge endpoints that were not
+    declared, addressed by integer index. Holds successor/predecessor CSR arrays,
+    the topological order (None if cyclic), sources/sinks/isolates and the
+    resolved module and overlay objects.
+
+    `feedback_loop` edges point back upstream by design, so they are kept out
+    of the precedence CSR, the topological order and the schedule (they are
+    listed in `feedback_edges`); isolates still count them. Build it through `compile_composition`
+    so simulation, interpretation and diagnostics share one instance.
+    """
+
+    def __init__(self, composition: MemoryObject, memory: PolarisMemory, content_hash: Optional[str] = None):
+        payload = composition_payload(composition)
+
+        self.composition_id = composition.id
+        self.content_hash = content_hash or composition_content_hash(composition)
+        self.title = payload.get("title")
+        self.jurisdiction = payload.get("jurisdiction") or composition.jurisdiction
+        self.created_by = payload.get("created_by")
+
+        self.module_ids: Tuple[str, ...] = tuple(payload.get("modules", []))
+        self.edges: Tuple[TypedEdge, ...] = tuple(normalize_edges(payload.get("edges", [])))
+
+        nodes = list(dict.fromkeys(self.module_ids))
+        seen = set(nodes)
+        for edge in self.edges:
+            for node in (edge.from_node, edge.to_node):
+                if node not in seen:
+                    seen.add(node)
+                    nodes.append(node)
+        self.nodes: Tuple[str, ...] = tuple(nodes)
+        self.index: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+
+        n = len(self.nodes)
+        self.edge_src = np.array([self.index[e.from_node] for e in self.edges], dtype=np.int32)
+        self.edge_dst = np.array([self.index[e.to_node] for e in self.edges], dtype=np.int32)
+        self.edge_types: Tuple[str, ...] = tuple(e.type for e in self.edges)
+
+        is_feedback = np.array([t == "feedback_loop" for t in self.edge_types], dtype=bool)
+        self.feedback_edges = np.flatnonzero(is_feedback).astype(np.int32)
+        precedence = np.flatnonzero(~is_feedback).astype(np.int32)
+        src, dst = self.edge_src[precedence], self.edge_dst[precedence]
+
+        self.succ_indptr, self.succ_indices, self.succ_edges = _csr(src, dst, n, precedence)
+        self.pred_indptr, self.pred_indices, self.pred_edges = _csr(dst, src, n, precedence)
+        self.in_degree = np.diff(self.pred_indptr)
+        self.out_degree = np.diff(self.succ_indptr)
+
+        touched = np.bincount(self.edge_src, minlength=n) + np.bincount(self.edge_dst, minlength=n)
+        self.sources = np.flatnonzero(self.in_degree == 0).astype(np.int32)
+        self.sinks = np.flatnonzero(self.out_degree == 0).astype(np.int32)
+        self.isolates = np.flatnonzero(touched == 0).astype(np.int32)
+
+        self.topological_order = _topological_order(self.succ_indptr, self.succ_indices, self.in_degree)
+        self.is_dag = self.topological_order is not None
+
+        _read_only(
+            self.edge_src, self.edge_dst, self.feedback_edges,
+            self.succ_indptr, self.succ_indices, self.succ_edges,
+            self.pred_indptr, self.pred_indices, self.pred_edges,
+            self.in_degree, self.out_degree, self.sources, self.sinks, self.isolates,
+        )
+        if self.is_dag:
+            _read_only(self.topological_order)
+
+        # Resolved references
+        self.modules: Dict[str, MemoryObject] = {}
+        for mid in self.module_ids:
+            obj = memory.get_by_id(mid)
+            if obj:
+                self.modules[mid] = obj
+
+        def resolve_ids(ids: List[str]) -> Tuple[MemoryObject, ...]:
+            return tuple(memory.get_by_id(i) for i in ids if memory.get_by_id(i))
+
+        self.symbolic_scaffolds = resolve_ids(payload.get("symbolic_scaffolds", []))
+        self.override_protocols = resolve_ids(payload.get("override_protocols", []))
+        self.feedback_loops = resolve_ids(payload.get("feedback_loops", []))
+        self.failure_events = resolve_ids(payload.get("failure_events", []))
+
+        self._memory_ref = weakref.ref(memory)
+        self.generation = getattr(memory, "generation", 0)
+        self._graph: Optional[nx.DiGraph] = None
+        self._schedule = None
+
+    @property
+    def memory(self) -> Optional[PolarisMemory]:
+        return self._memory_ref()
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        """
+        Frozen NetworkX view of the composition, built on first access.
+        """
+        if self._graph is None:
+            graph = nx.DiGraph()
+            graph.add_nodes_from(self.nodes)
+            for edge in self.edges:
+                graph.add_edge(edge.from_node, edge.to_node, edge_type=edge.type, label=edge.label)
+            self._graph = nx.freeze(graph)
+        return self._graph
+
+    @property
+    def schedule(self) -> Tuple[list, list]:
+        """
+        Level groups for vectorized critical-path passes, built on first access.
+        Returns (forward, backward): forward groups nodes by depth from the
+        sources over predecessors, backward by height above the sinks over
+        successors.
+        """
+        if self._schedule is None:
+            if not self.is_dag:
+                raise ValueError("Composition graph contains cycles.")
+            self._schedule = (
+                _level_groups(self.topological_order, self.pred_indptr, self.pred_indices, self.pred_edges),
+                _level_groups(self.topological_order[::-1], self.succ_indptr, self.succ_indices, self.succ_edges),
+            )
+        return self._schedule
+
+    def node_ids(self, indices) -> List[str]:
+        return [self.nodes[i] for i in indices]
+
+    def permitting_modules(self) -> Dict[str, MemoryObject]:
+        return {mid: obj for mid, obj in self.modules.items() if obj.object_type == "PermittingModule"}
+
+
+_compiled_cache: "OrderedDict[Tuple[str, str], CompiledComposition]" = OrderedDict()
+
+
+def compile_composition(composition: MemoryObject, memory: PolarisMemory) -> CompiledComposition:
+    """
+    Return the CompiledComposition for this SDMO, reusing a cached one when the
+    id and content hash match and it was resolved against the same memory, at
+    the same generation (modules and overlays are resolved at compile time).
+    """
+    key = (composition.id, composition_content_hash(composition))
+    compiled = _compiled_cache.get(key)
+    if compiled is not None and compiled.memory is memory and compiled.generation == getattr(memory, "generation", 0):
+        _compiled_cache.move_to_end(key)
+        return compiled
+
+    compiled = CompiledComposition(composition, memory, content_hash=key[1])
+    _compiled_cache[key] = compiled
+    while len(_compiled_cache) > COMPILED_CACHE_SIZE:
+        _compiled_cache.popitem(last=False)
+    return compiled
@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 from memory.polaris_memory import PolarisMemory
 from memory.models import MemoryObject
 from models.typed_edge import TypedEdge
+from compose.compiled_composition import compile_composition
 
 
 class CompositionEngine:
@@ -99,25 +100,13 @@ class CompositionEngine:
             edges.append(typed_edge)
 
         # ✅ Collect semantic/control-layer links
-        symbolic_ids = {
-            obj.id for obj in self.memory.get_by_type("SymbolicScaffold")
-            if obj.data.get("module_id") in module_ids
-        }
-        override_ids = {
-            obj.data.get("override_id") or obj.id
-            for obj in self.memory.get_by_type("OverrideProtocol")
-            if obj.data.get("module_id") in module_ids
-        }
-        feedback_ids = {
-            obj.data.get("loop_id") or obj.id
-            for obj in self.memory.get_by_type("FeedbackLoop")
-            if obj.data.get("trigger_module_id") in module_ids
-        }
-        failure_ids = {
-            obj.data.get("failure_id") or obj.id
-            for obj in self.memory.get_by_type("FailureEvent")
-            if obj.data.get("module_id") in module_ids
-        }
+        def linked(object_type: str, field: str) -> List[MemoryObject]:
+            return [obj for mid in module_ids for obj in self.memory.get_linked(mid, object_type, field)]
+
+        symbolic_ids = {obj.id for obj in linked("SymbolicScaffold", "module_id")}
+        override_ids = {obj.data.get("override_id") or obj.id for obj in linked("OverrideProtocol", "module_id")}
+        feedback_ids = {obj.data.get("loop_id") or obj.id for obj in linked("FeedbackLoop", "trigger_module_id")}
+        failure_ids = {obj.data.get("failure_id") or obj.id for obj in linked("FailureEvent", "module_id")}
 
         # Collect typed edges from current graph
         edges = []
@@ -150,10 +139,7 @@ class CompositionEngine:
             (obj.id, obj.data.get("module_id")) for obj in self.memory.get_by_type("SymbolicScaffold")
         ])
 
-        print("✅ MATCHED SCAFFOLDS:", [
-            obj.id for obj in self.memory.get_by_type("SymbolicScaffold")
-            if obj.data.get("module_id") in module_ids
-        ])
+        print("✅ MATCHED SCAFFOLDS:", sorted(symbolic_ids))
 
         print("🧠 DEBUG: All memory object types:")
         for obj in self.memory.objects.values():
@@ -185,48 +171,19 @@ def load_composition_extended(composition: MemoryObject, memory: PolarisMemory):
     """
     Load a saved composition SDMO and reconstruct the full composition context.
     Returns a dict with graph, modules, edges, and any attached semantic/control-layer objects.
+    The graph is the shared, frozen graph of the compiled composition.
     """
-    graph = nx.DiGraph()
-    modules = {}
-    edge_raw = composition.data.get("edges", [])
-    
-    typed_edges: List[TypedEdge] = []
-
-    # Backward compatibility: tuple or dict
-    for edge in edge_raw:
-        if isinstance(edge, list) and len(edge) == 2:
-            # Legacy (from, to) edge
-            typed_edges.append(TypedEdge(from_node=edge[0], to_node=edge[1], type="dependency"))
-        elif isinstance(edge, dict):
-            # Already typed
-            typed_edges.append(TypedEdge(**edge))
-        else:
-            print(f"⚠️ Invalid edge format: {edge}")
-
-    # Build the graph using validated typed edges
-    for edge in typed_edges:
-        graph.add_edge(edge.from_node, edge.to_node, edge_type=edge.type, label=edge.label)
-
-    module_ids = composition.data.get("modules", [])
-    graph.add_nodes_from(module_ids)
-
-    for mid in module_ids:
-        obj = memory.objects.get(mid)
-        if obj:
-            modules[mid] = obj
-
-    def resolve_ids(ids: List[str]) -> List[MemoryObject]:
-        return [memory.objects.get(i) for i in ids if memory.objects.get(i)]
+    compiled = compile_composition(composition, memory)
 
     return {
-        "graph": graph,
-        "modules": modules,
-        "edges": typed_edges,
-        "symbolic_scaffolds": resolve_ids(composition.data.get("symbolic_scaffolds", [])),
-        "override_protocols": resolve_ids(composition.data.get("override_protocols", [])),
-        "feedback_loops": resolve_ids(composition.data.get("feedback_loops", [])),
-        "failure_events": resolve_ids(composition.data.get("failure_events", [])),
-        "title": composition.data.get("title"),
-        "created_by": composition.data.get("created_by"),
-        "jurisdiction": composition.data.get("jurisdiction")
-    }
\ No newline at end of file
+        "graph": compiled.graph,
+        "modules": dict(compiled.modules),
+        "edges": list(compiled.edges),
+        "symbolic_scaffolds": list(compiled.symbolic_scaffolds),
+        "override_protocols": list(compiled.override_protocols),
+        "feedback_loops": list(compiled.feedback_loops),
+        "failure_events": list(compiled.failure_events),
+        "title": compiled.title,
+        "created_by": compiled.created_by,
+        "jurisdiction": compiled.jurisdiction
+    }
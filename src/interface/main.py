@@ -1,5 +1,6 @@
 # [top unchanged imports...]
 import argparse
+import json
 import sys
 import re
 from pathlib import Path
@@ -10,13 +11,29 @@ from copy import deepcopy
 # ...
 from memory.polaris_memory import PolarisMemory
 from compose.composition_engine import CompositionEngine
+from compose.compiled_composition import compile_composition
 from compose.graphviz_export import export_graph
 from compose.interactive_export import export_interactive_dag
-import networkx as nx
+from simulate.simulation_engine import run_simulation
+from simulate.batch import run_simulation_batch, select_compositions, write_batch_results
+from simulate.capacity import (
+    ARRIVAL_PROCESSES, DEFAULT_ACTOR_CAPACITY, DEFAULT_ARRIVAL_RATE, QUEUE_DISCIPLINES, run_capacity_simulation
+)
+from simulate.comparison import compare_jurisdictions, comparison_table
+from simulate.parameters import DEFAULT_CONDITIONAL_SKIP_RATE, DURATION_MODELS
+from simulate.reform_sweep import run_reform_sweep
+from simulate.result_cache import default_cache
+from simulate.sampling import SAMPLING_STRATEGIES
+from simulate.sensitivity import run_sensitivity
 
 print("✅ Running main.py from:", __file__)
 
 MEMORY_PATH = (Path.cwd().parent / "library" / "domains" / "urban_permitting" / "denpasar_v1").resolve()
+# Set by --lazy: open memory from its snapshot and read SDMO payloads on demand
+LAZY_MEMORY = False
+
+def load_memory() -> PolarisMemory:
+    return PolarisMemory(MEMORY_PATH, lazy=LAZY_MEMORY)
 
 # ----- Utility Helpers -----
 
@@ -51,7 +68,7 @@ def resolve_composition_id(memory: PolarisMemory, partial_id: str) -> str:
 # ----- Core Commands -----
 
 def preview_composition(composition_id: str):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     resolved_id = resolve_composition_id(memory, composition_id)
     if not resolved_id: return
     obj = memory.get_by_id(resolved_id)
@@ -80,7 +97,7 @@ def list_compositions(memory: PolarisMemory):
         print(f"    └─ Jurisdiction: {comp.jurisdiction}\n")
 
 def compose_jurisdiction(jurisdiction: str, title: str = None, created_by: str = "CLI"):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     engine = CompositionEngine(memory)
 
     if not title:
@@ -106,7 +123,7 @@ def compose_jurisdiction(jurisdiction: str, title: str = None, created_by: str =
     print(f"\n✅ Composition '{composition.id}' created and saved.")
 
 def visualize(composition_id: str, html: bool = False):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     resolved_id = resolve_composition_id(memory, composition_id)
     if not resolved_id: return
     composition = memory.get_by_id(resolved_id)
@@ -121,7 +138,7 @@ def visualize(composition_id: str, html: bool = False):
         export_interactive_dag(edges, modules, memory, Path("visuals") / f"{resolved_id}.html")
 
 def export_composition(composition_id: str, export_dir: str = None):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     resolved_id = resolve_composition_id(memory, composition_id)
     if not resolved_id: return
     path = Path(export_dir) if export_dir else None
@@ -129,30 +146,238 @@ def export_composition(composition_id: str, export_dir: str = None):
     print(f"\n✅ Exported to: {export_path}")
 
 def diagnose_composition(composition_id: str):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     resolved_id = resolve_composition_id(memory, composition_id)
     if not resolved_id: return
-    obj = memory.get_by_id(resolved_id)
-    data = obj.data.get("data", obj.data)
-    modules = data.get("modules", [])
-    edges = data.get("edges", [])
-    G = nx.DiGraph()
-    G.add_nodes_from(modules)
-    G.add_edges_from(edges)
+    compiled = compile_composition(memory.get_by_id(resolved_id), memory)
     print(f"\n🧠 Running diagnostics for: {resolved_id}")
-    if not nx.is_directed_acyclic_graph(G):
+    if not compiled.is_dag:
         print("❌ Graph contains a cycle.")
     else:
         print("✅ Graph is acyclic.")
-    disconnected = list(nx.isolates(G))
+    disconnected = compiled.node_ids(compiled.isolates)
     if disconnected:
         print(f"⚠️ Disconnected nodes: {disconnected}")
     else:
         print("✅ All nodes are connected.")
-    print(f"🧱 Nodes: {len(modules)} | 🔗 Edges: {len(edges)}")
+    print(f"🧱 Nodes: {len(compiled.module_ids)} | 🔗 Edges: {len(compiled.edges)}")
+
+def simulate_composition(
+    composition_id: str,
+    runs: int = 1000,
+    workers: int = 1,
+    seed: int = None,
+    params: dict = None,
+    target_half_width: float = None,
+    target_metric: str = "mean",
+    record: bool = False,
+    use_cache: bool = True,
+    deadline: float = None
+):
+    memory = load_memory()
+    resolved_id = resolve_composition_id(memory, composition_id)
+    if not resolved_id: return
+    composition = memory.get_by_id(resolved_id)
+    print(f"\n🎲 Simulating {resolved_id}: {runs} runs on {workers} worker(s)")
+    result = run_simulation(
+        composition, memory, params, runs=runs, seed=seed, workers=workers,
+        target_half_width=target_half_width, target_metric=target_metric, record=record,
+        use_cache=use_cache, deadline=deadline
+    )
+    print(f"🌱 Seed: {result['seed']}")
+    if record:
+        print(f"💾 Result record: {result['record_id']}")
+    if result["convergence"]:
+        conv = result["convergence"]
+        status = "✅ converged" if conv["converged"] else "⚠️ run cap reached"
+        print(f"🎯 {status} after {result['runs']} runs: {conv['metric']} ± {conv['half_width']:.2f} days")
+    print(f"⏱️ Average completion time: {result['avg_duration']:.2f} days")
+    print(f"🧮 Average summed effort: {result['avg_effort']:.2f} days")
+    sampling = result["sampling"]
+    if sampling["strategy"] != "random" and sampling["variance_reduction"]["mean"] is not None:
+        factors = sampling["variance_reduction"]
+        print(
+            f"📉 {sampling['strategy']} variance reduction: mean {factors['mean']:.1f}x"
+            + (f", P90 {factors['p90']:.1f}x" if factors["p90"] is not None else "")
+            + f" (≈ {sampling['effective_runs']['mean']:.0f} plain runs)"
+        )
+    quantiles = result["distribution"]["quantiles"]
+    print("📈 Completion time quantiles: " + ", ".join(f"{q} {days:.0f}" for q, days in quantiles.items()))
+    if result["deadline"]:
+        print(f"📅 P(finish within {result['deadline']['days']:g} days): {result['deadline']['probability']:.1%}")
+    print("🔁 Runs with rework per module:")
+    for mid, count in result["failures"].items():
+        print(f"   - {mid}: {count} (slack {result['slack'][mid]:.1f} days)")
+
+def simulate_batch(
+    patterns: list = None,
+    jurisdiction: str = None,
+    runs: int = 1000,
+    workers: int = 1,
+    seed: int = None,
+    params: dict = None,
+    output: str = None,
+    use_cache: bool = True,
+    deadline: float = None
+):
+    memory = load_memory()
+    compositions = select_compositions(memory, patterns, jurisdiction)
+    if not compositions:
+        print("❌ No compositions matched.")
+        return
+    print(f"\n🎲 Simulating {len(compositions)} composition(s): {runs} runs each on {workers} worker(s)")
+    rows = run_simulation_batch(
+        compositions, memory, params, runs=runs, seed=seed, workers=workers, use_cache=use_cache, deadline=deadline
+    )
+    for row in rows:
+        if row["error"]:
+            print(f"   ❌ {row['composition_id']}: {row['error']}")
+            continue
+        result = row["result"]
+        source = " (cached)" if row["cached"] else ""
+        print(
+            f"   ⏱️ {row['composition_id']}: {result['avg_duration']:.1f} days "
+            f"(P90 {result['completion_time']['p90']:.0f}){source}"
+        )
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    path = Path(output) if output else Path("export") / f"simulation_batch_{timestamp}.json"
+    write_batch_results(rows, path, params, deadline)
+    print(f"📁 Batch results written to: {path}")
+
+def parse_assignments(pairs: list, cast=str) -> dict:
+    """
+    ["DLH Bali=2", ...] → {"DLH Bali": 2}
+    """
+    assignments = {}
+    for pair in pairs or []:
+        name, _, value = pair.rpartition("=")
+        if not name:
+            raise ValueError(f"Expected NAME=VALUE, got '{pair}'")
+        assignments[name.strip()] = cast(value.strip())
+    return assignments
+
+def simulate_capacity(
+    composition_id: str,
+    projects: int = 1_000,
+    arrival_rate: float = DEFAULT_ARRIVAL_RATE,
+    arrival_process: str = "poisson",
+    capacity: list = None,
+    disciplines: list = None,
+    default_capacity: int = DEFAULT_ACTOR_CAPACITY,
+    seed: int = None,
+    params: dict = None
+):
+    memory = load_memory()
+    resolved_id = resolve_composition_id(memory, composition_id)
+    if not resolved_id: return
+    composition = memory.get_by_id(resolved_id)
+    report = run_capacity_simulation(
+        composition, memory, params, projects=projects, arrival_rate=arrival_rate,
+        arrival_process=arrival_process, actor_capacity=parse_assignments(capacity, int),
+        queue_disciplines=parse_assignments(disciplines), default_capacity=default_capacity, seed=seed
+    )
+    cycle = report["cycle_time"]
+    print(f"\n🏭 Capacity simulation for {resolved_id}: {projects} projects at {arrival_rate:g}/day (seed {report['seed']})")
+    print(f"🏁 Throughput: {report['throughput']:.4f} projects/day over {report['horizon']:.0f} days")
+    print(f"⏱️ Cycle time: mean {cycle['mean']:.1f}, P50 {cycle['p50']:.1f}, P90 {cycle['p90']:.1f} days")
+    print(f"⏳ Mean queued time per project: {report['mean_project_wait']:.1f} days")
+    if report["unstable"]:
+        print("🚨 Demand exceeds capacity: lower --arrival-rate or add reviewers (--capacity)")
+    print("👥 Actors (busiest first):")
+    for name, actor in sorted(report["actors"].items(), key=lambda item: -item[1]["utilization"]):
+        print(
+            f"   - {name} ×{actor['capacity']} {actor['discipline']}: {actor['utilization']:.0%} busy "
+            f"(offered load {actor['offered_load']:.2f}), "
+            f"queue avg {actor['mean_queue_length']:.1f} / max {actor['max_queue_length']}, "
+            f"wait avg {actor['mean_wait']:.1f} / P90 {actor['p90_wait']:.1f} days"
+        )
+
+def sweep_reforms(
+    composition_id: str,
+    runs: int = 10_000,
+    max_combination: int = 1,
+    workers: int = 1,
+    seed: int = None,
+    params: dict = None
+):
+    memory = load_memory()
+    resolved_id = resolve_composition_id(memory, composition_id)
+    if not resolved_id: return
+    composition = memory.get_by_id(resolved_id)
+    sweep = run_reform_sweep(
+        composition, memory, params, runs=runs, max_combination=max_combination, seed=seed, workers=workers
+    )
+    print(f"\n🧪 Reform sweep for {resolved_id}: {len(sweep['scenarios'])} scenarios × {sweep['runs']} runs")
+    print(f"📏 Baseline: {sweep['baseline']['avg_duration']:.1f} days (P90 {sweep['baseline']['p90_duration']:.0f})")
+    for rank, row in enumerate(sweep["scenarios"], start=1):
+        print(
+            f"{rank:>3}. {row['days_saved']:7.1f} days saved "
+            f"[{row['ci_low']:.1f}, {row['ci_high']:.1f}] → {' + '.join(row['reforms'])}"
+        )
+
+def sensitivity_report(
+    composition_id: str,
+    runs: int = 2_000,
+    delta: float = 0.2,
+    workers: int = 1,
+    seed: int = None,
+    params: dict = None
+):
+    memory = load_memory()
+    resolved_id = resolve_composition_id(memory, composition_id)
+    if not resolved_id: return
+    composition = memory.get_by_id(resolved_id)
+    report = run_sensitivity(composition, memory, params, runs=runs, delta=delta, seed=seed, workers=workers)
+    print(f"\n🔬 Sensitivity for {resolved_id}: {report['runs']} runs, ±{delta:.0%} (baseline {report['baseline']:.1f} days)")
+    for rank, row in enumerate(report["bottlenecks"], start=1):
+        print(
+            f"{rank:>3}. {row['module_id']}: swing {row['swing']:.1f} days "
+            f"(duration {row['duration_low']:+.1f}/{row['duration_high']:+.1f}, "
+            f"failure {row['failure_low']:+.1f}/{row['failure_high']:+.1f}) "
+            f"r={row['correlation']:.2f} S1={row['first_order']:.2f}"
+        )
+
+def jurisdiction_entry(spec: str) -> tuple:
+    """
+    "DIR" or "DIR=COMPOSITION_ID" → (directory, composition id or None).
+    Directories that don't exist as given are looked up next to the default library.
+    """
+    path, _, composition_id = spec.partition("=")
+    path = Path(path)
+    if not path.is_dir() and (MEMORY_PATH.parent / path).is_dir():
+        path = MEMORY_PATH.parent / path
+    return path, composition_id or None
+
+def compare_jurisdiction_flows(
+    specs: list,
+    runs: int = 10_000,
+    seed: int = None,
+    params: dict = None,
+    deadline: float = None,
+    output: str = None
+):
+    report = compare_jurisdictions(
+        [jurisdiction_entry(spec) for spec in specs], params, runs=runs, seed=seed, deadline=deadline
+    )
+    labels = [j["label"] for j in report["jurisdictions"]]
+    print(f"\n🌏 Comparing {len(labels)} jurisdiction(s) on shared role streams: {report['runs']} runs (seed {report['seed']})")
+    for j in report["jurisdictions"]:
+        print(f"   - {j['label']}: {j['composition_id']} ({j['modules']} modules)")
+    width = max(len(label) for label in labels) + 2
+    print(f"\n{'':<48}" + "".join(f"{label:>{width}}" for label in labels))
+    for row in comparison_table(report):
+        cells = "".join(f"{'—' if row[label] is None else format(row[label], '.1f'):>{width}}" for label in labels)
+        print(f"{shorten(row['row'], 46):<48}{cells}")
+    for j in report["jurisdictions"][1:]:
+        print(f"📐 {j['label']} vs {report['baseline']}: {j['difference']:+.1f} days [{j['ci_low']:+.1f}, {j['ci_high']:+.1f}]")
+    if output:
+        path = Path(output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        print(f"📁 Comparison written to: {path}")
 
 def tag_object(object_id: str, tag: str):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     resolved_id = resolve_composition_id(memory, object_id)
     if not resolved_id: return
     obj = memory.get_by_id(resolved_id)
@@ -161,17 +386,16 @@ def tag_object(object_id: str, tag: str):
     print(f"🏷️ Tag '{tag}' added to '{obj.id}'")
 
 def delete_object(object_id: str):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     resolved_id = resolve_composition_id(memory, object_id)
     if not resolved_id: return
-    if resolved_id in memory.objects:
-        del memory.objects[resolved_id]
+    if memory.delete_object(resolved_id):
         print(f"🗑️ Deleted '{resolved_id}' from memory.")
     else:
         print(f"❌ Object '{resolved_id}' not found.")
 
 def clone_object(object_id: str):
-    memory = PolarisMemory(MEMORY_PATH)
+    memory = load_memory()
     resolved_id = resolve_composition_id(memory, object_id)
     if not resolved_id: return
     obj = memory.get_by_id(resolved_id)
@@ -179,14 +403,58 @@ def clone_object(object_id: str):
     memory.save_object(clone)
     print(f"📦 Cloned '{resolved_id}' → '{clone.id}'")
 
+def clear_simulation_cache():
+    cache = default_cache()
+    cache.clear()
+    print(f"🧹 Cleared simulation cache: {cache.directory}")
+
 def launch_ui():
     print("🌐 Launching Interence Studio (coming soon...)")
     print("📦 Try: streamlit run studio/app.py")
 
 # ----- CLI Entry -----
 
+def add_simulation_params(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--min-duration", type=int, default=5)
+    parser.add_argument("--max-duration", type=int, default=20)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--max-loops", type=int, default=2)
+    parser.add_argument("--duration-model", choices=list(DURATION_MODELS), default="uniform",
+                        help="triangular/lognormal draw around each module's duration_days")
+    parser.add_argument("--module-risk", action="store_true",
+                        help="Use FailureEvent severity and FeedbackLoop stability per module")
+    parser.add_argument("--override-days", type=float,
+                        help="Threshold for discretionary overrides and override edges")
+    parser.add_argument("--no-overrides", action="store_true", help="Ignore override protocols and edges")
+    parser.add_argument("--conditional-skip-rate", type=float, default=DEFAULT_CONDITIONAL_SKIP_RATE)
+    parser.add_argument("--feedback-rate", type=float, help="Chance a feedback_loop edge fires (default: failure rate)")
+
+def simulation_params(args) -> dict:
+    params = {
+        "task_duration_range": (args.min_duration, args.max_duration),
+        "failure_rate": args.failure_rate,
+        "max_feedback_loops": args.max_loops,
+        "duration_model": args.duration_model,
+        "module_risk": args.module_risk,
+        "apply_overrides": not args.no_overrides,
+        "conditional_skip_rate": args.conditional_skip_rate,
+    }
+    if args.override_days is not None:
+        params["override_days"] = args.override_days
+    if args.feedback_rate is not None:
+        params["feedback_rate"] = args.feedback_rate
+    if getattr(args, "sampling", "random") != "random":
+        params["sampling"] = args.sampling
+    return params
+
+def add_sampling_param(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--sampling", choices=list(SAMPLING_STRATEGIES), default="random",
+                        help="Variance reduction: antithetic pairs, Latin hypercube or Sobol points")
+
 def main():
     parser = argparse.ArgumentParser(description="Interence OS CLI Interface")
+    parser.add_argument("--lazy", action="store_true",
+                        help="Load SDMO payloads on demand from the memory snapshot (faster start, smaller footprint)")
     subparsers = parser.add_subparsers(dest="command")
 
     subparsers.add_parser("list-compositions", help="List all stored compositions")
@@ -209,6 +477,67 @@ def main():
     diag_parser = subparsers.add_parser("diagnose")
     diag_parser.add_argument("composition_id")
 
+    sim_parser = subparsers.add_parser("simulate")
+    sim_parser.add_argument("composition_id")
+    sim_parser.add_argument("--runs", type=int, default=1000)
+    sim_parser.add_argument("--workers", type=int, default=1)
+    sim_parser.add_argument("--seed", type=int)
+    add_simulation_params(sim_parser)
+    add_sampling_param(sim_parser)
+    sim_parser.add_argument("--target-half-width", type=float, help="Stop once the CI half-width (days) is reached; --runs becomes the cap")
+    sim_parser.add_argument("--metric", choices=["mean", "p90"], default="mean")
+    sim_parser.add_argument("--record", action="store_true", help="Save a SimulationResult record (reused for identical seeded requests)")
+    sim_parser.add_argument("--no-cache", action="store_true", help="Always simulate, bypassing the result cache")
+    sim_parser.add_argument("--deadline", type=float, help="Report the probability of finishing within this many days")
+
+    batch_parser = subparsers.add_parser("simulate-batch", help="Simulate many compositions in one process")
+    batch_parser.add_argument("composition_ids", nargs="*", help="Composition ids or globs (default: all)")
+    batch_parser.add_argument("--jurisdiction", help="Only compositions for this jurisdiction")
+    batch_parser.add_argument("--runs", type=int, default=1000)
+    batch_parser.add_argument("--workers", type=int, default=1)
+    batch_parser.add_argument("--seed", type=int)
+    add_simulation_params(batch_parser)
+    add_sampling_param(batch_parser)
+    batch_parser.add_argument("--deadline", type=float, help="Report the probability of finishing within this many days")
+    batch_parser.add_argument("--output", help="Results file (default: export/simulation_batch_<timestamp>.json)")
+    batch_parser.add_argument("--no-cache", action="store_true", help="Always simulate, bypassing the result cache")
+
+    cap_parser = subparsers.add_parser("simulate-capacity", help="Queue many projects through capacity-limited actors")
+    cap_parser.add_argument("composition_id")
+    cap_parser.add_argument("--projects", type=int, default=1_000)
+    cap_parser.add_argument("--arrival-rate", type=float, default=DEFAULT_ARRIVAL_RATE, help="Projects arriving per day")
+    cap_parser.add_argument("--arrival-process", choices=ARRIVAL_PROCESSES, default="poisson")
+    cap_parser.add_argument("--capacity", action="append", metavar="ACTOR=N", help="Reviewers for an actor (repeatable)")
+    cap_parser.add_argument("--default-capacity", type=int, default=DEFAULT_ACTOR_CAPACITY)
+    cap_parser.add_argument("--discipline", action="append", metavar="ACTOR=RULE", help=f"Queue rule for an actor: {', '.join(QUEUE_DISCIPLINES)}")
+    cap_parser.add_argument("--seed", type=int)
+    add_simulation_params(cap_parser)
+
+    sweep_parser = subparsers.add_parser("sweep", help="Rank reform combinations by simulated days saved")
+    sweep_parser.add_argument("composition_id")
+    sweep_parser.add_argument("--runs", type=int, default=10_000)
+    sweep_parser.add_argument("--max-combination", type=int, default=1)
+    sweep_parser.add_argument("--workers", type=int, default=1)
+    sweep_parser.add_argument("--seed", type=int)
+    add_simulation_params(sweep_parser)
+
+    sens_parser = subparsers.add_parser("sensitivity", help="Rank modules by their effect on completion time")
+    sens_parser.add_argument("composition_id")
+    sens_parser.add_argument("--runs", type=int, default=2_000)
+    sens_parser.add_argument("--delta", type=float, default=0.2, help="Relative perturbation (0.2 = ±20%%)")
+    sens_parser.add_argument("--workers", type=int, default=1)
+    sens_parser.add_argument("--seed", type=int)
+    add_simulation_params(sens_parser)
+
+    cmp_parser = subparsers.add_parser("compare-jurisdictions", help="Simulate several jurisdictions side by side")
+    cmp_parser.add_argument("jurisdictions", nargs="+", metavar="DIR[=COMPOSITION_ID]",
+                            help="Jurisdiction directories (first is the baseline); default composition is the largest")
+    cmp_parser.add_argument("--runs", type=int, default=10_000)
+    cmp_parser.add_argument("--seed", type=int)
+    add_simulation_params(cmp_parser)
+    cmp_parser.add_argument("--deadline", type=float, help="Report the probability of finishing within this many days")
+    cmp_parser.add_argument("--output", help="Also write the full comparison as JSON")
+
     tag_parser = subparsers.add_parser("tag")
     tag_parser.add_argument("object_id")
     tag_parser.add_argument("tag")
@@ -219,12 +548,15 @@ def main():
     clone_parser = subparsers.add_parser("clone")
     clone_parser.add_argument("object_id")
 
+    subparsers.add_parser("clear-cache", help="Delete cached simulation results")
     subparsers.add_parser("launch-ui")
 
     args = parser.parse_args()
+    global LAZY_MEMORY
+    LAZY_MEMORY = args.lazy
 
     if args.command == "list-compositions":
-        memory = PolarisMemory(MEMORY_PATH)
+        memory = load_memory()
         list_compositions(memory)
     elif args.command == "compose":
         compose_jurisdiction(args.jurisdiction, args.title, args.created_by)
@@ -236,12 +568,41 @@ def main():
         preview_composition(args.composition_id)
     elif args.command == "diagnose":
         diagnose_composition(args.composition_id)
+    elif args.command == "simulate":
+        simulate_composition(
+            args.composition_id, args.runs, args.workers, args.seed, simulation_params(args),
+            args.target_half_width, args.metric, args.record, not args.no_cache, args.deadline
+        )
+    elif args.command == "simulate-batch":
+        simulate_batch(
+            args.composition_ids, args.jurisdiction, args.runs, args.workers, args.seed, simulation_params(args),
+            args.output, not args.no_cache, args.deadline
+        )
+    elif args.command == "simulate-capacity":
+        simulate_capacity(
+            args.composition_id, args.projects, args.arrival_rate, args.arrival_process, args.capacity,
+            args.discipline, args.default_capacity, args.seed, simulation_params(args)
+        )
+    elif args.command == "sweep":
+        sweep_reforms(
+            args.composition_id, args.runs, args.max_combination, args.workers, args.seed, simulation_params(args)
+        )
+    elif args.command == "sensitivity":
+        sensitivity_report(
+            args.composition_id, args.runs, args.delta, args.workers, args.seed, simulation_params(args)
+        )
+    elif args.command == "compare-jurisdictions":
+        compare_jurisdiction_flows(
+            args.jurisdictions, args.runs, args.seed, simulation_params(args), args.deadline, args.output
+        )
     elif args.command == "tag":
         tag_object(args.object_id, args.tag)
     elif args.command == "delete":
         delete_object(args.object_id)
     elif args.command == "clone":
         clone_object(args.object_id)
+    elif args.command == "clear-cache":
+        clear_simulation_cache()
     elif args.command == "launch-ui":
         launch_ui()
     else:
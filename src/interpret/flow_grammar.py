@@ -1,28 +1,23 @@
 # src/interpret/flow_grammar.py
 
 import networkx as nx
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from memory.models import MemoryObject
 from memory.polaris_memory import PolarisMemory
+from compose.compiled_composition import compile_composition
 
-def interpret_flow(composition: MemoryObject, memory: PolarisMemory) -> Dict:
+# Modules on the simulated critical path in at least this share of runs are bottlenecks.
+BOTTLENECK_THRESHOLD = 0.5
+
+def interpret_flow(composition: MemoryObject, memory: PolarisMemory, criticality: Optional[Dict] = None) -> Dict:
     """
     Run semantic and structural validation on a Composition SDMO.
     Returns a canonical interpretation output.
+    Pass a simulation result's `criticality` to tag measured bottlenecks.
     """
-    modules = composition.data.get("modules", [])
-    edge_dicts = composition.data.get("edges", [])
-
-    # Extract edge tuples safely
-    edges = [
-        (e["from_node"], e["to_node"])
-        for e in edge_dicts
-        if isinstance(e, dict) and "from_node" in e and "to_node" in e
-    ]
-
-    graph = nx.DiGraph()
-    graph.add_nodes_from(modules)
-    graph.add_edges_from(edges)
+    compiled = compile_composition(composition, memory)
+    modules = list(compiled.module_ids)
+    graph = compiled.graph
 
     errors = []
     warnings = []
@@ -33,7 +28,7 @@ def interpret_flow(composition: MemoryObject, memory: PolarisMemory) -> Dict:
         errors.extend(dag_errors)
 
     # Orphan / disconnected module check
-    disconnected = list(nx.isolates(graph))
+    disconnected = compiled.node_ids(compiled.isolates)
     for module_id in disconnected:
         module_obj = memory.get_by_id(module_id)
         optional = module_obj and module_obj.data.get("optional", False)
@@ -42,6 +37,8 @@ def interpret_flow(composition: MemoryObject, memory: PolarisMemory) -> Dict:
 
     # Semantic tagging
     tags = tag_modules(modules, memory)
+    if criticality:
+        tag_bottlenecks(tags, criticality)
 
     # Fragility analysis
     fragile_paths = detect_fragile_paths(graph, tags)
@@ -53,9 +50,10 @@ def interpret_flow(composition: MemoryObject, memory: PolarisMemory) -> Dict:
         "warnings": warnings,
         "summary": {
             "module_count": len(modules),
-            "edge_count": len(edges),
+            "edge_count": len(compiled.edges),
             "symbolic_modules": symbolic_modules,
             "fragile_paths": fragile_paths,
+            "bottleneck_modules": [m for m, t in tags.items() if "bottleneck" in t],
             "disconnected_modules": disconnected
         },
         "tags": tags
@@ -89,25 +87,34 @@ def tag_modules(modules: List[str], memory: PolarisMemory) -> Dict[str, List[str
     """
     tags = {}
 
-    symbolic_ids = {obj.data.get("module_id") for obj in memory.get_by_type("SymbolicScaffold")}
-    override_ids = {obj.data.get("module_id") for obj in memory.get_by_type("OverrideProtocol")}
-    feedback_ids = {
-        obj.data.get("trigger_module_id") for obj in memory.get_by_type("FeedbackLoop")
-    }
-
     for module_id in modules:
         module_tags = []
-        if module_id in symbolic_ids:
+        if memory.get_linked(module_id, "SymbolicScaffold", "module_id"):
             module_tags.append("symbolic")
-        if module_id in override_ids:
+        if memory.get_linked(module_id, "OverrideProtocol", "module_id"):
             module_tags.append("override_risk")
-        if module_id in feedback_ids:
+        if memory.get_linked(module_id, "FeedbackLoop", "trigger_module_id"):
             module_tags.append("feedback_trigger")
         tags[module_id] = module_tags
 
     return tags
 
 
+def tag_bottlenecks(
+    tags: Dict[str, List[str]],
+    criticality: Dict[str, Dict[str, float]],
+    threshold: float = BOTTLENECK_THRESHOLD
+) -> Dict[str, List[str]]:
+    """
+    Add a "bottleneck" tag to modules whose simulated critical fraction
+    (see `run_simulation`) is at least `threshold`.
+    """
+    for module_id, stats in criticality.items():
+        if module_id in tags and stats.get("critical_fraction", 0) >= threshold:
+            tags[module_id].append("bottleneck")
+    return tags
+
+
 def detect_fragile_paths(graph: nx.DiGraph, tags: Dict[str, List[str]]) -> List[List[str]]:
     """
     Identify edges where fragility might occur (e.g. symbolic to override).
@@ -1,23 +1,205 @@
 # src/memory/index.py
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 from .models import MemoryObject
 
+# Data fields through which overlays (failures, loops, overrides, reforms,
+# scaffolds) point at the PermittingModule they belong to.
+LINK_FIELDS = ("module_id", "trigger_module_id", "original_module_id")
+
 
 class MemoryIndex:
     """
-    Lightweight indexing utility for tag-based lookups.
+    Hash indexes over the objects of a PolarisMemory:
+    - tag_index: tag → object ids
+    - type_index: object_type → object ids
+    - jurisdiction_index: (jurisdiction, version) → object ids; version None
+      collects every version of the jurisdiction
+    - link_index: (module id, link field) → ids of objects pointing at that
+      module through one of LINK_FIELDS; field None collects every field
+
+    Id collections are dicts used as insertion-ordered sets: adds, removals
+    and lookups are O(1) and results keep load order. `query_tags` combines
+    tags with AND / OR / NOT.
+    `index` re-indexes an object from scratch, so it is also how changes
+    (tags, type, links) are picked up; `unindex` forgets it.
     """
 
+    STATE = ("tag_index", "type_index", "jurisdiction_index", "link_index", "_entries")
+
     def __init__(self):
-        self.tag_index: Dict[str, List[str]] = {}
+        self.tag_index: Dict[str, Dict[str, None]] = {}
+        self.type_index: Dict[str, Dict[str, None]] = {}
+        self.jurisdiction_index: Dict[Tuple[Optional[str], Optional[str]], Dict[str, None]] = {}
+        self.link_index: Dict[Tuple[str, Optional[str]], Dict[str, None]] = {}
+        # object id → the index entries it is filed under
+        self._entries: Dict[str, set] = {}
+
+    @staticmethod
+    def entries(obj: MemoryObject) -> set:
+        entries = {
+            ("type", obj.object_type),
+            ("jurisdiction", (obj.jurisdiction, obj.version)),
+            ("jurisdiction", (obj.jurisdiction, None)),
+        }
+        entries.update(("tag", tag) for tag in obj.tags)
+        for field in LINK_FIELDS:
+            target = obj.data.get(field)
+            # A module's own module_id is its identity, not a link
+            if isinstance(target, str) and target != obj.id:
+                entries.add(("link", (target, field)))
+                entries.add(("link", (target, None)))
+        return entries
+
+    def _id_sets(self, kind: str) -> dict:
+        return {
+            "tag": self.tag_index,
+            "type": self.type_index,
+            "jurisdiction": self.jurisdiction_index,
+            "link": self.link_index,
+        }[kind]
+
+    def _add(self, object_id: str, entry: tuple) -> None:
+        kind, key = entry
+        self._id_sets(kind).setdefault(key, {})[object_id] = None
+
+    def _remove(self, object_id: str, entry: tuple) -> None:
+        kind, key = entry
+        index = self._id_sets(kind)
+        ids = index.get(key, {})
+        ids.pop(object_id, None)
+        if not ids:
+            index.pop(key, None)
+
+    def index(self, obj: MemoryObject, object_id: Optional[str] = None) -> None:
+        object_id = object_id or obj.id
+        old = self._entries.get(object_id, set())
+        new = self.entries(obj)
+        for entry in old - new:
+            self._remove(object_id, entry)
+        for entry in new - old:
+            self._add(object_id, entry)
+        self._entries[object_id] = new
 
-    def index(self, obj: MemoryObject) -> None:
-        for tag in obj.tags:
-            if tag not in self.tag_index:
-                self.tag_index[tag] = []
-            if obj.id not in self.tag_index[tag]:
-                self.tag_index[tag].append(obj.id)
+    def state(self) -> Dict[str, dict]:
+        """
+        Every index as plain dicts, sets and tuples (see `from_state`).
+        """
+        return {name: getattr(self, name) for name in self.STATE}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, dict]) -> "MemoryIndex":
+        index = cls()
+        for name in cls.STATE:
+            setattr(index, name, state[name])
+        return index
+
+    def unindex(self, object_id: str) -> None:
+        for entry in self._entries.pop(object_id, set()):
+            self._remove(object_id, entry)
 
     def get_by_tag(self, tag: str) -> List[str]:
-        return self.tag_index.get(tag, [])
+        return list(self.tag_index.get(tag, ()))
+
+    def query_tags(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Ids tagged with every `all_of` tag, at least one `any_of` tag (when
+        given) and no `none_of` tag. With only `none_of`, every indexed
+        object is a candidate. Cost follows the smallest candidate set, not
+        the store size.
+        """
+        required = [self.tag_index.get(tag, {}) for tag in all_of]
+        optional = [self.tag_index.get(tag, {}) for tag in any_of]
+        excluded = [self.tag_index.get(tag, {}) for tag in none_of]
+
+        if required:
+            required.sort(key=len)
+            candidates = required.pop(0)
+        elif optional:
+            candidates = {}
+            for ids in optional:
+                candidates.update(ids)
+            optional = []
+        else:
+            candidates = self._entries
+        return [
+            object_id for object_id in candidates
+            if all(object_id in ids for ids in required)
+            and (not optional or any(object_id in ids for ids in optional))
+            and not any(object_id in ids for ids in excluded)
+        ]
+
+    def get_by_type(self, object_type: str) -> List[str]:
+        return list(self.type_index.get(object_type, ()))
+
+    def get_by_jurisdiction(self, jurisdiction: Optional[str], version: Optional[str] = None) -> List[str]:
+        return list(self.jurisdiction_index.get((jurisdiction, version), ()))
+
+    def get_linked(self, module_id: str, field: Optional[str] = None) -> List[str]:
+        return list(self.link_index.get((module_id, field), ()))
+
+
+class IndexedObjects(dict):
+    """
+    The id → MemoryObject map of a PolarisMemory. Every write and delete
+    goes through the MemoryIndex, so code that assigns into `memory.objects`
+    directly keeps the indexes consistent. Edits made inside an object
+    after it was stored (its data or tags) need `MemoryIndex.index` again.
+    """
+
+    def __init__(self, index: MemoryIndex, objects: Optional[Dict[str, MemoryObject]] = None):
+        super().__init__()
+        self._index = index
+        self.update(objects or {})
+
+    @classmethod
+    def restore(cls, index: MemoryIndex, objects: Dict[str, MemoryObject]) -> "IndexedObjects":
+        """
+        Wrap objects that `index` already covers, without re-indexing them.
+        """
+        restored = cls(index)
+        dict.update(restored, objects)
+        return restored
+
+    def __setitem__(self, object_id: str, obj: MemoryObject) -> None:
+        super().__setitem__(object_id, obj)
+        self._index.index(obj, object_id)
+
+    def __delitem__(self, object_id: str) -> None:
+        super().__delitem__(object_id)
+        self._index.unindex(object_id)
+
+    def pop(self, object_id: str, *default):
+        if object_id not in self:
+            if default:
+                return default[0]
+            raise KeyError(object_id)
+        obj = self[object_id]
+        del self[object_id]
+        return obj
+
+    def popitem(self):
+        object_id = next(reversed(self))
+        return object_id, self.pop(object_id)
+
+    def setdefault(self, object_id: str, obj: MemoryObject = None):
+        if object_id not in self:
+            self[object_id] = obj
+        return self[object_id]
+
+    def update(self, objects=(), **more) -> None:
+        items: Iterable = objects.items() if hasattr(objects, "items") else objects
+        for object_id, obj in list(items) + list(more.items()):
+            self[object_id] = obj
+
+    def clear(self) -> None:
+        for object_id in list(self):
+            del self[object_id]
+
+    def __reduce__(self):
+        return IndexedObjects, (MemoryIndex(), dict(self))
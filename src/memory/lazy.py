@@ -0,0 +1,111 @@
+# src/memory/lazy.py
+
+import marshal
+import mmap
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from pydantic import PrivateAttr
+
+from .index import MemoryIndex
+from .models import MemoryObject
+from .snapshot import Manifest, Sources, header_objects, read_snapshot_table, snapshot_path, table_sources
+
+# Payloads kept materialized at once in lazy mode.
+DEFAULT_PAYLOAD_CACHE = 1024
+
+
+class PayloadStore:
+    """
+    The payload region of a snapshot, memory-mapped. Each object's `data`
+    is decoded the first time it is read; the `capacity` most recently
+    decoded payloads stay resident and older ones are dropped, to be decoded
+    again on their next read.
+    """
+
+    def __init__(self, path: Path, start: int, offsets: List[int], capacity: int = DEFAULT_PAYLOAD_CACHE):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.start = start
+        self.offsets = offsets
+        self.capacity = capacity
+        self._resident: "OrderedDict[int, LazyMemoryObject]" = OrderedDict()
+        self.loads = 0
+
+    @property
+    def resident(self) -> int:
+        return len(self._resident)
+
+    def load(self, obj: "LazyMemoryObject") -> dict:
+        slot = obj._slot
+        data = marshal.loads(self._map[self.start + self.offsets[slot]:self.start + self.offsets[slot + 1]])
+        obj.__dict__["data"] = data
+        self.loads += 1
+        self._resident[slot] = obj
+        while len(self._resident) > self.capacity:
+            _, evicted = self._resident.popitem(last=False)
+            evicted.__dict__.pop("data", None)
+        return data
+
+    def pin(self, obj: "LazyMemoryObject") -> None:
+        """
+        Keep an object's payload for good (it was edited in place).
+        """
+        self._resident.pop(obj._slot, None)
+
+
+class LazyMemoryObject(MemoryObject):
+    """
+    A MemoryObject from a snapshot whose `data` is read from the payload
+    store on first access. Treat it as read-only: edits made inside `data`
+    are lost if the payload is dropped from the store, so replace objects
+    through PolarisMemory (save_object, create_version) instead, or call
+    `pin` first.
+    """
+
+    _store: Optional[PayloadStore] = PrivateAttr(default=None)
+    _slot: int = PrivateAttr(default=-1)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "data" and self._store is not None:
+            return self._store.load(self)
+        return super().__getattr__(name)
+
+    def pin(self) -> dict:
+        data = self.data
+        if self._store is not None:
+            self._store.pin(self)
+        return data
+
+    def model_dump(self, **kwargs) -> dict:
+        self.data
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        self.data
+        return super().model_dump_json(**kwargs)
+
+
+def open_lazy_snapshot(
+    memory_path: Path,
+    manifest: Manifest,
+    capacity: int = DEFAULT_PAYLOAD_CACHE
+) -> Optional[Tuple[List[LazyMemoryObject], MemoryIndex, PayloadStore, Sources]]:
+    """
+    Header-only objects, the index, the payload store and the sources of a
+    snapshot that still matches `manifest`, or None.
+    """
+    found = read_snapshot_table(memory_path, manifest)
+    if found is None:
+        return None
+    table, start = found
+    try:
+        store = PayloadStore(snapshot_path(memory_path), start, table["offsets"], capacity)
+    except (OSError, ValueError):
+        return None
+    objects = header_objects(table, cls=LazyMemoryObject)
+    for slot, obj in enumerate(objects):
+        obj._store = store
+        obj._slot = slot
+    return objects, MemoryIndex.from_state(table["index"]), store, table_sources(table)
@@ -9,60 +9,226 @@ Author: Interence Core Team
 
 import os
 import json
+import threading
 from uuid import uuid4
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from .models import MemoryObject
-from .index import MemoryIndex
+from .index import IndexedObjects, MemoryIndex
+from .lazy import DEFAULT_PAYLOAD_CACHE, PayloadStore, open_lazy_snapshot
+from .snapshot import directory_manifest, read_snapshot, write_snapshot
 
 
 class PolarisMemory:
-    def __init__(self, memory_path: Path):
+    def __init__(
+        self,
+        memory_path: Path,
+        use_snapshot: bool = True,
+        lazy: bool = False,
+        payload_cache: int = DEFAULT_PAYLOAD_CACHE
+    ):
         """
         Initialize and load all SDMOs from a specified memory directory.
+        With `use_snapshot`, a snapshot of the directory is read instead
+        when one matches its files, and written after a full load.
+
+        `lazy` (which implies `use_snapshot`) loads only the header table of
+        the snapshot: each object's `data` is read the first time it's
+        accessed, and at most `payload_cache` payloads stay in memory.
         """
         self.memory_path = memory_path
+        self.lazy = lazy
+        self.use_snapshot = use_snapshot or lazy
+        self.payload_cache = payload_cache
+        self.payloads: Optional[PayloadStore] = None
+        # (size, mtime) per file as last read, the ids each file defines, and
+        # the file each loaded object came from; `refresh` diffs against these
+        self.stamps: Dict[str, Tuple[int, int]] = {}
+        self.files: Dict[str, List[str]] = {}
+        self.sources: Dict[str, str] = {}
+        self.lock = threading.RLock()
+        # Bumped by every change made through this class, so anything
+        # resolved against the memory (compiled compositions) can tell it's stale
+        self.generation = 0
         self.objects: Dict[str, MemoryObject] = {}
-        self.index = MemoryIndex()
         self.load_all()
 
+    @property
+    def objects(self) -> Dict[str, MemoryObject]:
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects: Dict[str, MemoryObject]) -> None:
+        """
+        Replace every object at once; the indexes are rebuilt to match.
+        """
+        self.index = MemoryIndex()
+        self._objects = IndexedObjects(self.index, objects)
+        self.generation = getattr(self, "generation", 0) + 1
+
     def load_all(self) -> None:
         """
         Load all JSON files in the memory directory and index them.
         """
+        manifest = directory_manifest(self.memory_path)
+        self.stamps = {name: (size, mtime) for name, size, mtime in manifest}
+        if self.use_snapshot and manifest and self.open_snapshot(manifest):
+            return
+
+        self.files, self.sources = {}, {}
         for file in self.memory_path.glob("*.json"):
-            print(f"📄 Scanning: {file.name}")
-            try:
-                with open(file, "r", encoding="utf-8") as f:
-                    content = json.load(f)
-                    if isinstance(content, list):
-                        for item in content:
-                            self._add_object(item)
-                    else:
-                        self._add_object(content)
-            except Exception as e:
-                print(f"❌ Error loading {file.name}: {e}")
-
-    def _add_object(self, raw: dict) -> None:
-        """
-        Wraps a raw governance domain object into a MemoryObject.
+            self._load_file(file.name, self._read_file(file))
+
+        # Files changed while loading would make the snapshot lie about them
+        if self.use_snapshot and manifest and manifest == directory_manifest(self.memory_path):
+            written = write_snapshot(
+                self.memory_path, manifest, list(self.objects.values()), self.index, (self.files, self.sources)
+            )
+            if written and self.lazy:
+                # Reopen from the snapshot so payloads are only held once used
+                self.open_snapshot(manifest)
+
+    def open_snapshot(self, manifest: list) -> bool:
         """
+        Replace the loaded objects with those of a snapshot matching `manifest`
+        (header-only in lazy mode). False when there is none.
+        """
+        if self.lazy:
+            snapshot = open_lazy_snapshot(self.memory_path, manifest, self.payload_cache)
+            if snapshot is None:
+                return False
+            objects, index, self.payloads, (self.files, self.sources) = snapshot
+        else:
+            snapshot = read_snapshot(self.memory_path, manifest)
+            if snapshot is None:
+                return False
+            objects, index, (self.files, self.sources) = snapshot
+        self.index = index
+        self._objects = IndexedObjects.restore(index, {obj.id: obj for obj in objects})
+        mode = " (payloads on demand)" if self.lazy else ""
+        print(f"⚡ Loaded {len(objects)} objects from snapshot of {self.memory_path}{mode}")
+        return True
+
+    def _read_file(self, file: Path) -> Optional[list]:
+        """
+        The raw objects a JSON file holds (one object or a list of them),
+        or None when it can't be read.
+        """
+        print(f"📄 Scanning: {file.name}")
         try:
-            object_id = (
-                raw.get("id") or
-                raw.get("module_id") or
-                raw.get("failure_id") or
-                raw.get("loop_id") or
-                raw.get("reform_id") or
-                raw.get("override_id") or
-                raw.get("jurisdiction_id") or
-                raw.get("actor_map_id") or
-                raw.get("scaffold_id") or
-                raw.get("term") or
-                f"auto-{uuid4().hex[:8]}"
+            with open(file, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        except Exception as e:
+            print(f"❌ Error loading {file.name}: {e}")
+            return None
+        return content if isinstance(content, list) else [content]
+
+    def _load_file(self, name: str, content: Optional[list]) -> None:
+        if content is None:
+            return
+        defined = [self._add_object(item, name) for item in content]
+        self.files[name] = list(dict.fromkeys(object_id for object_id in defined if object_id))
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """
+        Bring memory up to date with the directory by re-reading only the
+        files added, changed (size or mtime) or removed since they were last
+        read, and re-indexing the objects they define. Files sharing an id
+        with a changed file (before or after the change) are re-read with
+        it, so the copy that wins is the one a full load would keep.
+
+        Returns the ids added, updated (type, jurisdiction, version or data
+        changed) and removed. When nothing changed it costs one stat per file.
+        """
+        changes: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+        with self.lock:
+            manifest = directory_manifest(self.memory_path)
+            stamps = {name: (size, mtime) for name, size, mtime in manifest}
+            changed = {name for name in stamps.keys() | self.stamps.keys() if stamps.get(name) != self.stamps.get(name)}
+            if not changed:
+                return changes
+
+            definers: Dict[str, List[str]] = {}
+            for name, ids in self.files.items():
+                for object_id in ids:
+                    definers.setdefault(object_id, []).append(name)
+
+            contents = {name: self._read_file(self.memory_path / name) for name in changed if name in stamps}
+            pending = {object_id for name in changed for object_id in self.files.get(name, ())}
+            pending.update(
+                self._object_id(raw) for content in contents.values() if content
+                for raw in content if isinstance(raw, dict)
             )
+            reread = set(changed)
+            while pending:
+                shared = {name for object_id in pending for name in definers.get(object_id, ()) if name not in reread}
+                for name in shared:
+                    contents[name] = self._read_file(self.memory_path / name)
+                reread |= shared
+                pending = {object_id for name in shared for object_id in self.files.get(name, ())}
+
+            before = {}
+            for object_id, source in list(self.sources.items()):
+                if source in reread:
+                    before[object_id] = self.objects.pop(object_id, None)
+                    del self.sources[object_id]
+            for name in reread:
+                self.files.pop(name, None)
+            # Load order decides which copy of a shared id wins
+            for name, _, _ in manifest:
+                if name in reread:
+                    self._load_file(name, contents[name])
+            self.stamps = stamps
+
+            for name in reread:
+                for object_id in self.files.get(name, ()):
+                    if object_id not in before and object_id in self.objects and object_id not in changes["added"]:
+                        changes["added"].append(object_id)
+            for object_id, old in before.items():
+                new = self.objects.get(object_id)
+                if new is None:
+                    changes["removed"].append(object_id)
+                elif old is None:
+                    changes["added"].append(object_id)
+                elif (old.object_type, old.jurisdiction, old.version, old.data) != (new.object_type, new.jurisdiction, new.version, new.data):
+                    changes["updated"].append(object_id)
+            if any(changes.values()):
+                self.generation += 1
+        print(f"🔄 Re-read {len(reread)} file(s): {len(changes['added'])} added, "
+              f"{len(changes['updated'])} updated, {len(changes['removed'])} removed")
+        return changes
+
+    def watch(self, interval: float = 2.0, on_change: Optional[Callable[[Dict[str, List[str]]], None]] = None):
+        """
+        Start a MemoryWatcher that keeps this memory current (see `refresh`).
+        """
+        from .watch import MemoryWatcher
+        return MemoryWatcher(self, interval, on_change).start()
+
+    @staticmethod
+    def _object_id(raw: dict) -> Optional[str]:
+        return (
+            raw.get("id") or
+            raw.get("failure_id") or
+            raw.get("loop_id") or
+            raw.get("reform_id") or
+            raw.get("override_id") or
+            raw.get("jurisdiction_id") or
+            raw.get("actor_map_id") or
+            raw.get("scaffold_id") or
+            raw.get("module_id") or
+            raw.get("term")
+        )
+
+    def _add_object(self, raw: dict, source: Optional[str] = None) -> Optional[str]:
+        """
+        Wraps a raw governance domain object into a MemoryObject. Returns
+        its id, or None when it couldn't be wrapped.
+        """
+        try:
+            object_id = self._object_id(raw) or f"auto-{uuid4().hex[:8]}"
 
             obj = MemoryObject(
                 id=object_id,
@@ -80,23 +246,77 @@ class PolarisMemory:
 
             if obj.id not in self.objects or obj.object_type == "PermittingModule":
                 self.objects[obj.id] = obj
-                self.index.index(obj)
+                if source is not None:
+                    self.sources[obj.id] = source
+            return obj.id
 
         except Exception as e:
             print(f"⚠️ Failed to wrap object: {e}")
+            return None
 
     def get_by_id(self, object_id: str) -> Optional[MemoryObject]:
         return self.objects.get(object_id)
 
     def get_by_type(self, object_type: str) -> List[MemoryObject]:
-        return [obj for obj in self.objects.values() if obj.object_type == object_type]
+        return [self.objects[obj_id] for obj_id in self.index.get_by_type(object_type)]
+
+    def get_by_jurisdiction(self, jurisdiction: str, version: Optional[str] = None) -> List[MemoryObject]:
+        """
+        Objects of a jurisdiction, optionally of one version only.
+        """
+        return [self.objects[obj_id] for obj_id in self.index.get_by_jurisdiction(jurisdiction, version)]
+
+    def get_linked(self, module_id: str, object_type: Optional[str] = None, field: Optional[str] = None) -> List[MemoryObject]:
+        """
+        Overlays pointing at a module through `module_id`, `trigger_module_id`
+        or `original_module_id` (or just `field`), optionally of one type.
+        """
+        linked = (self.objects[obj_id] for obj_id in self.index.get_linked(module_id, field))
+        return [obj for obj in linked if object_type is None or obj.object_type == object_type]
 
     def query_by_tag(self, tag: str) -> List[MemoryObject]:
         ids = self.index.get_by_tag(tag)
         return [self.objects[obj_id] for obj_id in ids if obj_id in self.objects]
 
-    def query(self, filter_fn: Callable[[MemoryObject], bool]) -> List[MemoryObject]:
-        return [obj for obj in self.objects.values() if filter_fn(obj)]
+    def query_tags(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = ()
+    ) -> List[MemoryObject]:
+        """
+        Objects carrying every `all_of` tag AND at least one `any_of` tag
+        (when given) and NOT any `none_of` tag.
+        """
+        return [self.objects[obj_id] for obj_id in self.index.query_tags(all_of, any_of, none_of)]
+
+    def query(
+        self,
+        filter_fn: Optional[Callable[[MemoryObject], bool]] = None,
+        object_type: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+        version: Optional[str] = None,
+        linked_to: Optional[str] = None
+    ) -> List[MemoryObject]:
+        """
+        Objects passing `filter_fn`. The keyword filters are answered from the
+        indexes first, so `filter_fn` only sees the objects they leave.
+        """
+        if linked_to is not None:
+            candidates = self.get_linked(linked_to, object_type)
+        elif object_type is not None:
+            candidates = self.get_by_type(object_type)
+        elif jurisdiction is not None:
+            candidates = self.get_by_jurisdiction(jurisdiction, version)
+        else:
+            candidates = list(self.objects.values())
+        return [
+            obj for obj in candidates
+            if (object_type is None or obj.object_type == object_type)
+            and (jurisdiction is None or obj.jurisdiction == jurisdiction)
+            and (version is None or obj.version == version)
+            and (filter_fn is None or filter_fn(obj))
+        ]
 
     def save_object(self, obj: MemoryObject) -> None:
         """
@@ -114,7 +334,12 @@ class PolarisMemory:
                 json.dump(obj.dict(), f, indent=2, default=str)
 
             self.objects[obj.id] = obj
-            self.index.index(obj)
+            self.generation += 1
+            # Memory already holds what was written: `refresh` can skip the file
+            stat = filepath.stat()
+            self.stamps[filepath.name] = (stat.st_size, stat.st_mtime_ns)
+            self.files[filepath.name] = [obj.id]
+            self.sources[obj.id] = filepath.name
             print(f"✅ Saved object: {obj.id} → {filepath.name}")
 
         except Exception as e:
@@ -137,12 +362,24 @@ class PolarisMemory:
         if obj:
             obj.add_tag(tag)
             self.index.index(obj)
+            self.generation += 1
 
     def remove_tag(self, object_id: str, tag: str):
         obj = self.get_by_id(object_id)
         if obj:
             obj.remove_tag(tag)
             self.index.index(obj)
+            self.generation += 1
+
+    def delete_object(self, object_id: str) -> bool:
+        """
+        Drop an object from memory and its indexes (files on disk are left alone).
+        """
+        if object_id not in self.objects:
+            return False
+        del self.objects[object_id]
+        self.generation += 1
+        return True
 
     def save_all(
         self,
@@ -161,11 +398,14 @@ class PolarisMemory:
 
         export_dir.mkdir(parents=True, exist_ok=True)
 
-        filtered_objects = list(self.objects.values())
+        if only_tag:
+            filtered_objects = self.query_tags(all_of=[only_tag])
+        elif only_type:
+            filtered_objects = self.get_by_type(only_type)
+        else:
+            filtered_objects = list(self.objects.values())
         if only_type:
             filtered_objects = [obj for obj in filtered_objects if obj.object_type == only_type]
-        if only_tag:
-            filtered_objects = [obj for obj in filtered_objects if only_tag in obj.tags]
 
         grouped: Dict[str, List[MemoryObject]] = {}
         for obj in filtered_objects:
@@ -0,0 +1,146 @@
+# src/memory/snapshot.py
+
+import marshal
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .index import MemoryIndex
+from .models import MemoryObject
+
+# Written next to the SDMO files of a memory directory (hidden, so the
+# `*.json` scan never sees it).
+SNAPSHOT_NAME = ".polaris_snapshot.bin"
+
+# Layout: fixed header (magic, snapshot format, marshal format, header
+# table length), the header table, then the payload region holding each
+# object's `data` as its own marshal blob.
+SNAPSHOT_MAGIC = b"POLSNAP\0"
+SNAPSHOT_FORMAT = 3
+_HEADER = struct.Struct("<8sIIQ")
+
+# Header-table columns; one list per field, one entry per object.
+HEADER_COLUMNS = ("id", "object_type", "jurisdiction", "version", "created_by", "previous_version", "tags")
+
+Manifest = List[Tuple[str, int, int]]
+
+# file name → ids of the objects it defines, and object id → the file its
+# loaded copy came from (see PolarisMemory.refresh)
+Sources = Tuple[Dict[str, List[str]], Dict[str, str]]
+
+
+def snapshot_path(memory_path: Path) -> Path:
+    return Path(memory_path) / SNAPSHOT_NAME
+
+
+def directory_manifest(memory_path: Path) -> Manifest:
+    """
+    (file name, size, mtime in ns) of every `*.json` file, in load order.
+    Any edit, addition or removal changes it.
+    """
+    manifest = []
+    for file in Path(memory_path).glob("*.json"):
+        stat = file.stat()
+        manifest.append((file.name, stat.st_size, stat.st_mtime_ns))
+    return manifest
+
+
+def write_snapshot(
+    memory_path: Path,
+    manifest: Manifest,
+    objects: List[MemoryObject],
+    index: MemoryIndex,
+    sources: Sources = ({}, {})
+) -> Optional[Path]:
+    """
+    Store validated objects and their index: the header table holds the
+    manifest, HEADER_COLUMNS, each payload's offset in the payload region,
+    the index state and which file each object came from. Everything is marshal-encoded, which only covers
+    plain values (no pickle, nothing is executed on load), and JSON data is
+    made of nothing else. Returns None when the directory isn't writable or
+    an object holds something marshal can't encode.
+    """
+    path = snapshot_path(memory_path)
+    try:
+        payloads = [marshal.dumps(obj.data) for obj in objects]
+        offsets = [0]
+        for payload in payloads:
+            offsets.append(offsets[-1] + len(payload))
+        table = marshal.dumps({
+            "manifest": manifest,
+            "columns": {name: [getattr(obj, name) for obj in objects] for name in HEADER_COLUMNS},
+            "offsets": offsets,
+            "index": index.state(),
+            "files": sources[0],
+            "sources": sources[1],
+        })
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, marshal.version, len(table)))
+            f.write(table)
+            f.write(b"".join(payloads))
+        os.replace(tmp, path)
+        return path
+    except (OSError, ValueError):
+        return None
+
+
+def read_snapshot_table(memory_path: Path, manifest: Manifest) -> Optional[Tuple[Dict, int]]:
+    """
+    The header table of a snapshot that still matches `manifest`, and where
+    its payload region starts; None when there is no usable snapshot
+    (missing, another format, or stale). Payloads are not read.
+    """
+    try:
+        with open(snapshot_path(memory_path), "rb") as f:
+            magic, snapshot_format, marshal_version, table_size = _HEADER.unpack(f.read(_HEADER.size))
+            if (magic, snapshot_format, marshal_version) != (SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, marshal.version):
+                return None
+            table = marshal.loads(f.read(table_size))
+    except (OSError, struct.error, ValueError, EOFError, TypeError):
+        return None
+    if [tuple(entry) for entry in table["manifest"]] != manifest:
+        return None
+    return table, _HEADER.size + table_size
+
+
+def header_objects(table: Dict, data: Optional[List[dict]] = None, cls=MemoryObject) -> List[MemoryObject]:
+    """
+    Objects rebuilt from the header table without re-validation (they were
+    validated when the snapshot was written), with their `data` when given.
+    """
+    loaded_on = datetime.utcnow()
+    fields_set = set(HEADER_COLUMNS) | {"created_on", "data"}
+    rows = zip(*(table["columns"][name] for name in HEADER_COLUMNS))
+    if data is None:
+        return [cls.model_construct(fields_set, created_on=loaded_on, **dict(zip(HEADER_COLUMNS, row))) for row in rows]
+    return [
+        cls.model_construct(fields_set, created_on=loaded_on, data=payload, **dict(zip(HEADER_COLUMNS, row)))
+        for row, payload in zip(rows, data)
+    ]
+
+
+def table_sources(table: Dict) -> Sources:
+    return table["files"], table["sources"]
+
+
+def read_snapshot(memory_path: Path, manifest: Manifest) -> Optional[Tuple[List[MemoryObject], MemoryIndex, Sources]]:
+    """
+    The objects (payloads included), index and sources of a snapshot that
+    still matches `manifest`, or None.
+    """
+    found = read_snapshot_table(memory_path, manifest)
+    if found is None:
+        return None
+    table, start = found
+    try:
+        with open(snapshot_path(memory_path), "rb") as f:
+            f.seek(start)
+            region = memoryview(f.read())
+    except OSError:
+        return None
+    offsets = table["offsets"]
+    data = [marshal.loads(region[offsets[k]:offsets[k + 1]]) for k in range(len(offsets) - 1)]
+    return header_objects(table, data), MemoryIndex.from_state(table["index"]), table_sources(table)
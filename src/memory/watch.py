@@ -0,0 +1,55 @@
+# src/memory/watch.py
+
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .polaris_memory import PolarisMemory
+
+
+class MemoryWatcher:
+    """
+    Polls the directory of a long-lived PolarisMemory and calls `refresh`
+    every `interval` seconds, from a daemon thread; `on_change` gets the
+    changes whenever a poll finds some. Polling is a stat per file, so it
+    needs no platform file-event support.
+
+    Refreshes hold `memory.lock`; readers on other threads that iterate
+    `memory.objects` should hold it too.
+    """
+
+    def __init__(
+        self,
+        memory: PolarisMemory,
+        interval: float = 2.0,
+        on_change: Optional[Callable[[Dict[str, List[str]]], None]] = None
+    ):
+        self.memory = memory
+        self.interval = interval
+        self.on_change = on_change
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MemoryWatcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="polaris-memory-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def poll(self) -> Dict[str, List[str]]:
+        changes = self.memory.refresh()
+        if self.on_change and any(changes.values()):
+            self.on_change(changes)
+        return changes
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️ Memory refresh failed: {e}")
@@ -0,0 +1,494 @@
+# src/simulate/accumulators.py
+
+import numpy as np
+from statistics import NormalDist
+from typing import Dict, List, Optional
+from simulate.sampling import SAMPLING_BLOCK_RUNS
+
+# Slack at or below this share of the makespan counts as zero (float round-off).
+CRITICAL_TOLERANCE = 1e-9
+# Per-module contribution sketches are coarser than the makespan sketch.
+CONTRIBUTION_BUCKETS = 256
+# Completion-time distribution summary: histogram bin cap and reported quantiles.
+HISTOGRAM_BINS = 64
+DISTRIBUTION_QUANTILES = (0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99)
+# Full design blocks needed before block statistics replace the plain-MC formulas.
+MIN_VARIANCE_BLOCKS = 8
+
+
+class RunningStats:
+    """
+    Welford/Chan running mean, variance, min and max. Mergeable.
+
+    With `shape`, tracks that many independent series at once; `update`
+    then reduces over the last axis of a (*shape, n) array.
+    """
+
+    def __init__(self, shape: tuple = ()):
+        self.shape = shape
+        self.count = 0
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._min = np.full(shape, np.inf)
+        self._max = np.full(shape, -np.inf)
+
+    def _out(self, value: np.ndarray):
+        return float(value) if self.shape == () else value
+
+    @property
+    def mean(self):
+        return self._out(self._mean)
+
+    @property
+    def min(self):
+        return self._out(self._min)
+
+    @property
+    def max(self):
+        return self._out(self._max)
+
+    @property
+    def variance(self):
+        return self._out(self._m2 / (self.count - 1) if self.count > 1 else np.zeros(self.shape))
+
+    @property
+    def std(self):
+        return self._out(np.sqrt(self.variance))
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64).reshape(self.shape + (-1,))
+        if values.shape[-1] == 0:
+            return
+        batch = RunningStats(self.shape)
+        batch.count = values.shape[-1]
+        batch._mean = values.mean(axis=-1)
+        batch._m2 = ((values - batch._mean[..., None]) ** 2).sum(axis=-1)
+        batch._min = values.min(axis=-1)
+        batch._max = values.max(axis=-1)
+        self.merge(batch)
+
+    def merge(self, other: "RunningStats") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self._mean, self._m2 = other._mean.copy(), other._m2.copy()
+            self._min, self._max = other._min.copy(), other._max.copy()
+            return
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean = self._mean + delta * other.count / total
+        self._m2 = self._m2 + other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self._min = np.minimum(self._min, other._min)
+        self._max = np.maximum(self._max, other._max)
+
+
+class QuantileSketch:
+    """
+    Mergeable fixed-width bucket sketch for non-negative values (days).
+
+    Bucket i counts values in [i * width, (i + 1) * width). When more than
+    `max_buckets` are needed the width doubles and neighbouring buckets are
+    folded together, so memory stays bounded whatever the run count. Quantiles
+    and the CDF interpolate linearly within a bucket; while every value seen is
+    a whole number they are read back as whole days, exact at width 1.
+
+    With `n_series`, tracks that many series at once with one shared width;
+    `update` then takes (runs, n_series) arrays and `quantile` returns an array.
+    """
+
+    def __init__(self, width: float = 1.0, max_buckets: int = 4096, n_series: Optional[int] = None):
+        self.width = width
+        self.max_buckets = max_buckets
+        self.n_series = n_series
+        self.integral = True
+        self._counts = np.zeros((n_series or 1, 0), dtype=np.int64)
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts if self.n_series else self._counts[0]
+
+    @property
+    def total(self) -> int:
+        return int(self._counts[0].sum())
+
+    @staticmethod
+    def _fold(counts: np.ndarray, factor: int) -> np.ndarray:
+        padded = np.zeros((counts.shape[0], -(-counts.shape[1] // factor) * factor), dtype=np.int64)
+        padded[:, :counts.shape[1]] = counts
+        return padded.reshape(counts.shape[0], -1, factor).sum(axis=2)
+
+    def _coarsen(self, factor: int) -> None:
+        self._counts = self._fold(self._counts, factor)
+        self.width *= factor
+
+    def _fit(self, n_buckets: int) -> None:
+        factor = 1
+        while -(-n_buckets // factor) > self.max_buckets:
+            factor *= 2
+        if factor > 1:
+            self._coarsen(factor)
+        size = -(-n_buckets // factor)
+        if size > self._counts.shape[1]:
+            grown = np.zeros((self._counts.shape[0], size), dtype=np.int64)
+            grown[:, :self._counts.shape[1]] = self._counts
+            self._counts = grown
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.clip(np.asarray(values, dtype=np.float64), 0, None)
+        values = values.reshape(-1, self.n_series) if self.n_series else values.reshape(-1, 1)
+        if values.size == 0:
+            return
+        self.integral &= bool(np.all(values == np.floor(values)))
+        self._fit(int(values.max() // self.width) + 1)
+        n_buckets = self._counts.shape[1]
+        flat = (values // self.width).astype(np.int64) + np.arange(values.shape[1]) * n_buckets
+        self._counts += np.bincount(flat.ravel(), minlength=self._counts.size).reshape(self._counts.shape)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.integral &= other.integral
+        other_counts, other_width = other._counts, other.width
+        if other_width > self.width:
+            self._coarsen(int(round(other_width / self.width)))
+        elif other_width < self.width:
+            other_counts = self._fold(other_counts, int(round(self.width / other_width)))
+        self._fit(other_counts.shape[1])
+        self._counts[:, :other_counts.shape[1]] += other_counts
+
+    def cdf(self, x: float) -> float:
+        """
+        Share of values at or below x, spreading each bucket's count evenly
+        over its width (whole-day data counts whole days). Single series only.
+        """
+        counts = self.counts
+        total = counts.sum()
+        if total == 0 or x < 0:
+            return float("nan") if total == 0 else 0.0
+        if self.integral:
+            # Value k stands for [k, k + 1): everything up to floor(x) is in
+            x = np.floor(x) + 1
+        bucket = int(x // self.width)
+        if bucket >= len(counts):
+            return 1.0
+        inside = counts[bucket] * (x - bucket * self.width) / self.width
+        return float((counts[:bucket].sum() + inside) / total)
+
+    def histogram(self, max_bins: int = HISTOGRAM_BINS):
+        """
+        (bin_edges, counts) over the occupied range, with buckets folded by a
+        power of two so there are at most `max_bins` bins. Single series only.
+        """
+        counts = self.counts
+        occupied = np.flatnonzero(counts)
+        if len(occupied) == 0:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+        first, stop = occupied[0], occupied[-1] + 1
+        factor = 1
+        while -(-(stop - first // factor * factor) // factor) > max_bins:
+            factor *= 2
+        start = first // factor * factor
+        binned = self._fold(counts[None, start:stop], factor)[0]
+        edges = (start + np.arange(len(binned) + 1) * factor) * self.width
+        return edges, binned
+
+    def quantile(self, q: float):
+        """
+        Value at which the cumulative share reaches q, interpolated within the
+        bucket that crosses it (one per series with `n_series`).
+        """
+        if self._counts.shape[1] == 0:
+            values = np.full(self._counts.shape[0], np.nan)
+            return values if self.n_series else float(values[0])
+        cumulative = np.cumsum(self._counts, axis=1)
+        totals = cumulative[:, -1]
+        target = np.maximum(q * totals, 1e-9)
+        # First bucket whose cumulative count reaches the target, per series
+        bucket = np.minimum((cumulative < target[:, None]).sum(axis=1), cumulative.shape[1] - 1)
+        rows = np.arange(len(bucket))
+        inside = self._counts[rows, bucket]
+        before = cumulative[rows, bucket] - inside
+        values = (bucket + (target - before) / np.maximum(inside, 1)) * self.width
+        if self.integral:
+            # Inverse of the whole-day CDF: the crossing falls within [k, k + 1]
+            values = np.ceil(np.round(values, 9)) - 1
+        values = np.where(totals > 0, values, np.nan)
+        return values if self.n_series else float(values[0])
+
+
+class SimulationAccumulator:
+    """
+    Compact, mergeable totals for a stream of simulated runs.
+
+    Memory depends on the module count and the loop cap, never on the run
+    count. Workers return one of these per chunk instead of per-run results.
+
+    Mean and P90 completion time are also tracked per block of
+    SAMPLING_BLOCK_RUNS runs (the unit of the variance-reduced `sampling`
+    designs); their spread gives the precision the strategy actually reached.
+    """
+
+    def __init__(self, n_nodes: int, max_loops: int, sampling: str = "random"):
+        self.n_nodes = n_nodes
+        self.sampling = sampling
+        self.runs = 0
+        self.makespan = RunningStats()
+        self.makespan_sketch = QuantileSketch()
+        self.effort = RunningStats()
+        self.slack_sum = np.zeros(n_nodes, dtype=np.float64)
+        # Criticality: runs in which each module had zero slack, and the days
+        # it put on the critical path (its duration when critical, else 0)
+        self.critical_counts = np.zeros(n_nodes, dtype=np.int64)
+        self.contribution_sum = np.zeros(n_nodes, dtype=np.float64)
+        self.contribution_sketch = QuantileSketch(max_buckets=CONTRIBUTION_BUCKETS, n_series=n_nodes)
+        # rework_hist[m, k] = number of runs in which module m looped k times
+        self.rework_hist = np.zeros((n_nodes, max_loops + 1), dtype=np.int64)
+        self.block_means = RunningStats()
+        self.block_p90 = RunningStats()
+
+    def update(self, durations: np.ndarray, loops: np.ndarray, makespan: np.ndarray, slack: np.ndarray) -> None:
+        """
+        Fold in one batch: all arrays are shaped (runs, n_nodes) except makespan (runs,).
+        """
+        self.update_makespan(makespan)
+        self.effort.update(durations.sum(axis=1))
+        self.slack_sum += slack.sum(axis=0)
+        critical = slack <= CRITICAL_TOLERANCE * np.maximum(makespan, 1.0)[:, None]
+        self.critical_counts += critical.sum(axis=0)
+        contribution = np.where(critical, durations, 0.0)
+        self.contribution_sum += contribution.sum(axis=0)
+        self.contribution_sketch.update(contribution)
+        for k in range(self.rework_hist.shape[1]):
+            self.rework_hist[:, k] += (loops == k).sum(axis=0)
+
+    def update_makespan(self, makespan: np.ndarray) -> None:
+        """
+        Fold in completion times only. Batches start on a block boundary; a
+        trailing partial block is left out of the block statistics only.
+        """
+        full = len(makespan) // SAMPLING_BLOCK_RUNS * SAMPLING_BLOCK_RUNS
+        if full:
+            blocks = makespan[:full].reshape(-1, SAMPLING_BLOCK_RUNS)
+            self.block_means.update(blocks.mean(axis=1))
+            self.block_p90.update(np.quantile(blocks, 0.90, axis=1, method="inverted_cdf"))
+        self.runs += len(makespan)
+        self.makespan.update(makespan)
+        self.makespan_sketch.update(makespan)
+
+    def merge(self, other: "SimulationAccumulator") -> None:
+        self.runs += other.runs
+        self.makespan.merge(other.makespan)
+        self.makespan_sketch.merge(other.makespan_sketch)
+        self.effort.merge(other.effort)
+        self.slack_sum += other.slack_sum
+        self.critical_counts += other.critical_counts
+        self.contribution_sum += other.contribution_sum
+        self.contribution_sketch.merge(other.contribution_sketch)
+        self.rework_hist += other.rework_hist
+        self.block_means.merge(other.block_means)
+        self.block_p90.merge(other.block_p90)
+
+    @property
+    def fail_counts(self) -> np.ndarray:
+        """
+        Runs in which each module needed at least one rework loop.
+        """
+        return self.runs - self.rework_hist[:, 0]
+
+    def criticality(self) -> Dict[str, np.ndarray]:
+        """
+        Per-node bottleneck statistics: share of runs on the critical path,
+        mean and P90 days contributed to it, and mean slack.
+        """
+        runs = max(self.runs, 1)
+        return {
+            "critical_fraction": self.critical_counts / runs,
+            "mean_contribution": self.contribution_sum / runs,
+            "p90_contribution": self.contribution_sketch.quantile(0.90),
+            "mean_slack": self.slack_sum / runs,
+        }
+
+    def completion_summary(self) -> Dict[str, float]:
+        return {
+            "mean": self.makespan.mean,
+            "std": self.makespan.std,
+            "min": self.makespan.min,
+            "max": self.makespan.max,
+            "p50": self.makespan_sketch.quantile(0.50),
+            "p90": self.makespan_sketch.quantile(0.90),
+            "p99": self.makespan_sketch.quantile(0.99),
+        }
+
+    def distribution(self, max_bins: int = HISTOGRAM_BINS) -> Dict:
+        """
+        Compact completion-time distribution: a histogram of at most `max_bins`
+        bins, the empirical CDF at each bin's upper edge, quantiles, and the
+        sketch's bucket width (the resolution everything above is read at).
+        """
+        edges, counts = self.makespan_sketch.histogram(max_bins)
+        total = max(int(counts.sum()), 1)
+        return {
+            "bin_edges": edges.tolist(),
+            "counts": counts.tolist(),
+            "cdf": (np.cumsum(counts) / total).tolist(),
+            "quantiles": {f"p{round(q * 100):02d}": self.makespan_sketch.quantile(q) for q in DISTRIBUTION_QUANTILES},
+            "bucket_width": self.makespan_sketch.width,
+        }
+
+    def rework_histogram(self, column: int) -> List[int]:
+        return self.rework_hist[column].tolist()
+
+    def variance_reduction(self) -> Dict[str, Optional[float]]:
+        """
+        Plain-Monte-Carlo variance of a block's mean / P90 over the variance
+        actually seen between blocks (> 1: fewer runs reach the same precision).
+        The P90 reference is the order-statistic variance p(1 - p) / (n f²),
+        with the density f read off the P85-P95 spread. None until two blocks.
+        """
+        factors: Dict[str, Optional[float]] = {"mean": None, "p90": None}
+        if self.block_means.count < 2:
+            return factors
+        if self.block_means.variance > 0:
+            factors["mean"] = float(self.makespan.variance / SAMPLING_BLOCK_RUNS / self.block_means.variance)
+        spread = self.makespan_sketch.quantile(0.95) - self.makespan_sketch.quantile(0.85)
+        if spread > 0 and self.block_p90.variance > 0:
+            density = 0.10 / spread
+            factors["p90"] = float(0.9 * 0.1 / (SAMPLING_BLOCK_RUNS * density ** 2) / self.block_p90.variance)
+        return factors
+
+    def sampling_summary(self) -> Dict:
+        factors = self.variance_reduction()
+        return {
+            "strategy": self.sampling,
+            "block_runs": SAMPLING_BLOCK_RUNS,
+            "blocks": self.block_means.count,
+            "variance_reduction": factors,
+            # Plain Monte Carlo runs that would give the same precision
+            "effective_runs": {
+                metric: None if factor is None else self.runs * factor for metric, factor in factors.items()
+            },
+        }
+
+    def confidence_half_width(self, metric: str = "mean", confidence: float = 0.95) -> float:
+        """
+        Half-width of the two-sided confidence interval for the mean or P90
+        completion time. P90 uses the distribution-free order-statistic interval.
+
+        Under a variance-reduced `sampling` strategy, once MIN_VARIANCE_BLOCKS
+        blocks are in, the mean uses the between-block standard error and the
+        P90 interval shrinks by the measured variance reduction.
+        """
+        if self.runs < 2:
+            return float("inf")
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        blocked = self.sampling != "random" and self.block_means.count >= MIN_VARIANCE_BLOCKS
+        if metric == "mean":
+            if blocked:
+                return float(z * self.block_means.std / np.sqrt(self.block_means.count))
+            return float(z * self.makespan.std / np.sqrt(self.runs))
+        if metric == "p90":
+            spread = z * np.sqrt(0.9 * 0.1 / self.runs)
+            lower = self.makespan_sketch.quantile(max(0.0, 0.9 - spread))
+            upper = self.makespan_sketch.quantile(min(1.0, 0.9 + spread))
+            factor = self.variance_reduction()["p90"] if blocked else None
+            return (upper - lower) / 2 / (np.sqrt(factor) if factor else 1.0)
+        raise ValueError(f"Unknown convergence metric: {metric}")
+
+
+class ScenarioAccumulator:
+    """
+    Per-scenario completion-time stats plus paired savings against scenario 0
+    (the baseline), for scenarios simulated on common random numbers.
+    """
+
+    def __init__(self, n_scenarios: int):
+        self.runs = 0
+        self.makespan = RunningStats((n_scenarios,))
+        self.makespan_sketch = [QuantileSketch() for _ in range(n_scenarios)]
+        self.savings = RunningStats((n_scenarios,))
+
+    def update(self, makespans: np.ndarray) -> None:
+        """
+        `makespans` is (n_scenarios, runs); row 0 is the baseline.
+        """
+        self.runs += makespans.shape[1]
+        self.makespan.update(makespans)
+        self.savings.update(makespans[0] - makespans)
+        for sketch, row in zip(self.makespan_sketch, makespans):
+            sketch.update(row)
+
+    def merge(self, other: "ScenarioAccumulator") -> None:
+        self.runs += other.runs
+        self.makespan.merge(other.makespan)
+        self.savings.merge(other.savings)
+        for mine, theirs in zip(self.makespan_sketch, other.makespan_sketch):
+            mine.merge(theirs)
+
+
+class SensitivityAccumulator:
+    """
+    Mergeable totals for a sensitivity pass over `n_inputs` modules.
+
+    - oat: one-at-a-time scenarios vs the baseline (scenario 0) on common draws
+    - sums of d, d², d·T per module and of T, T² for duration/makespan correlation
+    - pick-freeze sums for first-order (Sobol) indices: T from sample A and
+      T'_m from sample B with module m's duration frozen to its A value
+    """
+
+    def __init__(self, n_inputs: int, n_scenarios: int):
+        self.runs = 0
+        self.oat = ScenarioAccumulator(n_scenarios)
+        self.sum_t = 0.0
+        self.sum_t2 = 0.0
+        self.sum_d = np.zeros(n_inputs)
+        self.sum_d2 = np.zeros(n_inputs)
+        self.sum_dt = np.zeros(n_inputs)
+        self.sum_frozen = np.zeros(n_inputs)
+        self.sum_frozen2 = np.zeros(n_inputs)
+        self.sum_t_frozen = np.zeros(n_inputs)
+
+    def update(self, scenario_makespans: np.ndarray, inputs: np.ndarray, frozen_makespans: np.ndarray) -> None:
+        """
+        `scenario_makespans` is (n_scenarios, runs) with the baseline first,
+        `inputs` the baseline module durations (runs, n_inputs) and
+        `frozen_makespans` (n_inputs, runs).
+        """
+        t = scenario_makespans[0].astype(np.float64)
+        self.runs += len(t)
+        self.oat.update(scenario_makespans)
+        self.sum_t += t.sum()
+        self.sum_t2 += (t * t).sum()
+        self.sum_d += inputs.sum(axis=0)
+        self.sum_d2 += (inputs * inputs).sum(axis=0)
+        self.sum_dt += t @ inputs
+        self.sum_frozen += frozen_makespans.sum(axis=1)
+        self.sum_frozen2 += (frozen_makespans * frozen_makespans).sum(axis=1)
+        self.sum_t_frozen += frozen_makespans @ t
+
+    def merge(self, other: "SensitivityAccumulator") -> None:
+        self.runs += other.runs
+        self.oat.merge(other.oat)
+        for name in ("sum_t", "sum_t2", "sum_d", "sum_d2", "sum_dt", "sum_frozen", "sum_frozen2", "sum_t_frozen"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def correlations(self) -> np.ndarray:
+        """
+        Pearson correlation of each module's duration with the makespan.
+        """
+        n = self.runs
+        cov = self.sum_dt / n - (self.sum_d / n) * (self.sum_t / n)
+        var_d = self.sum_d2 / n - (self.sum_d / n) ** 2
+        var_t = self.sum_t2 / n - (self.sum_t / n) ** 2
+        denom = np.sqrt(np.maximum(var_d * var_t, 0))
+        return np.divide(cov, denom, out=np.zeros_like(cov), where=denom > 0)
+
+    def first_order_indices(self) -> np.ndarray:
+        """
+        Janon et al. pick-freeze estimate of each module's first-order Sobol index.
+        """
+        n = self.runs
+        mean = (self.sum_t / n + self.sum_frozen / n) / 2
+        second = (self.sum_t2 / n + self.sum_frozen2 / n) / 2
+        var = second - mean ** 2
+        cov = self.sum_t_frozen / n - mean ** 2
+        return np.divide(cov, var, out=np.zeros_like(cov), where=var > 0)
@@ -0,0 +1,150 @@
+# src/simulate/batch.py
+
+import json
+import numpy as np
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, List, Optional
+from compose.compiled_composition import compile_composition, composition_payload
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from simulate.parallel import run_chunked_many
+from simulate.result_cache import default_cache
+from simulate.parameters import data_digest
+from simulate.result_record import request_key
+from simulate.simulation_engine import kernel_plan, summarize_simulation
+
+# Columns of the batch results file, in order.
+BATCH_COLUMNS = (
+    "composition_id", "jurisdiction", "modules", "runs", "seed",
+    "avg_duration", "std", "p50", "p90", "p99", "avg_effort",
+    "deadline_probability", "cached", "error",
+)
+
+
+def composition_jurisdiction(composition: MemoryObject) -> str:
+    return composition_payload(composition).get("jurisdiction") or composition.jurisdiction
+
+
+def select_compositions(
+    memory: PolarisMemory,
+    patterns: Optional[List[str]] = None,
+    jurisdiction: Optional[str] = None
+) -> List[MemoryObject]:
+    """
+    Compositions whose id matches any of `patterns` (exact ids or globs such
+    as "composition-denpasar-*"), restricted to `jurisdiction` when given
+    (case-insensitive). No patterns means every Composition. Sorted by id.
+    """
+    selected = []
+    for composition in memory.get_by_type("Composition"):
+        if patterns and not any(fnmatchcase(composition.id, pattern) for pattern in patterns):
+            continue
+        if jurisdiction and composition_jurisdiction(composition).lower() != jurisdiction.lower():
+            continue
+        selected.append(composition)
+    return sorted(selected, key=lambda composition: composition.id)
+
+
+def run_simulation_batch(
+    compositions: List[MemoryObject],
+    memory: PolarisMemory,
+    params: dict,
+    runs: int = 1000,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    use_cache: bool = True,
+    deadline: Optional[float] = None
+) -> List[Dict]:
+    """
+    Simulate many compositions against one loaded memory.
+
+    Every composition is compiled up front; the chunks of all of them are
+    then scheduled across a single worker pool. Each composition gets its
+    own SeedSequence(`seed`), so its result (and cache entry) is identical to
+    `run_simulation(composition, ..., seed=seed)`. Compositions that cannot be
+    simulated (cycles, no modules) get a row with `error` set instead of
+    stopping the batch.
+
+    Returns one row per composition, in input order, with `result` holding
+    the full run_simulation result dict (None on error).
+    """
+    # Unseeded keys hold fresh entropy and could never be read back
+    cache = default_cache() if use_cache and seed is not None else None
+    rows: List[Dict] = []
+    pending = []
+    for composition in compositions:
+        row = {"composition_id": composition.id, "jurisdiction": composition_jurisdiction(composition),
+               "modules": 0, "result": None, "cached": False, "error": None}
+        rows.append(row)
+        try:
+            compiled = compile_composition(composition, memory)
+            row["modules"] = len(compiled.permitting_modules())
+            if not row["modules"]:
+                raise ValueError("No valid modules found in memory for this composition.")
+            if not compiled.is_dag:
+                raise ValueError("Composition graph contains cycles.")
+            seed_seq = np.random.SeedSequence(seed)
+            plan = kernel_plan(compiled, memory, params)
+            digest = data_digest(compiled, plan.module_params, plan.edge_rules)
+            key = request_key(compiled.content_hash, params, runs, seed_seq.entropy, None, deadline, digest)
+            result = cache.get(key) if cache is not None else None
+            if result is not None:
+                row.update(result=result, cached=True)
+                continue
+            pending.append((row, compiled, plan, seed_seq, key))
+        except Exception as e:
+            row["error"] = str(e)
+            print(f"⚠️ Skipping {composition.id}: {e}")
+
+    if pending:
+        accumulators = run_chunked_many(
+            [plan for _, _, plan, _, _ in pending], runs, [seed_seq for _, _, _, seed_seq, _ in pending], workers=workers
+        )
+        for (row, compiled, plan, seed_seq, key), acc in zip(pending, accumulators):
+            row["result"] = summarize_simulation(compiled, plan, acc, seed_seq, deadline=deadline)
+            if cache is not None:
+                cache.put(key, row["result"])
+    return rows
+
+
+def batch_columns(rows: List[Dict]) -> Dict[str, list]:
+    """
+    Column-oriented summary of `run_simulation_batch` rows (see BATCH_COLUMNS).
+    """
+    columns: Dict[str, list] = {name: [] for name in BATCH_COLUMNS}
+    for row in rows:
+        result = row["result"] or {}
+        completion = result.get("completion_time", {})
+        values = {
+            **{name: row.get(name) for name in ("composition_id", "jurisdiction", "modules", "cached", "error")},
+            "runs": result.get("runs"),
+            "seed": result.get("seed"),
+            "avg_duration": result.get("avg_duration"),
+            "std": completion.get("std"),
+            "p50": completion.get("p50"),
+            "p90": completion.get("p90"),
+            "p99": completion.get("p99"),
+            "avg_effort": result.get("avg_effort"),
+            "deadline_probability": (result.get("deadline") or {}).get("probability"),
+        }
+        for name in BATCH_COLUMNS:
+            columns[name].append(values[name])
+    return columns
+
+
+def write_batch_results(rows: List[Dict], path: Path, params: dict, deadline: Optional[float] = None) -> Path:
+    """
+    Write one JSON file holding the batch summary as columns, plus the params used.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "params": params,
+        "deadline": deadline,
+        "count": len(rows),
+        "columns": batch_columns(rows),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, default=str)
+    return path
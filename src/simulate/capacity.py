@@ -0,0 +1,304 @@
+# src/simulate/capacity.py
+
+import heapq
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from compose.compiled_composition import CompiledComposition, compile_composition
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from simulate.parameters import compile_parameters
+from simulate.vectorized import sample_module_durations
+
+QUEUE_DISCIPLINES = ("fifo", "lifo", "spt")
+ARRIVAL_PROCESSES = ("poisson", "fixed")
+
+# Reviewers per actor when `actor_capacity` doesn't name it.
+DEFAULT_ACTOR_CAPACITY = 1
+
+# Projects per day. The shipped Denpasar flow's busiest actor (PLN) spends
+# about 375 days per project on module-data durations, so single reviewers
+# stay below full load (offered load ≈ 0.75).
+DEFAULT_ARRIVAL_RATE = 0.002
+
+# Actors whose ActorMap entry lists this capability may reorder their queue;
+# they default to shortest-processing-time first instead of FIFO.
+REORDER_CAPABILITY = "queue_reorder"
+
+_ARRIVAL, _COMPLETE = 0, 1
+
+
+class ActorPool:
+    """
+    One actor's reviewers and waiting queue. `capacity` None means unlimited
+    (modules without a responsible actor). Busy time and queue-length
+    integrals are not tracked here: they equal the total service and waiting
+    time of the actor's tasks, which are summed after the run.
+    """
+
+    def __init__(self, name: str, capacity: Optional[int], discipline: str = "fifo"):
+        if discipline not in QUEUE_DISCIPLINES:
+            raise ValueError(f"Unknown queue discipline: {discipline}")
+        self.name = name
+        self.capacity = capacity
+        self.discipline = discipline
+        self.busy = 0
+        # FIFO / LIFO are deque ends; SPT needs a heap keyed by service time
+        self.queue = [] if discipline == "spt" else deque()
+        self.served = 0
+        self.max_queue = 0
+
+    def put(self, service: float, seq: int, project: int, node: int) -> None:
+        if self.discipline == "spt":
+            heapq.heappush(self.queue, (service, seq, project, node))
+        else:
+            self.queue.append((project, node))
+        if len(self.queue) > self.max_queue:
+            self.max_queue = len(self.queue)
+
+    def take(self) -> Tuple[int, int]:
+        """
+        Next waiting (project, node) under the queue discipline.
+        """
+        if self.discipline == "spt":
+            return heapq.heappop(self.queue)[2:]
+        if self.discipline == "lifo":
+            return self.queue.pop()
+        return self.queue.popleft()
+
+
+def actor_pools(
+    compiled: CompiledComposition,
+    memory: PolarisMemory,
+    capacity: Optional[Dict[str, int]] = None,
+    disciplines: Optional[Dict[str, str]] = None,
+    default_capacity: int = DEFAULT_ACTOR_CAPACITY
+) -> Tuple[List[ActorPool], List[int]]:
+    """
+    Map every node to an actor pool via its module's `actor_responsible`.
+
+    Actors are matched to ActorMap entries by name or actor_id (case-insensitive)
+    to pick up `queue_reorder`. `capacity` / `disciplines` are keyed by actor
+    name. Nodes without a responsible actor share one unlimited pool.
+    Returns (pools, node → pool index).
+    """
+    capacity = {k.lower(): v for k, v in (capacity or {}).items()}
+    disciplines = {k.lower(): v for k, v in (disciplines or {}).items()}
+    reorder = set()
+    for actor_map in memory.get_by_type("ActorMap"):
+        for actor in actor_map.data.get("actors", []):
+            if REORDER_CAPABILITY in actor.get("override_capabilities", []):
+                reorder.update(str(actor.get(key, "")).lower() for key in ("name", "actor_id"))
+
+    pools = [ActorPool("(unassigned)", None)]
+    by_name: Dict[str, int] = {}
+    node_pool = []
+    for node in compiled.nodes:
+        module = compiled.modules.get(node)
+        name = (module.data.get("actor_responsible") if module else None) or None
+        if name is None:
+            node_pool.append(0)
+            continue
+        key = name.lower()
+        if key not in by_name:
+            default_discipline = "spt" if key in reorder else "fifo"
+            by_name[key] = len(pools)
+            pools.append(ActorPool(
+                name,
+                int(capacity.get(key, default_capacity)),
+                disciplines.get(key, default_discipline),
+            ))
+        node_pool.append(by_name[key])
+    return pools, node_pool
+
+
+def arrival_times(rng: np.random.Generator, projects: int, arrival_rate: float, process: str = "poisson") -> np.ndarray:
+    """
+    Project arrival days, the first at day 0, `arrival_rate` projects per day on average.
+    """
+    if process not in ARRIVAL_PROCESSES:
+        raise ValueError(f"Unknown arrival process: {process}")
+    if process == "fixed":
+        return np.arange(projects) / arrival_rate
+    gaps = rng.exponential(1 / arrival_rate, size=projects)
+    gaps[0] = 0.0
+    return np.cumsum(gaps)
+
+
+def simulate_projects(
+    compiled: CompiledComposition,
+    durations: np.ndarray,
+    arrivals: np.ndarray,
+    pools: List[ActorPool],
+    node_pool: List[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Discrete-event run of every project through the composition.
+
+    A module becomes ready once all its predecessors are done; it then takes
+    a free reviewer of its actor or waits in that actor's queue. Events
+    (arrivals, completions) are processed from one heap in time order.
+    Returns (project completion days, per-(project, node) waiting days).
+    """
+    n_projects, n_nodes = durations.shape
+    succ_indptr = compiled.succ_indptr.tolist()
+    succ_indices = compiled.succ_indices.tolist()
+    in_degree = compiled.in_degree.tolist()
+    sources = compiled.sources.tolist()
+    service = durations.tolist()
+
+    remaining_preds = [None] * n_projects
+    remaining_nodes = [n_nodes] * n_projects
+    ready_at = [None] * n_projects
+    completion = [0.0] * n_projects
+    waits = [None] * n_projects
+
+    events: List[tuple] = [(float(t), p, _ARRIVAL, p, -1) for p, t in enumerate(arrivals.tolist())]
+    heapq.heapify(events)
+    seq = n_projects
+    push, pop = heapq.heappush, heapq.heappop
+
+    def start(now: float, p: int, node: int, pool: ActorPool) -> None:
+        nonlocal seq
+        pool.busy += 1
+        pool.served += 1
+        waits[p][node] = now - ready_at[p][node]
+        seq += 1
+        push(events, (now + service[p][node], seq, _COMPLETE, p, node))
+
+    def ready(now: float, p: int, node: int) -> None:
+        nonlocal seq
+        ready_at[p][node] = now
+        pool = pools[node_pool[node]]
+        if pool.capacity is None or pool.busy < pool.capacity:
+            start(now, p, node, pool)
+        else:
+            seq += 1
+            pool.put(service[p][node], seq, p, node)
+
+    while events:
+        now, _, kind, p, node = pop(events)
+        if kind == _ARRIVAL:
+            remaining_preds[p] = list(in_degree)
+            ready_at[p] = [0.0] * n_nodes
+            waits[p] = [0.0] * n_nodes
+            for source in sources:
+                ready(now, p, source)
+            continue
+
+        pool = pools[node_pool[node]]
+        pool.busy -= 1
+        if pool.queue:
+            q, q_node = pool.take()
+            start(now, q, q_node, pool)
+
+        remaining_nodes[p] -= 1
+        if remaining_nodes[p] == 0:
+            completion[p] = now
+            remaining_preds[p] = ready_at[p] = None
+            continue
+        preds = remaining_preds[p]
+        for k in range(succ_indptr[node], succ_indptr[node + 1]):
+            succ = succ_indices[k]
+            preds[succ] -= 1
+            if preds[succ] == 0:
+                ready(now, p, succ)
+
+    return np.array(completion), np.array(waits)
+
+
+def run_capacity_simulation(
+    composition: MemoryObject,
+    memory: PolarisMemory,
+    params: dict,
+    projects: int = 1_000,
+    arrival_rate: float = DEFAULT_ARRIVAL_RATE,
+    arrival_process: str = "poisson",
+    actor_capacity: Optional[Dict[str, int]] = None,
+    queue_disciplines: Optional[Dict[str, str]] = None,
+    default_capacity: int = DEFAULT_ACTOR_CAPACITY,
+    seed: Optional[int] = None
+) -> Dict:
+    """
+    Push a stream of `projects` through the composition, sharing each actor's
+    reviewers between them.
+
+    Projects arrive at `arrival_rate` per day ("poisson" or evenly "fixed").
+    Module durations (including rework loops) are sampled as in
+    `run_simulation`; override, conditional and feedback_loop edges are not
+    modelled here, every non-feedback edge is a plain dependency. Actors get
+    `actor_capacity[name]` reviewers (default `default_capacity`) and serve
+    their queue "fifo", "lifo" or "spt" (shortest task first; the default
+    for actors that can `queue_reorder`).
+
+    Reports throughput, project cycle times, and per-actor utilization, queue
+    lengths and waiting times. Each actor's `offered_load` is arrival_rate ×
+    its mean service days per project ÷ capacity; at 1 or more its queue
+    grows without bound, so the result is flagged `unstable` (with a
+    warning) and the statistics depend on `projects` rather than converging.
+    """
+    compiled = compile_composition(composition, memory)
+    if not compiled.permitting_modules():
+        raise ValueError("No valid modules found in memory for this composition.")
+    if not compiled.is_dag:
+        raise ValueError("Composition graph contains cycles.")
+    if projects < 1 or arrival_rate <= 0:
+        raise ValueError("projects and arrival_rate must be positive.")
+    if default_capacity < 1 or any(c < 1 for c in (actor_capacity or {}).values()):
+        raise ValueError("Actor capacities must be at least 1 reviewer.")
+
+    seed_seq = np.random.SeedSequence(seed)
+    rng = np.random.default_rng(seed_seq)
+    module_params = compile_parameters(compiled, memory, params)
+    durations, _ = sample_module_durations(rng, projects, module_params, int(params["max_feedback_loops"]))
+    arrivals = arrival_times(rng, projects, arrival_rate, arrival_process)
+
+    pools, node_pool = actor_pools(compiled, memory, actor_capacity, queue_disciplines, default_capacity)
+    durations = durations.astype(np.float64)
+    completion, waits = simulate_projects(compiled, durations, arrivals, pools, node_pool)
+
+    horizon = float(completion.max() - arrivals[0])
+    cycle = completion - arrivals
+
+    actors = {}
+    node_pool = np.array(node_pool)
+    for k, pool in enumerate(pools[1:], start=1):
+        members = node_pool == k
+        pool_waits = waits[:, members].ravel()
+        offered_load = arrival_rate * float(durations[:, members].sum(axis=1).mean()) / pool.capacity
+        if offered_load >= 1:
+            print(f"⚠️ {pool.name} is offered {offered_load:.2f}× its capacity: its queue grows without bound")
+        actors[pool.name] = {
+            "capacity": pool.capacity,
+            "discipline": pool.discipline,
+            "modules": compiled.node_ids(np.flatnonzero(members)),
+            "served": pool.served,
+            "offered_load": offered_load,
+            # Time-averaged busy reviewers and queue length (Little's law)
+            "utilization": float(durations[:, members].sum() / (pool.capacity * horizon)) if horizon > 0 else 0.0,
+            "mean_queue_length": float(pool_waits.sum() / horizon) if horizon > 0 else 0.0,
+            "max_queue_length": pool.max_queue,
+            "mean_wait": float(pool_waits.mean()) if len(pool_waits) else 0.0,
+            "p90_wait": float(np.quantile(pool_waits, 0.90)) if len(pool_waits) else 0.0,
+        }
+
+    return {
+        "composition_id": compiled.composition_id,
+        "projects": projects,
+        "seed": int(seed_seq.entropy),
+        "arrival_rate": arrival_rate,
+        "arrival_process": arrival_process,
+        "horizon": horizon,
+        "unstable": any(actor["offered_load"] >= 1 for actor in actors.values()),
+        "throughput": projects / horizon if horizon > 0 else float("inf"),
+        "cycle_time": {
+            "mean": float(cycle.mean()),
+            "p50": float(np.quantile(cycle, 0.50)),
+            "p90": float(np.quantile(cycle, 0.90)),
+            "max": float(cycle.max()),
+        },
+        # Days a project spends queued, summed over its modules
+        "mean_project_wait": float(waits.sum(axis=1).mean()),
+        "actors": actors,
+        "module_wait": {mid: float(waits[:, compiled.index[mid]].mean()) for mid in compiled.permitting_modules()},
+    }
@@ -0,0 +1,256 @@
+# src/simulate/comparison.py
+
+import zlib
+import numpy as np
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple
+from compose.compiled_composition import CompiledComposition, compile_composition
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from simulate.accumulators import ScenarioAccumulator, SimulationAccumulator
+from simulate.parameters import compile_edge_rules, compile_parameters
+from simulate.vectorized import batch_size_for, critical_path, sample_edge_draws, sample_module_durations
+
+# Module fields that say what a step does, tried in order when aligning
+# modules across jurisdictions.
+ALIGNMENT_FIELDS = ("functional_role", "procedure_type")
+
+
+class JurisdictionModel:
+    """
+    One jurisdiction directory (`library/domains/<domain>/<jurisdiction_vN>`)
+    loaded into memory, plus the compositions compiled against it so far.
+    Get these from `load_jurisdiction`, which builds each one once per process.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.memory = PolarisMemory(path)
+        profiles = self.memory.get_by_type("JurisdictionProfile")
+        self.profile: Optional[MemoryObject] = profiles[0] if profiles else None
+        self.label = path.name
+        self.name = self.profile.data.get("jurisdiction", self.label) if self.profile else self.label
+        self._compiled: Dict[str, CompiledComposition] = {}
+
+    def default_composition_id(self) -> str:
+        """
+        The composition with the most modules (ties broken by id).
+        """
+        compositions = self.memory.get_by_type("Composition")
+        if not compositions:
+            raise ValueError(f"No compositions found in {self.path}.")
+        compiled = [self.compile(c.id) for c in sorted(compositions, key=lambda c: c.id)]
+        return max(compiled, key=lambda c: len(c.permitting_modules())).composition_id
+
+    def compile(self, composition_id: Optional[str] = None) -> CompiledComposition:
+        """
+        The compiled composition, reused across calls (the default one when no id is given).
+        """
+        if composition_id is None:
+            composition_id = self.default_composition_id()
+        compiled = self._compiled.get(composition_id)
+        if compiled is None or compiled.generation != self.memory.generation:
+            composition = self.memory.get_by_id(composition_id)
+            if composition is None or composition.object_type != "Composition":
+                raise ValueError(f"Composition {composition_id} not found in {self.path}.")
+            compiled = compile_composition(composition, self.memory)
+            self._compiled[composition_id] = compiled
+        return compiled
+
+
+_jurisdictions: Dict[Path, JurisdictionModel] = {}
+
+
+def load_jurisdiction(path) -> JurisdictionModel:
+    """
+    The JurisdictionModel for a jurisdiction directory, loaded on first use.
+    """
+    path = Path(path).resolve()
+    model = _jurisdictions.get(path)
+    if model is None:
+        if not path.is_dir():
+            raise ValueError(f"Jurisdiction directory not found: {path}")
+        model = _jurisdictions[path] = JurisdictionModel(path)
+    return model
+
+
+def role_key(module: Optional[MemoryObject], node: str, align_by: Sequence[str] = ALIGNMENT_FIELDS) -> str:
+    """
+    What a module is aligned on: the first `align_by` field it declares
+    (lower-cased), or its own id when it declares none.
+    """
+    for field in align_by:
+        value = module.data.get(field) if module else None
+        if value:
+            return f"{field}:{' '.join(str(value).lower().split())}"
+    return f"module:{node}"
+
+
+def aligned_roles(compiled: CompiledComposition, align_by: Sequence[str] = ALIGNMENT_FIELDS) -> List[str]:
+    """
+    Per node, its role key. Modules sharing a role within one composition are
+    numbered in topological order ("…#2"), so the k-th occurrence of a role
+    lines up with the k-th in every other jurisdiction.
+    """
+    roles = [""] * len(compiled.nodes)
+    seen: Dict[str, int] = {}
+    for v in compiled.topological_order.tolist():
+        node = compiled.nodes[v]
+        key = role_key(compiled.modules.get(node), node, align_by)
+        seen[key] = seen.get(key, 0) + 1
+        roles[v] = key if seen[key] == 1 else f"{key}#{seen[key]}"
+    return roles
+
+
+def stream_for(seed_seq: np.random.SeedSequence, key: str) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence(seed_seq.entropy, spawn_key=(zlib.crc32(key.encode("utf-8")),)))
+
+
+def compare_jurisdictions(
+    entries: List[Tuple[str, Optional[str]]],
+    params: dict,
+    runs: int = 10_000,
+    seed: Optional[int] = None,
+    align_by: Sequence[str] = ALIGNMENT_FIELDS,
+    confidence: float = 0.95,
+    deadline: Optional[float] = None
+) -> Dict:
+    """
+    Simulate one composition per jurisdiction side by side and compare them.
+
+    `entries` are (jurisdiction directory, composition id or None for the
+    largest one); the first is the baseline. Modules are aligned across
+    jurisdictions by `align_by` (see `aligned_roles`) and every aligned role
+    draws from one random stream keyed by the seed and the role, so a run
+    gives equivalent steps the same luck everywhere and the differences
+    between regimes are paired. Unaligned modules and typed-edge draws get
+    streams of their own.
+
+    Returns per-jurisdiction completion statistics with the paired difference
+    from the baseline (and its confidence interval), and per-role module
+    durations and criticality; `comparison_table` lays these out as rows.
+    """
+    if not entries:
+        raise ValueError("No jurisdictions to compare.")
+    if runs < 1:
+        raise ValueError("runs must be at least 1.")
+
+    seed_seq = np.random.SeedSequence(seed)
+    max_loops = int(params["max_feedback_loops"])
+    sides = []
+    for path, composition_id in entries:
+        model = load_jurisdiction(path)
+        compiled = model.compile(composition_id)
+        if not compiled.permitting_modules():
+            raise ValueError(f"No valid modules found in memory for {compiled.composition_id}.")
+        if not compiled.is_dag:
+            raise ValueError(f"Composition graph contains cycles: {compiled.composition_id}.")
+        module_params = compile_parameters(compiled, model.memory, params)
+        roles = aligned_roles(compiled, align_by)
+        sides.append({
+            "model": model,
+            "label": model.label,
+            "compiled": compiled,
+            "roles": roles,
+            "node_params": [module_params.subset([v]) for v in range(len(compiled.nodes))],
+            "node_rngs": [stream_for(seed_seq, role) for role in roles],
+            "edge_rules": compile_edge_rules(compiled, model.memory, params, module_params),
+            "edge_rng": stream_for(seed_seq, f"edges:{model.label}:{compiled.composition_id}"),
+            "acc": SimulationAccumulator(len(compiled.nodes), max_loops),
+            "duration_sum": np.zeros(len(compiled.nodes)),
+        })
+
+    # The same directory twice (two of its compositions) needs distinct columns
+    labels = [side["label"] for side in sides]
+    for side in sides:
+        if labels.count(side["label"]) > 1:
+            side["label"] = f"{side['label']}/{side['compiled'].composition_id}"
+
+    paired = ScenarioAccumulator(len(sides))
+    batch = min(batch_size_for(len(side["compiled"].nodes), max_loops, runs) for side in sides)
+    for start in range(0, runs, batch):
+        n = min(batch, runs - start)
+        makespans = []
+        for side in sides:
+            draws = [
+                sample_module_durations(rng, n, node_params, max_loops)
+                for rng, node_params in zip(side["node_rngs"], side["node_params"])
+            ]
+            durations = np.hstack([d for d, _ in draws])
+            loops = np.hstack([l for _, l in draws])
+            rules = side["edge_rules"]
+            edges = sample_edge_draws(side["edge_rng"], n, rules, max_loops) if rules else None
+            _, makespan, slack = critical_path(durations, side["compiled"].schedule, edges=edges)
+            side["acc"].update(durations, loops, makespan, slack)
+            side["duration_sum"] += durations.sum(axis=0)
+            makespans.append(makespan)
+        paired.update(np.stack(makespans))
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    jurisdictions = []
+    role_rows: Dict[str, Dict] = {}
+    for s, side in enumerate(sides):
+        model, compiled, acc = side["model"], side["compiled"], side["acc"]
+        # Savings are baseline - this side; report this side - baseline
+        difference = 0.0 - float(paired.savings.mean[s])
+        half_width = float(z * paired.savings.std[s] / np.sqrt(paired.runs))
+        jurisdictions.append({
+            "label": side["label"],
+            "jurisdiction": model.name,
+            "path": str(model.path),
+            "composition_id": compiled.composition_id,
+            "modules": len(compiled.permitting_modules()),
+            "avg_duration": acc.makespan.mean,
+            "completion_time": acc.completion_summary(),
+            "deadline_probability": None if deadline is None else acc.makespan_sketch.cdf(deadline),
+            "difference": difference,
+            "ci_low": difference - half_width,
+            "ci_high": difference + half_width,
+        })
+
+        criticality = acc.criticality()
+        for mid in compiled.permitting_modules():
+            v = compiled.index[mid]
+            row = role_rows.setdefault(side["roles"][v], {"role": side["roles"][v], "modules": {}})
+            row["modules"][side["label"]] = {
+                "module_id": mid,
+                "mean_duration": float(side["duration_sum"][v] / acc.runs),
+                "critical_fraction": float(criticality["critical_fraction"][v]),
+            }
+
+    return {
+        "runs": paired.runs,
+        "seed": int(seed_seq.entropy),
+        "confidence": confidence,
+        "align_by": list(align_by),
+        "deadline": deadline,
+        "baseline": jurisdictions[0]["label"],
+        "jurisdictions": jurisdictions,
+        # Roles present in every jurisdiction first, then partial matches
+        "roles": sorted(role_rows.values(), key=lambda row: -len(row["modules"])),
+    }
+
+
+def comparison_table(report: Dict) -> List[Dict]:
+    """
+    `compare_jurisdictions` as table rows: one per metric or aligned role,
+    with a column per jurisdiction label (None where a role is missing).
+    """
+    labels = [j["label"] for j in report["jurisdictions"]]
+    rows = [
+        {"row": "completion mean (days)", **{j["label"]: j["avg_duration"] for j in report["jurisdictions"]}},
+        {"row": "completion p90 (days)", **{j["label"]: j["completion_time"]["p90"] for j in report["jurisdictions"]}},
+        {"row": f"vs {report['baseline']} (days)", **{j["label"]: j["difference"] for j in report["jurisdictions"]}},
+    ]
+    if report["deadline"] is not None:
+        rows.append({
+            "row": f"P(done ≤ {report['deadline']:g} days)",
+            **{j["label"]: j["deadline_probability"] for j in report["jurisdictions"]},
+        })
+    for role in report["roles"]:
+        rows.append({
+            "row": role["role"],
+            **{label: role["modules"][label]["mean_duration"] if label in role["modules"] else None for label in labels},
+        })
+    return rows
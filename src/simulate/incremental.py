@@ -0,0 +1,318 @@
+# src/simulate/incremental.py
+
+import zlib
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from compose.compiled_composition import CompiledComposition, compile_composition
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from simulate.accumulators import CRITICAL_TOLERANCE, SimulationAccumulator
+from simulate.parameters import ModuleParameters, compile_edge_rules, compile_parameters
+from simulate.vectorized import critical_path, sample_edge_draws, sample_module_durations
+
+# Cached draws kept beyond the current composition's nodes, so undoing an
+# edit (or toggling a module back) reuses its old draws.
+SPARE_DRAW_ENTRIES = 256
+
+NODE_STATISTICS = ("critical_fraction", "mean_contribution", "p90_contribution", "mean_slack")
+
+
+class NodeDraws:
+    """
+    One node's sampled durations and rework loops over every run, plus the
+    statistics that depend on them alone.
+    """
+
+    def __init__(self, durations: np.ndarray, loops: np.ndarray, max_loops: int):
+        self.durations = durations
+        self.mean_duration = float(durations.mean())
+        self.failures = int((loops > 0).sum())
+        self.rework_histogram = np.bincount(loops, minlength=max_loops + 1).tolist()
+
+
+class PathState:
+    """
+    Longest-path arrays of the last simulated composition, node-major:
+    durations, finish (earliest finish) and tail (longest path from the
+    node's start to the end) are (n_nodes, runs).
+    """
+
+    def __init__(self, compiled: CompiledComposition, signatures: List[tuple]):
+        self.nodes = compiled.nodes
+        self.index = compiled.index
+        self.signatures = signatures
+        self.preds = neighbour_sets(compiled, compiled.pred_indptr, compiled.pred_indices)
+        self.succs = neighbour_sets(compiled, compiled.succ_indptr, compiled.succ_indices)
+        self.durations: Optional[np.ndarray] = None
+        self.finish: Optional[np.ndarray] = None
+        self.tail: Optional[np.ndarray] = None
+        self.makespan: Optional[np.ndarray] = None
+        self.statistics: Dict[str, np.ndarray] = {}
+
+
+def neighbour_sets(compiled: CompiledComposition, indptr: np.ndarray, indices: np.ndarray) -> List[frozenset]:
+    return [
+        frozenset(compiled.nodes[j] for j in indices[indptr[v]:indptr[v + 1]].tolist())
+        for v in range(len(compiled.nodes))
+    ]
+
+
+def node_levels(order: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Longest chain of `indices` neighbours behind each node, walking `order`.
+    """
+    level = np.zeros(len(indptr) - 1, dtype=np.int64)
+    for v in order.tolist():
+        neighbours = indices[indptr[v]:indptr[v + 1]]
+        if len(neighbours):
+            level[v] = level[neighbours].max() + 1
+    return level
+
+
+def relax(values: np.ndarray, durations: np.ndarray, nodes: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> None:
+    """
+    values[v] = durations[v] + max(values[neighbours of v]) for every v in
+    `nodes` (none of which neighbour each other), as one gather + reduceat.
+    """
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    values[nodes] = durations[nodes]
+    linked = counts > 0
+    if not linked.any():
+        return
+    nodes, starts, counts = nodes[linked], starts[linked], counts[linked]
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    neighbours = indices[np.repeat(starts - offsets, counts) + np.arange(counts.sum())]
+    values[nodes] += np.maximum.reduceat(values[neighbours], offsets, axis=0)
+
+
+def propagate(
+    values: np.ndarray,
+    durations: np.ndarray,
+    seeds: np.ndarray,
+    fresh: np.ndarray,
+    level: np.ndarray,
+    inward: Tuple[np.ndarray, np.ndarray],
+    outward: Tuple[np.ndarray, np.ndarray]
+) -> np.ndarray:
+    """
+    Recompute `values` (see `relax`) for the `seeds` mask, then for the
+    outward neighbours of every node whose row actually changed, level by
+    level. `fresh` marks rows with no previous value. Returns the mask of
+    recomputed nodes.
+    """
+    pending: Dict[int, set] = {}
+    for v in np.flatnonzero(seeds).tolist():
+        pending.setdefault(int(level[v]), set()).add(v)
+    recomputed = np.zeros(len(seeds), dtype=bool)
+    out_indptr, out_indices = outward
+    while pending:
+        nodes = np.array(sorted(pending.pop(min(pending))), dtype=np.int64)
+        before = values[nodes].copy()
+        relax(values, durations, nodes, *inward)
+        recomputed[nodes] = True
+        moved = nodes[fresh[nodes] | (values[nodes] != before).any(axis=1)]
+        for v in moved.tolist():
+            for u in out_indices[out_indptr[v]:out_indptr[v + 1]].tolist():
+                pending.setdefault(int(level[u]), set()).add(u)
+    return recomputed
+
+
+def node_statistics(durations: np.ndarray, slack: np.ndarray, makespan: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Criticality statistics for node-major (k, runs) rows, as in SimulationAccumulator.criticality.
+    """
+    critical = slack <= CRITICAL_TOLERANCE * np.maximum(makespan, 1.0)
+    contribution = np.where(critical, durations, 0.0)
+    return {
+        "critical_fraction": critical.mean(axis=1),
+        "mean_contribution": contribution.mean(axis=1),
+        "p90_contribution": np.quantile(contribution, 0.90, axis=1, method="inverted_cdf"),
+        "mean_slack": slack.mean(axis=1),
+    }
+
+
+def carry_rows(old: Optional[np.ndarray], old_rows: np.ndarray, shape: tuple, in_place: bool) -> np.ndarray:
+    """
+    Rows of `old` moved to their new node positions (uninitialised where new).
+    """
+    if in_place:
+        return old
+    out = np.empty(shape)
+    kept = old_rows >= 0
+    if old is not None and kept.any():
+        out[kept] = old[old_rows[kept]]
+    return out
+
+
+class IncrementalSimulator:
+    """
+    Monte Carlo simulation that keeps its random draws and longest-path
+    arrays between calls, so an edited composition only recomputes what the
+    edit actually changes. Meant for interactive what-if editing.
+
+    Every node draws from its own stream (the seed plus a hash of its id),
+    cached by node id and parameter signature: unchanged modules keep their
+    draws, and an edited module is redrawn from the same stream, so variants
+    are compared on common random numbers. Finish times are recomputed from
+    the nodes whose predecessors or parameters changed, downstream for as long
+    as any run's value moves; tails (longest path to the end) likewise
+    upstream from the nodes whose successors or parameters changed. Slack is
+    makespan - start - tail. Per-module statistics are refreshed for the
+    recomputed nodes, or everywhere when any run's completion time moved.
+
+    A result equals that of a fresh simulator on the same composition, and
+    matches `run_simulation` statistically (the streams differ). Compositions
+    with override / conditional / feedback_loop edges are recomputed in full
+    on every call; only their draws are reused.
+    """
+
+    def __init__(self, memory: PolarisMemory, params: dict, runs: int = 1000, seed: Optional[int] = None):
+        if runs < 1:
+            raise ValueError("runs must be at least 1.")
+        self.memory = memory
+        self.params = params
+        self.runs = runs
+        self.max_loops = int(params["max_feedback_loops"])
+        self.seed_seq = np.random.SeedSequence(seed)
+        self._draws: "OrderedDict[Tuple[str, tuple], NodeDraws]" = OrderedDict()
+        self._state: Optional[PathState] = None
+        self.last_update: Dict = {}
+
+    def node_draws(self, node: str, signature: tuple, module_params: ModuleParameters, i: int) -> NodeDraws:
+        key = (node, signature)
+        draws = self._draws.get(key)
+        if draws is None:
+            stream = np.random.SeedSequence(self.seed_seq.entropy, spawn_key=(zlib.crc32(node.encode("utf-8")),))
+            durations, loops = sample_module_durations(
+                np.random.default_rng(stream), self.runs, module_params.subset([i]), self.max_loops
+            )
+            draws = self._draws[key] = NodeDraws(durations[:, 0].astype(np.float64), loops[:, 0], self.max_loops)
+        return draws
+
+    def simulate(self, composition: MemoryObject, deadline: Optional[float] = None) -> Dict:
+        """
+        Simulate `composition`, reusing whatever the previous call left that
+        the changes did not touch. The result has the `run_simulation` keys
+        for completion time, effort, failures, slack, criticality, distribution
+        and deadline, plus `incremental` counts of the nodes recomputed.
+        """
+        compiled = compile_composition(composition, self.memory)
+        if not compiled.permitting_modules():
+            raise ValueError("No valid modules found in memory for this composition.")
+        if not compiled.is_dag:
+            raise ValueError("Composition graph contains cycles.")
+
+        module_params = compile_parameters(compiled, self.memory, self.params)
+        rules = compile_edge_rules(compiled, self.memory, self.params, module_params)
+        n = len(compiled.nodes)
+        signatures = module_params.signatures()
+        draws = []
+        for i, node in enumerate(compiled.nodes):
+            draws.append(self.node_draws(node, signatures[i], module_params, i))
+            self._draws.move_to_end((node, signatures[i]))
+        while len(self._draws) > n + SPARE_DRAW_ENTRIES:
+            self._draws.popitem(last=False)
+
+        old = self._state
+        state = PathState(compiled, signatures)
+        if old is None or rules is not None:
+            old_rows = np.full(n, -1)
+        else:
+            old_rows = np.array([old.index.get(node, -1) for node in compiled.nodes], dtype=np.int64)
+        in_place = old is not None and rules is None and old.nodes == compiled.nodes
+        redraw = np.array([
+            row < 0 or old.signatures[row] != signatures[v] for v, row in enumerate(old_rows.tolist())
+        ], dtype=bool)
+
+        shape = (n, self.runs)
+        state.durations = carry_rows(old.durations if old else None, old_rows, shape, in_place)
+        for v in np.flatnonzero(redraw).tolist():
+            state.durations[v] = draws[v].durations
+
+        if rules is not None:
+            # Typed-edge rules act on whole runs: recompute everything
+            stream = np.random.SeedSequence(self.seed_seq.entropy, spawn_key=(zlib.crc32(compiled.content_hash.encode("utf-8")),))
+            edges = sample_edge_draws(np.random.default_rng(stream), self.runs, rules, self.max_loops)
+            _, makespan, slack = critical_path(state.durations.T, compiled.schedule, edges=edges)
+            forward = backward = refresh = np.ones(n, dtype=bool)
+            statistics = node_statistics(state.durations, slack.T, makespan)
+            self._state = None
+        else:
+            changed_preds = redraw | np.array([
+                row < 0 or state.preds[v] != old.preds[row] for v, row in enumerate(old_rows.tolist())
+            ], dtype=bool)
+            changed_succs = redraw | np.array([
+                row < 0 or state.succs[v] != old.succs[row] for v, row in enumerate(old_rows.tolist())
+            ], dtype=bool)
+            fresh = old_rows < 0
+            preds = (compiled.pred_indptr, compiled.pred_indices)
+            succs = (compiled.succ_indptr, compiled.succ_indices)
+            order = compiled.topological_order
+
+            state.finish = carry_rows(old.finish if old else None, old_rows, shape, in_place)
+            state.tail = carry_rows(old.tail if old else None, old_rows, shape, in_place)
+            forward = propagate(
+                state.finish, state.durations, changed_preds, fresh, node_levels(order, *preds), preds, succs
+            )
+            backward = propagate(
+                state.tail, state.durations, changed_succs, fresh, node_levels(order[::-1], *succs), succs, preds
+            )
+
+            makespan = state.finish[compiled.sinks].max(axis=0)
+            refresh = forward | backward
+            if old is None or not np.array_equal(makespan, old.makespan):
+                refresh[:] = True
+            rows = np.flatnonzero(refresh)
+            start = state.finish[rows] - state.durations[rows]
+            fresh = node_statistics(state.durations[rows], makespan - start - state.tail[rows], makespan)
+            statistics = {}
+            for name in NODE_STATISTICS:
+                statistics[name] = carry_rows(old.statistics[name] if old else None, old_rows, (n,), in_place)
+                statistics[name][rows] = fresh[name]
+            state.makespan = makespan
+            state.statistics = statistics
+            self._state = state
+
+        self.last_update = {
+            "nodes": n,
+            "redrawn": int(redraw.sum()),
+            "forward": int(forward.sum()),
+            "backward": int(backward.sum()),
+            "statistics": int(refresh.sum()),
+            "full": rules is not None,
+        }
+        return self.summarize(compiled, draws, makespan, statistics, deadline)
+
+    def summarize(
+        self,
+        compiled: CompiledComposition,
+        draws: List[NodeDraws],
+        makespan: np.ndarray,
+        statistics: Dict[str, np.ndarray],
+        deadline: Optional[float] = None
+    ) -> Dict:
+        acc = SimulationAccumulator(0, self.max_loops)
+        acc.update_makespan(makespan)
+        valid = [compiled.index[mid] for mid in compiled.permitting_modules()]
+        return {
+            "avg_duration": acc.makespan.mean,
+            "avg_effort": float(sum(d.mean_duration for d in draws)),
+            "runs": self.runs,
+            "seed": int(self.seed_seq.entropy),
+            "failures": {compiled.nodes[i]: draws[i].failures for i in valid},
+            "slack": {compiled.nodes[i]: float(statistics["mean_slack"][i]) for i in valid},
+            "criticality": {
+                compiled.nodes[i]: {name: float(statistics[name][i]) for name in NODE_STATISTICS} for i in valid
+            },
+            "completion_time": acc.completion_summary(),
+            "distribution": acc.distribution(),
+            "deadline": None if deadline is None else {
+                "days": float(deadline),
+                "probability": acc.makespan_sketch.cdf(deadline),
+                "bucket_width": acc.makespan_sketch.width,
+            },
+            "rework_histogram": {compiled.nodes[i]: draws[i].rework_histogram for i in valid},
+            "incremental": dict(self.last_update),
+        }
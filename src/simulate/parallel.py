@@ -0,0 +1,166 @@
+# src/simulate/parallel.py
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from simulate.accumulators import SimulationAccumulator
+from simulate.sampling import sampling_strategy
+from simulate.vectorized import KernelPlan, simulate_chunk
+
+# Runs per chunk. Chunks (not workers) own the seed streams, so results
+# depend only on the seed and run count, never on the worker count.
+DEFAULT_CHUNK_RUNS = 10_000
+
+# Smaller chunks for adaptive runs, so simple compositions can stop early.
+ADAPTIVE_CHUNK_RUNS = 1_000
+
+_worker_plan: Optional[KernelPlan] = None
+_worker_plans: List[KernelPlan] = []
+
+
+def _init_worker(plan: KernelPlan) -> None:
+    global _worker_plan
+    _worker_plan = plan
+
+
+def _run_worker_chunk(runs: int, seed_seq: np.random.SeedSequence, chunk_fn: Callable = simulate_chunk):
+    return chunk_fn(_worker_plan, runs, seed_seq)
+
+
+def _init_batch_worker(plans: List[KernelPlan]) -> None:
+    global _worker_plans
+    _worker_plans = plans
+
+
+def _run_batch_chunk(plan_index: int, runs: int, seed_seq: np.random.SeedSequence):
+    return simulate_chunk(_worker_plans[plan_index], runs, seed_seq)
+
+
+def chunk_sizes(runs: int, chunk_runs: int = DEFAULT_CHUNK_RUNS) -> List[int]:
+    return [min(chunk_runs, runs - start) for start in range(0, runs, chunk_runs)]
+
+
+def run_chunked(
+    plan: KernelPlan,
+    runs: int,
+    seed_seq: np.random.SeedSequence,
+    workers: int = 1,
+    chunk_runs: int = DEFAULT_CHUNK_RUNS,
+    chunk_fn: Callable = simulate_chunk
+):
+    """
+    Split `runs` into fixed-size chunks, give each chunk a spawned child of
+    `seed_seq`, simulate them with `chunk_fn` (in a process pool when
+    workers > 1) and merge the partial aggregates in chunk order.
+
+    `chunk_fn(plan, runs, seed_seq)` must be a module-level function returning
+    an accumulator with a `merge` method.
+    """
+    sizes = chunk_sizes(runs, chunk_runs)
+    if not sizes:
+        raise ValueError("runs must be at least 1.")
+    streams = seed_seq.spawn(len(sizes))
+
+    if workers <= 1 or len(sizes) <= 1:
+        partials = [chunk_fn(plan, size, stream) for size, stream in zip(sizes, streams)]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(sizes)),
+            initializer=_init_worker,
+            initargs=(plan,)
+        ) as pool:
+            partials = list(pool.map(_run_worker_chunk, sizes, streams, [chunk_fn] * len(sizes)))
+
+    total = partials[0]
+    for partial in partials[1:]:
+        total.merge(partial)
+    return total
+
+
+def run_chunked_many(
+    plans: List[KernelPlan],
+    runs: int,
+    seed_seqs: List[np.random.SeedSequence],
+    workers: int = 1,
+    chunk_runs: int = DEFAULT_CHUNK_RUNS
+) -> List[SimulationAccumulator]:
+    """
+    `run_chunked` for several plans at once: the chunks of every plan share
+    one process pool (each worker receives all plans once), and each plan's
+    chunks are merged in order, so every result matches a separate
+    `run_chunked(plan, runs, seed_seq)` call.
+    """
+    sizes = chunk_sizes(runs, chunk_runs)
+    if not sizes:
+        raise ValueError("runs must be at least 1.")
+    tasks = [
+        (i, size, stream)
+        for i, seed_seq in enumerate(seed_seqs)
+        for size, stream in zip(sizes, seed_seq.spawn(len(sizes)))
+    ]
+
+    if workers <= 1 or len(tasks) <= 1:
+        partials = [simulate_chunk(plans[i], size, stream) for i, size, stream in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_init_batch_worker,
+            initargs=(plans,)
+        ) as pool:
+            partials = list(pool.map(_run_batch_chunk, *zip(*tasks)))
+
+    totals: List[Optional[SimulationAccumulator]] = [None] * len(plans)
+    for (i, _, _), partial in zip(tasks, partials):
+        if totals[i] is None:
+            totals[i] = partial
+        else:
+            totals[i].merge(partial)
+    return totals
+
+
+def run_until_converged(
+    plan: KernelPlan,
+    seed_seq: np.random.SeedSequence,
+    target_half_width: float,
+    metric: str = "mean",
+    confidence: float = 0.95,
+    max_runs: int = 100_000,
+    workers: int = 1,
+    chunk_runs: int = ADAPTIVE_CHUNK_RUNS
+) -> Tuple[SimulationAccumulator, float, bool]:
+    """
+    Simulate chunk after chunk until the confidence-interval half-width of
+    `metric` drops to `target_half_width` or `max_runs` is reached.
+
+    Chunks are checked strictly in order (surplus chunks from a parallel round
+    are discarded), so the stopping point does not depend on `workers`.
+    Returns (accumulator, achieved half-width, converged).
+    """
+    total = SimulationAccumulator(plan.n_nodes, int(plan.params["max_feedback_loops"]), sampling_strategy(plan.params))
+    sizes = chunk_sizes(max_runs, chunk_runs)
+    streams = seed_seq.spawn(len(sizes))
+    per_round = max(1, workers)
+    half_width = float("inf")
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(plan,))
+    try:
+        for start in range(0, len(sizes), per_round):
+            round_sizes = sizes[start:start + per_round]
+            round_streams = streams[start:start + per_round]
+            if pool is None:
+                partials = [simulate_chunk(plan, size, stream) for size, stream in zip(round_sizes, round_streams)]
+            else:
+                partials = list(pool.map(_run_worker_chunk, round_sizes, round_streams))
+
+            for partial in partials:
+                total.merge(partial)
+                half_width = total.confidence_half_width(metric, confidence)
+                if half_width <= target_half_width:
+                    return total, half_width, True
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return total, half_width, False
@@ -0,0 +1,347 @@
+# src/simulate/parameters.py
+
+import re
+import hashlib
+import numpy as np
+from typing import Dict, List, Optional
+from compose.compiled_composition import CompiledComposition
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+
+DURATION_MODELS = ("uniform", "triangular", "lognormal")
+
+# Triangular spread as fractions of `duration_days` (below, above): permitting
+# delays run long far more often than short.
+DEFAULT_DURATION_SPREAD = (0.25, 0.75)
+DEFAULT_DURATION_SIGMA = 0.35
+
+# Chance that a `conditional` edge's condition does not hold in a run.
+DEFAULT_CONDITIONAL_SKIP_RATE = 0.5
+
+# Params for Studio panels with no controls of their own (and the benchmark):
+# each module's duration_days and risk data.
+DEFAULT_STUDIO_PARAMS = {
+    "task_duration_range": (5, 20),
+    "failure_rate": 0.1,
+    "max_feedback_loops": 2,
+    "duration_model": "triangular",
+    "module_risk": True,
+}
+
+
+class ModuleParameters:
+    """
+    Per-node distribution parameters for the vectorized sampler.
+
+    Arrays are indexed like `CompiledComposition.nodes`:
+    - low / mode / high: integer uniform bounds (mode unused) or triangular bounds
+    - mu / sigma: log-space parameters for the lognormal model
+    - fail_prob: chance the first attempt fails
+    - loop_prob: chance each rework attempt fails again
+    - cap: longest total time a module can take once overrides fire (inf = none)
+    """
+
+    FIELDS = ("low", "mode", "high", "mu", "sigma", "fail_prob", "loop_prob", "cap")
+
+    def __init__(self, model: str, n_nodes: int):
+        if model not in DURATION_MODELS:
+            raise ValueError(f"Unknown duration model: {model}")
+        self.model = model
+        self.n_nodes = n_nodes
+        self.low = np.zeros(n_nodes)
+        self.mode = np.zeros(n_nodes)
+        self.high = np.zeros(n_nodes)
+        self.mu = np.zeros(n_nodes)
+        self.sigma = np.zeros(n_nodes)
+        self.fail_prob = np.zeros(n_nodes)
+        self.loop_prob = np.zeros(n_nodes)
+        self.cap = np.full(n_nodes, np.inf)
+
+    def failure_thresholds(self, max_loops: int) -> np.ndarray:
+        """
+        (n_nodes, max_loops) probabilities that attempt k + 1 is needed.
+        """
+        thresholds = np.repeat(self.loop_prob[:, None], max_loops, axis=1)
+        if max_loops:
+            thresholds[:, 0] = self.fail_prob
+        return thresholds
+
+    def subset(self, nodes) -> "ModuleParameters":
+        """
+        The parameters of `nodes` only, in that order.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        out = ModuleParameters(self.model, len(nodes))
+        for name in self.FIELDS:
+            setattr(out, name, getattr(self, name)[nodes].copy())
+        return out
+
+    def signatures(self) -> List[tuple]:
+        """
+        Per node, a hashable summary of everything that shapes its draws.
+        """
+        rows = np.column_stack([getattr(self, name) for name in self.FIELDS]).tolist()
+        return [(self.model, *row) for row in rows]
+
+
+def nominal_durations(compiled: CompiledComposition, fallback: float) -> np.ndarray:
+    """
+    `duration_days` per node, or `fallback` where a module doesn't declare one.
+    """
+    nominal = np.full(len(compiled.nodes), float(fallback))
+    for mid, module in compiled.modules.items():
+        days = module.data.get("duration_days")
+        if days:
+            nominal[compiled.index[mid]] = float(days)
+    return nominal
+
+
+def linked_objects(memory: PolarisMemory, object_type: str, link_field: str, compiled: CompiledComposition) -> List[MemoryObject]:
+    """
+    Objects of `object_type` whose `link_field` points at a node of the composition.
+    """
+    return [obj for node in compiled.nodes for obj in memory.get_linked(node, object_type, link_field)]
+
+
+def compile_parameters(compiled: CompiledComposition, memory: PolarisMemory, params: dict) -> ModuleParameters:
+    """
+    Turn simulation params plus module data into per-node parameter arrays.
+
+    `duration_model` (default "uniform") picks the duration distribution:
+    - "uniform": integer days in `task_duration_range` for every module (legacy)
+    - "triangular": around each module's `duration_days`, spread by `duration_spread`
+    - "lognormal": mean `duration_days`, log-space sigma `duration_sigma`
+    Modules without `duration_days` are centred on the middle of `task_duration_range`.
+
+    With `module_risk`, FailureEvent `severity_rating`s on a module combine with
+    `failure_rate` as independent causes, and a FeedbackLoop triggered by the
+    module sets the chance of failing again to 1 - `stability_rating`.
+    Otherwise every attempt fails with `failure_rate`.
+    """
+    model = params.get("duration_model", "uniform")
+    n = len(compiled.nodes)
+    out = ModuleParameters(model, n)
+    low, high = params["task_duration_range"]
+
+    if model == "uniform":
+        out.low[:] = low
+        out.high[:] = high
+    else:
+        nominal = nominal_durations(compiled, (low + high) / 2)
+        if model == "triangular":
+            below, above = params.get("duration_spread", DEFAULT_DURATION_SPREAD)
+            out.low = nominal * (1 - below)
+            out.mode = nominal
+            out.high = nominal * (1 + above)
+        else:
+            sigma = float(params.get("duration_sigma", DEFAULT_DURATION_SIGMA))
+            out.sigma[:] = sigma
+            # Mean of a lognormal is exp(mu + sigma² / 2)
+            out.mu = np.log(np.maximum(nominal, 1e-9)) - sigma ** 2 / 2
+
+    base_rate = float(params["failure_rate"])
+    out.fail_prob[:] = base_rate
+    out.loop_prob[:] = base_rate
+
+    if params.get("module_risk"):
+        passes = np.full(n, 1 - base_rate)
+        for event in linked_objects(memory, "FailureEvent", "module_id", compiled):
+            passes[compiled.index[event.data["module_id"]]] *= 1 - float(event.data.get("severity_rating", 0) or 0)
+        out.fail_prob = 1 - passes
+
+        out.loop_prob = out.fail_prob.copy()
+        for loop in linked_objects(memory, "FeedbackLoop", "trigger_module_id", compiled):
+            stability = loop.data.get("stability_rating")
+            if stability is not None:
+                out.loop_prob[compiled.index[loop.data["trigger_module_id"]]] = 1 - float(stability)
+
+    out.cap = override_caps(compiled, memory, params)
+    return out
+
+
+def parse_days(value) -> Optional[float]:
+    """
+    Read a day count from values like 120, "120", "120_days" or "120 days".
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)(?:[_\s]*days?)?\s*", str(value or ""))
+    return float(match.group(1)) if match else None
+
+
+def override_caps(compiled: CompiledComposition, memory: PolarisMemory, params: dict) -> np.ndarray:
+    """
+    Per-node duration caps from OverrideProtocols on the composition's modules.
+
+    A `timebound_default` protocol (deemed approval) caps the module at its
+    deadline, e.g. trigger_condition {"value": "120_days"}. Other protocol
+    types are discretionary and only cap the module at `override_days` when
+    that parameter is given. The tightest cap wins. `apply_overrides=False`
+    turns all override behaviour off.
+    """
+    caps = np.full(len(compiled.nodes), np.inf)
+    if not params.get("apply_overrides", True):
+        return caps
+    override_days = params.get("override_days")
+    for protocol in linked_objects(memory, "OverrideProtocol", "module_id", compiled):
+        if protocol.data.get("override_type") == "timebound_default":
+            days = parse_days((protocol.data.get("trigger_condition") or {}).get("value"))
+        else:
+            days = override_days
+        if days is not None:
+            i = compiled.index[protocol.data["module_id"]]
+            caps[i] = min(caps[i], float(days))
+    return caps
+
+
+class EdgeRules:
+    """
+    Per-edge behaviour for typed edges, indexed like `CompiledComposition.edges`
+    (`edge_src` holds each edge's source node).
+
+    - thresholds: an `override` edge u → v lets v start once u has run this
+      many days, even if u is not finished (inf = plain dependency)
+    - skip_prob: chance a `conditional` edge is inactive in a run
+    - feedback_*: `feedback_loop` edges u → v with v upstream of u; after u
+      finishes, the work from v's start to u's finish is redone with
+      probability `feedback_prob`, up to `max_feedback_loops` times.
+      `feedback_level` is u's depth in the schedule.
+    """
+
+    ARRAYS = ("edge_src", "thresholds", "skip_prob", "feedback_src", "feedback_dst", "feedback_prob", "feedback_level")
+
+    def __init__(self, edge_src: np.ndarray):
+        self.n_edges = len(edge_src)
+        self.edge_src = edge_src
+        self.thresholds = np.full(self.n_edges, np.inf)
+        self.skip_prob = np.zeros(self.n_edges)
+        self.feedback_src = np.zeros(0, dtype=np.int32)
+        self.feedback_dst = np.zeros(0, dtype=np.int32)
+        self.feedback_prob = np.zeros(0)
+        self.feedback_level = np.zeros(0, dtype=np.int64)
+
+    @property
+    def has_overrides(self) -> bool:
+        return bool(np.isfinite(self.thresholds).any())
+
+    @property
+    def has_conditions(self) -> bool:
+        return bool((self.skip_prob > 0).any())
+
+
+def node_depths(compiled: CompiledComposition) -> np.ndarray:
+    depth = np.zeros(len(compiled.nodes), dtype=np.int64)
+    for level, group in enumerate(compiled.schedule[0], start=1):
+        depth[group[0]] = level
+    return depth
+
+
+def precedes(compiled: CompiledComposition, ancestor: int, node: int) -> bool:
+    """
+    Whether `ancestor` is upstream of `node` along precedence edges.
+    """
+    seen, stack = {node}, [node]
+    while stack:
+        w = stack.pop()
+        for p in compiled.pred_indices[compiled.pred_indptr[w]:compiled.pred_indptr[w + 1]].tolist():
+            if p == ancestor:
+                return True
+            if p not in seen:
+                seen.add(p)
+                stack.append(p)
+    return False
+
+
+def compile_edge_rules(
+    compiled: CompiledComposition,
+    memory: PolarisMemory,
+    params: dict,
+    module_params: ModuleParameters
+) -> Optional[EdgeRules]:
+    """
+    Build EdgeRules for the composition's override, conditional and
+    feedback_loop edges; None when it has none, so plain DAGs skip the extra work.
+
+    Override edges use the source module's override cap, else `override_days`.
+    Conditional edges are skipped with `conditional_skip_rate`. Feedback edges
+    fire with `feedback_rate` (default `failure_rate`), or 1 - stability_rating
+    of a FeedbackLoop triggered by the source module when `module_risk` is on.
+    Feedback edges whose target is not upstream of the source are ignored.
+    """
+    types = compiled.edge_types
+    if not any(t in ("override", "conditional", "feedback_loop") for t in types):
+        return None
+
+    rules = EdgeRules(np.array(compiled.edge_src))
+    override_days = params.get("override_days")
+    skip_rate = float(params.get("conditional_skip_rate", DEFAULT_CONDITIONAL_SKIP_RATE))
+    for e, edge_type in enumerate(types):
+        if edge_type == "override" and params.get("apply_overrides", True):
+            cap = module_params.cap[compiled.edge_src[e]]
+            if np.isfinite(cap):
+                rules.thresholds[e] = cap
+            elif override_days is not None:
+                rules.thresholds[e] = float(override_days)
+        elif edge_type == "conditional":
+            rules.skip_prob[e] = skip_rate
+
+    if len(compiled.feedback_edges):
+        depth = node_depths(compiled)
+        feedback_rate = float(params.get("feedback_rate", params["failure_rate"]))
+        stability = {}
+        if params.get("module_risk"):
+            for loop in linked_objects(memory, "FeedbackLoop", "trigger_module_id", compiled):
+                if loop.data.get("stability_rating") is not None:
+                    stability[compiled.index[loop.data["trigger_module_id"]]] = float(loop.data["stability_rating"])
+
+        src, dst, prob = [], [], []
+        for e in compiled.feedback_edges.tolist():
+            u, v = int(compiled.edge_src[e]), int(compiled.edge_dst[e])
+            if not precedes(compiled, v, u):
+                print(f"⚠️ Ignoring feedback edge {compiled.nodes[u]} → {compiled.nodes[v]}: target is not upstream")
+                continue
+            src.append(u)
+            dst.append(v)
+            prob.append(1 - stability[u] if u in stability else feedback_rate)
+        rules.feedback_src = np.array(src, dtype=np.int32)
+        rules.feedback_dst = np.array(dst, dtype=np.int32)
+        rules.feedback_prob = np.array(prob, dtype=np.float64)
+        rules.feedback_level = depth[rules.feedback_src]
+
+    return rules
+
+
+def data_digest(compiled: CompiledComposition, module_params: ModuleParameters, edge_rules: Optional[EdgeRules] = None) -> str:
+    """
+    Hash of what module and overlay data contribute to a run: the compiled
+    parameter and edge-rule arrays, and which nodes resolved to modules.
+    Edits to `duration_days`, risk ratings or override caps change it.
+    """
+    digest = hashlib.sha256(module_params.model.encode("utf-8"))
+    for name in ModuleParameters.FIELDS:
+        digest.update(np.ascontiguousarray(getattr(module_params, name), dtype=np.float64).tobytes())
+    if edge_rules is not None:
+        for name in EdgeRules.ARRAYS:
+            digest.update(np.ascontiguousarray(getattr(edge_rules, name), dtype=np.float64).tobytes())
+    digest.update("\0".join(compiled.permitting_modules()).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def parameter_table(compiled: CompiledComposition, module_params: ModuleParameters) -> Dict[str, Dict[str, float]]:
+    """
+    Per-module view of the compiled parameters, for display and export.
+    """
+    table = {}
+    for mid in compiled.module_ids:
+        i = compiled.index[mid]
+        row = {"fail_prob": float(module_params.fail_prob[i]), "loop_prob": float(module_params.loop_prob[i])}
+        if np.isfinite(module_params.cap[i]):
+            row["cap"] = float(module_params.cap[i])
+        if module_params.model == "lognormal":
+            row.update(mu=float(module_params.mu[i]), sigma=float(module_params.sigma[i]))
+        else:
+            row.update(low=float(module_params.low[i]), high=float(module_params.high[i]))
+            if module_params.model == "triangular":
+                row["mode"] = float(module_params.mode[i])
+        table[mid] = row
+    return table
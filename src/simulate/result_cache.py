@@ -0,0 +1,129 @@
+# src/simulate/result_cache.py
+
+import os
+import json
+from copy import deepcopy
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+# Under the repository's export/, wherever the process was started from
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "export" / "simulation_cache"
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResultCache:
+    """
+    Two-tier cache of simulation results, keyed by `result_record.request_key`
+    (composition content hash, normalized params, runs, seed, engine version).
+
+    The memory tier is an LRU of up to `max_entries` results. The disk tier
+    keeps one JSON file per key under `directory`; when it grows past
+    `max_bytes` the least recently used files are deleted. Disk hits are
+    promoted to memory. Pass `directory=None` for a memory-only cache.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = DEFAULT_CACHE_DIR,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return deepcopy(result)
+
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    result = json.load(f)
+                os.utime(path)  # mark as recently used for eviction
+            except (OSError, ValueError):
+                result = None
+            if result is not None:
+                self._remember(key, result)
+                self.hits += 1
+                return deepcopy(result)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict) -> None:
+        result = deepcopy(result)
+        self._remember(key, result)
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp, self._path(key))
+            self._evict_disk()
+        except OSError as e:
+            print(f"⚠️ Could not write simulation cache entry: {e}")
+
+    def _remember(self, key: str, result: Dict) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.directory is not None and self.directory.exists():
+            for path in self.directory.glob("*.json"):
+                path.unlink()
+
+
+_default_cache = ResultCache()
+
+
+def default_cache() -> ResultCache:
+    return _default_cache
+
+
+def configure_cache(
+    directory: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_MAX_BYTES
+) -> ResultCache:
+    """
+    Replace the process-wide cache used by `run_simulation`.
+    """
+    global _default_cache
+    _default_cache = ResultCache(directory, max_entries, max_bytes)
+    return _default_cache
@@ -0,0 +1,139 @@
+# src/simulate/result_record.py
+
+import json
+import hashlib
+from typing import Dict, Optional
+from compose.compiled_composition import CompiledComposition
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from simulate.parameters import DEFAULT_CONDITIONAL_SKIP_RATE
+
+# Bump whenever the kernel's output for a given seed changes.
+ENGINE_VERSION = "2.4"
+
+# Params that change nothing when set to these values are hashed as if given.
+PARAM_DEFAULTS = {
+    "duration_model": "uniform",
+    "module_risk": False,
+    "apply_overrides": True,
+    "conditional_skip_rate": DEFAULT_CONDITIONAL_SKIP_RATE,
+}
+
+
+def _normalize(value):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if hasattr(value, "item"):
+        # NumPy scalars
+        return _normalize(value.item())
+    return str(value)
+
+
+def normalize_params(params: dict) -> dict:
+    """
+    Params with defaults filled in, tuples as lists and every number as a float,
+    so equivalent requests normalize (and hash) identically.
+    """
+    return _normalize({**PARAM_DEFAULTS, **params})
+
+
+def stable_hash(payload) -> str:
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def params_hash(params: dict) -> str:
+    return stable_hash(normalize_params(params))
+
+
+def request_key(
+    composition_hash: str,
+    params: dict,
+    runs: int,
+    seed: int,
+    stopping: Optional[dict] = None,
+    deadline: Optional[float] = None,
+    data_digest: Optional[str] = None
+) -> str:
+    """
+    Content address of a simulation request: everything that determines the
+    result, and nothing that doesn't (worker count, debug flags).
+    `data_digest` (`parameters.data_digest`) covers the module and overlay
+    data the composition resolves to.
+    """
+    return stable_hash({
+        "composition_hash": composition_hash,
+        "data_digest": data_digest,
+        "params": normalize_params(params),
+        "runs": int(runs),
+        "seed": int(seed),
+        "stopping": _normalize(stopping),
+        "deadline": _normalize(deadline),
+        "engine_version": ENGINE_VERSION,
+    })
+
+
+def result_record_id(key: str) -> str:
+    return f"simresult-{key[:16]}"
+
+
+def record_payload(record: MemoryObject) -> dict:
+    """
+    Inner record dict; records reloaded from disk nest it under `data`.
+    """
+    return record.data.get("data", record.data)
+
+
+def find_result_record(memory: PolarisMemory, key: str) -> Optional[MemoryObject]:
+    """
+    The saved SimulationResult for this request key, if any.
+    """
+    record = memory.get_by_id(result_record_id(key))
+    if record is not None and record.object_type == "SimulationResult" and record_payload(record).get("request_key") == key:
+        return record
+    return None
+
+
+def build_result_record(
+    compiled: CompiledComposition,
+    params: dict,
+    runs: int,
+    seed: int,
+    stopping: Optional[dict],
+    result: Dict,
+    deadline: Optional[float],
+    data_digest: str
+) -> MemoryObject:
+    """
+    Wrap a run_simulation result as a SimulationResult SDMO with everything
+    needed to reproduce it: seed, parameter hash, composition content hash
+    and the digest of the module and overlay data it ran on.
+    """
+    key = request_key(compiled.content_hash, params, runs, seed, stopping, deadline, data_digest)
+    return MemoryObject(
+        id=result_record_id(key),
+        object_type="SimulationResult",
+        jurisdiction=compiled.jurisdiction,
+        version="v1",
+        created_by="simulate",
+        data={
+            "request_key": key,
+            "composition_id": compiled.composition_id,
+            "composition_hash": compiled.content_hash,
+            "data_digest": data_digest,
+            "params": normalize_params(params),
+            "params_hash": params_hash(params),
+            "runs_requested": int(runs),
+            "seed": int(seed),
+            "stopping": _normalize(stopping),
+            "deadline": _normalize(deadline),
+            "engine_version": ENGINE_VERSION,
+            "result": result,
+        },
+    )
@@ -0,0 +1,209 @@
+# src/simulate/sampling.py
+
+import numpy as np
+from functools import lru_cache
+from typing import List
+
+SAMPLING_STRATEGIES = ("random", "antithetic", "lhs", "sobol")
+
+# Variance-reduced designs are built in independent blocks of this many runs.
+# The spread of block means measures the precision actually achieved.
+SAMPLING_BLOCK_RUNS = 256
+
+# Sobol coordinates carry this many bits. Dimensions past the cap are padded
+# with Latin hypercube columns, so the sequence itself stays small.
+SOBOL_BITS = 30
+SOBOL_MAX_DIMENSIONS = 1024
+# Fixed seed for the initial direction numbers, so every run sees the same sequence.
+SOBOL_DIRECTION_SEED = 20240501
+
+# Acklam's rational approximation to the normal inverse CDF (relative error < 1.2e-9).
+_PPF_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+          1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_PPF_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+          6.680131188771972e+01, -1.328068155288572e+01)
+_PPF_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+          -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_PPF_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+          3.754408661907416e+00)
+_PPF_LOW = 0.02425
+
+
+def sampling_strategy(params: dict) -> str:
+    """
+    The validated `sampling` entry of simulation params ("random" by default).
+    """
+    strategy = params.get("sampling", "random")
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy: {strategy}")
+    return strategy
+
+
+def _polyval(coeffs, x: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(x)
+    for c in coeffs:
+        out = out * x + c
+    return out
+
+
+def normal_ppf(u: np.ndarray) -> np.ndarray:
+    """
+    Standard normal inverse CDF, vectorized. Inputs are clipped away from 0 and 1.
+    """
+    u = np.clip(np.asarray(u, dtype=np.float64), 1e-12, 1 - 1e-12)
+    tail = np.minimum(u, 1 - u)
+    out = np.empty_like(u)
+
+    central = tail >= _PPF_LOW
+    q = u[central] - 0.5
+    r = q * q
+    out[central] = q * _polyval(_PPF_A, r) / (_polyval(_PPF_B, r) * r + 1)
+
+    q = np.sqrt(-2 * np.log(tail[~central]))
+    z = _polyval(_PPF_C, q) / (_polyval(_PPF_D, q) * q + 1)
+    out[~central] = np.where(u[~central] < 0.5, z, -z)
+    return out
+
+
+def _poly_mulmod(a: int, b: int, poly: int, degree: int) -> int:
+    """
+    a·b mod poly over GF(2), polynomials as bit masks.
+    """
+    out = 0
+    while b:
+        if b & 1:
+            out ^= a
+        b >>= 1
+        a <<= 1
+        if a >> degree & 1:
+            a ^= poly
+    return out
+
+
+def _is_primitive(poly: int, degree: int) -> bool:
+    """
+    True when x has multiplicative order 2^degree - 1 modulo `poly`.
+    """
+    order = (1 << degree) - 1
+    factors, n, f = set(), order, 2
+    while f * f <= n:
+        while n % f == 0:
+            factors.add(f)
+            n //= f
+        f += 1
+    if n > 1:
+        factors.add(n)
+
+    def x_power(exponent: int) -> int:
+        result, base = 1, 2 % poly if degree > 1 else 1
+        while exponent:
+            if exponent & 1:
+                result = _poly_mulmod(result, base, poly, degree)
+            base = _poly_mulmod(base, base, poly, degree)
+            exponent >>= 1
+        return result
+
+    return x_power(order) == 1 and all(x_power(order // q) != 1 for q in factors)
+
+
+@lru_cache(maxsize=None)
+def primitive_polynomials(count: int) -> List[int]:
+    """
+    The first `count` primitive polynomials over GF(2), by degree then value
+    (bit masks, x^degree and 1 included).
+    """
+    found: List[int] = []
+    degree = 1
+    while len(found) < count:
+        for poly in range((1 << degree) | 1, 1 << (degree + 1), 2):
+            if _is_primitive(poly, degree):
+                found.append(poly)
+                if len(found) == count:
+                    break
+        degree += 1
+    return found
+
+
+@lru_cache(maxsize=None)
+def sobol_directions(dims: int) -> np.ndarray:
+    """
+    (SOBOL_BITS, dims) direction numbers. Dimension 0 is van der Corput; the
+    rest use successive primitive polynomials with random odd initial numbers
+    m_k < 2^k (Joe-Kuo tables are not shipped, so the leading 2-D projections
+    are not optimised; 1-D projections are stratified all the same).
+    """
+    rng = np.random.default_rng(SOBOL_DIRECTION_SEED)
+    directions = np.zeros((SOBOL_BITS, dims), dtype=np.int64)
+    directions[:, 0] = 1 << (SOBOL_BITS - 1 - np.arange(SOBOL_BITS))
+    for j, poly in enumerate(primitive_polynomials(max(dims - 1, 0)), start=1):
+        degree = poly.bit_length() - 1
+        m = [int(rng.integers(0, 1 << k)) * 2 + 1 for k in range(degree)]
+        for k in range(degree, SOBOL_BITS):
+            value = m[k - degree] ^ (m[k - degree] << degree)
+            for i in range(1, degree):
+                if poly >> (degree - i) & 1:
+                    value ^= m[k - i] << i
+            m.append(value)
+        directions[:, j] = [m[k] << (SOBOL_BITS - 1 - k) for k in range(SOBOL_BITS)]
+    return directions
+
+
+def latin_hypercube(rng: np.random.Generator, runs: int, dims: int) -> np.ndarray:
+    """
+    One uniform per stratum [i/runs, (i+1)/runs) in every column, randomly paired.
+    """
+    strata = np.argsort(rng.random((runs, dims)), axis=0)
+    return (strata + rng.random((runs, dims))) / runs
+
+
+def sobol_points(rng: np.random.Generator, runs: int, dims: int, leading: int) -> np.ndarray:
+    """
+    The first `runs` Sobol points (Gray-code order) with a random digital
+    shift, so each call is an independent, unbiased replicate. Only the
+    `leading` columns (at most SOBOL_MAX_DIMENSIONS) are Sobol; the rest are
+    Latin hypercube padding, since without tuned direction numbers the
+    higher projections pair inputs badly.
+    """
+    n_sobol = min(leading, dims, SOBOL_MAX_DIMENSIONS)
+    directions = sobol_directions(n_sobol)
+    index = np.arange(runs)
+    gray = index ^ (index >> 1)
+    points = np.zeros((runs, n_sobol), dtype=np.int64)
+    for k in range(max(runs - 1, 0).bit_length()):
+        points[(gray >> k & 1).astype(bool)] ^= directions[k]
+    points ^= rng.integers(0, 1 << SOBOL_BITS, size=n_sobol)
+    u = (points + 0.5) / (1 << SOBOL_BITS)
+    if dims > n_sobol:
+        u = np.hstack([u, latin_hypercube(rng, runs, dims - n_sobol)])
+    return u
+
+
+def design_uniforms(rng: np.random.Generator, runs: int, dims: int, strategy: str, leading: int) -> np.ndarray:
+    """
+    (runs, dims) uniforms for one block under `strategy`:
+    - "random": independent draws
+    - "antithetic": pairs u, 1 - u (second half mirrors the first)
+    - "lhs": Latin hypercube, every column stratified into `runs` strata
+    - "sobol": digitally shifted Sobol points in the `leading` columns, LHS after
+    """
+    if strategy == "random":
+        return rng.random((runs, dims))
+    if strategy == "antithetic":
+        half = rng.random((-(-runs // 2), dims))
+        return np.vstack([half, 1 - half])[:runs]
+    if strategy == "lhs":
+        return latin_hypercube(rng, runs, dims)
+    if strategy == "sobol":
+        return sobol_points(rng, runs, dims, leading)
+    raise ValueError(f"Unknown sampling strategy: {strategy}")
+
+
+def block_uniforms(rng: np.random.Generator, runs: int, dims: int, strategy: str, leading: int) -> np.ndarray:
+    """
+    `design_uniforms` for `runs` runs built from independent blocks of
+    SAMPLING_BLOCK_RUNS (the last one may be shorter).
+    """
+    return np.vstack([
+        design_uniforms(rng, min(SAMPLING_BLOCK_RUNS, runs - start), dims, strategy, leading)
+        for start in range(0, runs, SAMPLING_BLOCK_RUNS)
+    ])
@@ -0,0 +1,175 @@
+# src/simulate/sensitivity.py
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from compose.compiled_composition import compile_composition
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from simulate.accumulators import SensitivityAccumulator
+from simulate.parallel import run_chunked
+from simulate.parameters import EdgeRules, ModuleParameters, compile_edge_rules, compile_parameters
+from simulate.vectorized import (
+    KernelPlan, attempt_durations, batch_size_for, critical_path, sample_attempts, sample_edge_draws
+)
+
+# One-at-a-time perturbations per module, in tornado order.
+PERTURBATIONS = ("duration_low", "duration_high", "failure_low", "failure_high")
+
+
+class SensitivityPlan(KernelPlan):
+    """
+    KernelPlan plus the modules under study (`inputs`, node indices) and the
+    relative perturbation `delta` applied to their duration and failure odds.
+    """
+
+    def __init__(
+        self,
+        n_nodes: int,
+        schedule: Tuple[list, list],
+        params: dict,
+        module_params: ModuleParameters,
+        edge_rules: Optional[EdgeRules],
+        inputs: np.ndarray,
+        delta: float
+    ):
+        super().__init__(n_nodes, schedule, params, module_params, edge_rules)
+        self.inputs = inputs
+        self.delta = delta
+
+    @property
+    def n_scenarios(self) -> int:
+        return 1 + len(PERTURBATIONS) * len(self.inputs)
+
+
+def _makespans(durations: np.ndarray, plan: KernelPlan, edges) -> np.ndarray:
+    """
+    Makespans for stacked (scenarios, runs, n_nodes) durations on shared edge draws.
+    """
+    stack, runs, n_nodes = durations.shape
+    edges = edges.tile(stack) if edges is not None else None
+    _, makespan, _ = critical_path(durations.reshape(stack * runs, n_nodes), plan.schedule, with_slack=False, edges=edges)
+    return makespan.reshape(stack, runs)
+
+
+def simulate_sensitivity_chunk(plan: SensitivityPlan, runs: int, seed_seq: np.random.SeedSequence) -> SensitivityAccumulator:
+    """
+    One batched pass per draw: the baseline, every one-at-a-time perturbation
+    (re-evaluated on the same attempts, so only the perturbed module changes)
+    and one pick-freeze resample per module are stacked into a single
+    critical-path call each.
+    """
+    rng = np.random.default_rng(seed_seq)
+    p = plan.module_params
+    max_loops = int(plan.params["max_feedback_loops"])
+    inputs = plan.inputs
+    n_inputs = len(inputs)
+    thresholds = p.failure_thresholds(max_loops)
+    batch = max(1, batch_size_for(plan.n_nodes, max_loops, runs) // (plan.n_scenarios + n_inputs))
+
+    acc = SensitivityAccumulator(n_inputs, plan.n_scenarios)
+    for start in range(0, runs, batch):
+        n = min(batch, runs - start)
+        trials, draws = sample_attempts(rng, n, p, max_loops)
+        durations, _ = attempt_durations(trials, draws, thresholds, p.cap)
+        edges = sample_edge_draws(rng, n, plan.edge_rules, max_loops) if plan.edge_rules else None
+
+        scenarios = np.repeat(durations[None].astype(np.float64), plan.n_scenarios, axis=0)
+        for i, m in enumerate(inputs.tolist()):
+            low, high, fail_low, fail_high = 1 + len(PERTURBATIONS) * i + np.arange(len(PERTURBATIONS))
+            # Scale the raw draws, so an override cap still bounds the module
+            for s, factor in ((low, 1 - plan.delta), (high, 1 + plan.delta)):
+                scaled = draws[:, m:m + 1] * factor
+                scenarios[s, :, m] = attempt_durations(trials[:, m:m + 1], scaled, thresholds[m:m + 1], p.cap[m:m + 1])[0][:, 0]
+            for s, factor in ((fail_low, 1 - plan.delta), (fail_high, 1 + plan.delta)):
+                perturbed = np.clip(thresholds[m:m + 1] * factor, 0, 1)
+                scenarios[s, :, m] = attempt_durations(trials[:, m:m + 1], draws[:, m:m + 1], perturbed, p.cap[m:m + 1])[0][:, 0]
+
+        # Pick-freeze: an independent sample B, with module m taken from A in copy m
+        trials_b, draws_b = sample_attempts(rng, n, p, max_loops)
+        durations_b, _ = attempt_durations(trials_b, draws_b, thresholds, p.cap)
+        edges_b = sample_edge_draws(rng, n, plan.edge_rules, max_loops) if plan.edge_rules else None
+        frozen = np.repeat(durations_b[None].astype(np.float64), n_inputs, axis=0)
+        frozen[np.arange(n_inputs), :, inputs] = durations[:, inputs].T
+
+        acc.update(
+            _makespans(scenarios, plan, edges),
+            durations[:, inputs].astype(np.float64),
+            _makespans(frozen, plan, edges_b),
+        )
+    return acc
+
+
+def run_sensitivity(
+    composition: MemoryObject,
+    memory: PolarisMemory,
+    params: dict,
+    runs: int = 2_000,
+    delta: float = 0.2,
+    seed: Optional[int] = None,
+    workers: int = 1
+) -> Dict:
+    """
+    Which modules drive total duration?
+
+    For every PermittingModule, on shared random draws:
+    - tornado deltas: mean makespan change when its duration or its failure
+      odds are scaled by 1 ± `delta`
+    - correlation of its sampled duration with the makespan
+    - first-order (Sobol-style) index: the share of makespan variance its
+      duration explains on its own
+    Returns per-module rows plus a ranked bottleneck list (largest swing first).
+    """
+    compiled = compile_composition(composition, memory)
+    if not compiled.is_dag:
+        raise ValueError("Composition graph contains cycles.")
+    valid_modules = compiled.permitting_modules()
+    if not valid_modules:
+        raise ValueError("No valid modules found in memory for this composition.")
+
+    module_params = compile_parameters(compiled, memory, params)
+    plan = SensitivityPlan(
+        len(compiled.nodes),
+        compiled.schedule,
+        params,
+        module_params,
+        compile_edge_rules(compiled, memory, params, module_params),
+        np.array([compiled.index[mid] for mid in valid_modules], dtype=np.int64),
+        delta,
+    )
+    seed_seq = np.random.SeedSequence(seed)
+    acc = run_chunked(plan, runs, seed_seq, workers=workers, chunk_fn=simulate_sensitivity_chunk)
+
+    # savings = baseline - scenario, so the makespan change is its negation
+    deltas = -acc.oat.savings.mean
+    correlations = acc.correlations()
+    first_order = acc.first_order_indices()
+
+    modules: Dict[str, Dict] = {}
+    for i, mid in enumerate(valid_modules):
+        row = {
+            name: float(deltas[1 + len(PERTURBATIONS) * i + k]) for k, name in enumerate(PERTURBATIONS)
+        }
+        row.update(
+            module_name=valid_modules[mid].data.get("module_name", mid),
+            duration_swing=row["duration_high"] - row["duration_low"],
+            failure_swing=row["failure_high"] - row["failure_low"],
+            correlation=float(correlations[i]),
+            first_order=float(first_order[i]),
+        )
+        row["swing"] = max(abs(row["duration_swing"]), abs(row["failure_swing"]))
+        modules[mid] = row
+
+    bottlenecks: List[Dict] = sorted(
+        ({"module_id": mid, **row} for mid, row in modules.items()),
+        key=lambda row: (-row["swing"], -row["first_order"])
+    )
+
+    return {
+        "composition_id": compiled.composition_id,
+        "runs": acc.runs,
+        "seed": int(seed_seq.entropy),
+        "delta": delta,
+        "baseline": float(acc.oat.makespan.mean[0]),
+        "modules": modules,
+        "bottlenecks": bottlenecks,
+    }
@@ -1,46 +1,16 @@
 # src/simulate/simulation_engine.py
 
-import random
-import networkx as nx
-from typing import Dict, Tuple, List
-from compose.composition_engine import CompositionEngine
+import numpy as np
+from typing import Dict, Optional
+from compose.compiled_composition import CompiledComposition, compile_composition
 from memory.polaris_memory import PolarisMemory
 from memory.models import MemoryObject
-
-
-def simulate_run(
-    graph: nx.DiGraph,
-    modules: Dict[str, MemoryObject],
-    params: dict
-) -> Tuple[int, Dict[str, int]]:
-    durations = {}
-    rework_count = {}
-
-    for node in nx.topological_sort(graph):
-        base_duration = random.randint(*params["task_duration_range"])
-        failure = random.random() < params["failure_rate"]
-        loops = 0
-
-        while failure and loops < params["max_feedback_loops"]:
-            loops += 1
-            base_duration += random.randint(*params["task_duration_range"])
-            failure = random.random() < params["failure_rate"]
-
-        durations[node] = base_duration
-        rework_count[node] = loops
-
-    total_duration = sum(durations.values())
-    return total_duration, rework_count
-
-
-def format_edges_for_nx(edge_dicts: List[dict]) -> List[Tuple[str, str, dict]]:
-    """
-    Convert edge dictionaries to NetworkX-compatible 3-tuples.
-    """
-    return [
-        (e["from_node"], e["to_node"], {k: v for k, v in e.items() if k not in ("from_node", "to_node")})
-        for e in edge_dicts
-    ]
+from simulate.accumulators import SimulationAccumulator
+from simulate.vectorized import KernelPlan
+from simulate.parameters import compile_edge_rules, compile_parameters, data_digest, parameter_table
+from simulate.parallel import run_chunked, run_until_converged
+from simulate.result_cache import default_cache
+from simulate.result_record import build_result_record, find_result_record, record_payload, request_key
 
 
 def run_simulation(
@@ -49,22 +19,33 @@ def run_simulation(
     params: dict,
     runs: int = 1000,
     debug: bool = False,
-    formatted_edges: List[Tuple[str, str, dict]] = None
+    seed: Optional[int] = None,
+    workers: int = 1,
+    target_half_width: Optional[float] = None,
+    target_metric: str = "mean",
+    confidence: float = 0.95,
+    record: bool = False,
+    use_cache: bool = True,
+    deadline: Optional[float] = None
 ):
-    # 🧠 Extract modules + edges from SDMO schema
-    module_ids = composition.data.get("data", {}).get("modules", [])
-    raw_edges = composition.data.get("data", {}).get("edges", [])
-
-    # If not pre-formatted, format now
-    if formatted_edges is None:
-        formatted_edges = format_edges_for_nx(raw_edges)
-
-    # Validate and filter valid PermittingModules
-    valid_modules = {}
-    for mid in module_ids:
-        obj = memory.get_by_id(mid)
-        if obj and obj.object_type == "PermittingModule":
-            valid_modules[mid] = obj
+    """
+    Monte Carlo simulation of a Composition SDMO.
+
+    Runs are split into chunks with streams spawned from `seed`, in a process
+    pool when `workers` > 1; the same seed gives the same result for any
+    worker count. With `target_half_width`, runs continue until the confidence
+    interval of `target_metric` is that narrow (`runs` is then the cap).
+    Module distributions, overrides and typed edges follow `params` (see
+    `compile_parameters` and `compile_edge_rules`).
+
+    Seeded results are served from the ResultCache unless `use_cache` is
+    False; with `record`, they are saved as SimulationResult SDMOs and reused.
+    See `summarize_simulation` for the result keys.
+    """
+    # 🧠 Compile once (cached per id + content hash)
+    compiled = compile_composition(composition, memory)
+    module_ids = compiled.module_ids
+    valid_modules = compiled.permitting_modules()
 
     if debug:
         print("🧪 DEBUG: Checking modules...")
@@ -79,27 +60,140 @@ def run_simulation(
     if not valid_modules:
         raise ValueError("No valid modules found in memory for this composition.")
 
-    results = []
-    all_reworks = []
+    if not compiled.is_dag:
+        raise ValueError("Composition graph contains cycles.")
+
+    seed_seq = np.random.SeedSequence(seed)
+    stopping = None
+    if target_half_width is not None:
+        stopping = {"target_half_width": target_half_width, "metric": target_metric, "confidence": confidence}
+    plan = kernel_plan(compiled, memory, params)
+    digest = data_digest(compiled, plan.module_params, plan.edge_rules)
+    key = request_key(compiled.content_hash, params, runs, seed_seq.entropy, stopping, deadline, digest)
+
+    if record and seed is not None:
+        saved = find_result_record(memory, key)
+        if saved is not None:
+            print(f"♻️ Reusing simulation record: {saved.id}")
+            return {**record_payload(saved)["result"], "record_id": saved.id}
+
+    # Unseeded keys hold fresh entropy and could never be read back
+    cache = default_cache() if use_cache and seed is not None else None
+    result = cache.get(key) if cache is not None else None
+    if result is not None:
+        print(f"⚡ Simulation cache hit: {key[:16]}")
+    else:
+        result = simulate_compiled(
+            compiled, memory, params, runs, seed_seq, workers, target_half_width, target_metric, confidence, deadline, plan
+        )
+        if cache is not None:
+            cache.put(key, result)
+
+    if record:
+        saved = build_result_record(compiled, params, runs, seed_seq.entropy, stopping, result, deadline, digest)
+        memory.save_object(saved)
+        result = {**result, "record_id": saved.id}
+    return result
+
+
+def kernel_plan(compiled: CompiledComposition, memory: PolarisMemory, params: dict) -> KernelPlan:
+    """
+    Compile params and module data into the plan the kernel runs.
+    """
+    module_params = compile_parameters(compiled, memory, params)
+    edge_rules = compile_edge_rules(compiled, memory, params, module_params)
+    return KernelPlan(len(compiled.nodes), compiled.schedule, params, module_params, edge_rules)
 
-    for _ in range(runs):
-        G = nx.DiGraph()
-        G.add_nodes_from(valid_modules.keys())
-        G.add_edges_from(formatted_edges)
 
-        duration, reworks = simulate_run(G, valid_modules, params)
-        results.append(duration)
-        all_reworks.append(reworks)
+def simulate_compiled(
+    compiled: CompiledComposition,
+    memory: PolarisMemory,
+    params: dict,
+    runs: int,
+    seed_seq: np.random.SeedSequence,
+    workers: int = 1,
+    target_half_width: Optional[float] = None,
+    target_metric: str = "mean",
+    confidence: float = 0.95,
+    deadline: Optional[float] = None,
+    plan: Optional[KernelPlan] = None
+) -> Dict:
+    """
+    Run the vectorized kernel for a compiled composition and summarize it.
+    No caching or records; `run_simulation` is the public entry point.
+    """
+    plan = plan or kernel_plan(compiled, memory, params)
+    convergence = None
+    if target_half_width is None:
+        acc = run_chunked(plan, runs, seed_seq, workers=workers)
+    else:
+        acc, half_width, converged = run_until_converged(
+            plan,
+            seed_seq,
+            target_half_width,
+            metric=target_metric,
+            confidence=confidence,
+            max_runs=runs,
+            workers=workers
+        )
+        convergence = {
+            "metric": target_metric,
+            "confidence": confidence,
+            "target_half_width": target_half_width,
+            "half_width": half_width,
+            "converged": converged,
+        }
+    return summarize_simulation(compiled, plan, acc, seed_seq, convergence, deadline)
+
+
+def summarize_simulation(
+    compiled: CompiledComposition,
+    plan: KernelPlan,
+    acc: SimulationAccumulator,
+    seed_seq: np.random.SeedSequence,
+    convergence: Optional[Dict] = None,
+    deadline: Optional[float] = None
+) -> Dict:
+    """
+    The `run_simulation` result dict for a finished accumulator:
+    - avg_duration / completion_time: critical-path makespan (mean, percentiles)
+    - avg_effort: summed module days; runs; seed actually used
+    - failures / rework_histogram: per-module failure counts and loops per run
+    - slack / criticality: mean slack, share of runs on the critical path
+      and mean / P90 days there
+    - distribution: bounded histogram, empirical CDF and quantiles of
+      completion time; deadline: share of runs finishing within `deadline`
+    - convergence: the stopping rule's outcome when one was set
+    - sampling: the sampling design and its measured variance reduction
+    - module_parameters: the compiled per-module parameters
+    """
+    valid_modules = compiled.permitting_modules()
 
-    avg_duration = sum(results) / len(results)
-    module_fail_freq = {mod: 0 for mod in valid_modules}
-    for rework in all_reworks:
-        for mod, count in rework.items():
-            if count > 0:
-                module_fail_freq[mod] += 1
+    # ⏱️ Completion time is the critical-path makespan; effort is the old summed duration
+    module_fail_freq = {mid: int(acc.fail_counts[compiled.index[mid]]) for mid in valid_modules}
+    module_slack = {mid: float(acc.slack_sum[compiled.index[mid]] / acc.runs) for mid in valid_modules}
+    criticality = acc.criticality()
 
     return {
-        "avg_duration": avg_duration,
-        "runs": runs,
+        "avg_duration": acc.makespan.mean,
+        "avg_effort": acc.effort.mean,
+        "runs": acc.runs,
+        "seed": int(seed_seq.entropy),
         "failures": module_fail_freq,
+        "slack": module_slack,
+        "criticality": {
+            mid: {name: float(values[compiled.index[mid]]) for name, values in criticality.items()}
+            for mid in valid_modules
+        },
+        "completion_time": acc.completion_summary(),
+        "distribution": acc.distribution(),
+        "deadline": None if deadline is None else {
+            "days": float(deadline),
+            "probability": acc.makespan_sketch.cdf(deadline),
+            "bucket_width": acc.makespan_sketch.width,
+        },
+        "rework_histogram": {mid: acc.rework_histogram(compiled.index[mid]) for mid in valid_modules},
+        "convergence": convergence,
+        "sampling": acc.sampling_summary(),
+        "module_parameters": parameter_table(compiled, plan.module_params),
     }
@@ -0,0 +1,293 @@
+# src/simulate/vectorized.py
+
+import numpy as np
+from typing import Optional, Tuple
+from simulate.accumulators import SimulationAccumulator
+from simulate.parameters import EdgeRules, ModuleParameters
+from simulate.sampling import SAMPLING_BLOCK_RUNS, block_uniforms, normal_ppf, sampling_strategy
+
+# Upper bound on the number of (run, module, attempt) cells drawn at once.
+# Keeps a single batch at a few tens of MB regardless of `runs`.
+MAX_BATCH_CELLS = 2_000_000
+
+
+def batch_size_for(n_modules: int, max_loops: int, runs: int) -> int:
+    """
+    Number of runs to draw per batch so one batch stays under MAX_BATCH_CELLS.
+    """
+    cells_per_run = max(1, n_modules * (max_loops + 1))
+    return max(1, min(runs, MAX_BATCH_CELLS // cells_per_run))
+
+
+def sample_module_durations(
+    rng: np.random.Generator,
+    runs: int,
+    module_params: ModuleParameters,
+    max_loops: int,
+    sampling: str = "random"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draw durations and rework loops for `runs` × `n_nodes` in one pass.
+
+    Each module takes one duration draw, then keeps
+    failing (and adding another draw) until it passes or `max_loops` is
+    reached. Distributions and failure/loop probabilities come per module
+    from `module_params`, so data-driven runs cost the same as uniform ones.
+    `sampling` picks the design of the underlying uniforms (see `sample_attempts`).
+
+    Returns (durations, loops), both shaped (runs, n_nodes).
+    """
+    trials, draws = sample_attempts(rng, runs, module_params, max_loops, sampling)
+    return attempt_durations(trials, draws, module_params.failure_thresholds(max_loops), module_params.cap)
+
+
+def sample_attempts(
+    rng: np.random.Generator,
+    runs: int,
+    module_params: ModuleParameters,
+    max_loops: int,
+    sampling: str = "random"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Raw random inputs for `attempt_durations`: uniform failure trials shaped
+    (runs, n_nodes, max_loops) and per-attempt durations shaped
+    (runs, n_nodes, max_loops + 1). Kept separate so perturbed failure
+    probabilities can be re-evaluated on the same draws.
+
+    Any `sampling` other than "random" builds every input from one
+    variance-reduced uniform design per block of runs (see
+    `simulate.sampling`) and maps it through each distribution's inverse CDF.
+    """
+    p = module_params
+    if sampling != "random":
+        return attempts_from_design(rng, runs, p, max_loops, sampling)
+    size = (runs, p.n_nodes, max_loops + 1)
+    trials = rng.random((runs, p.n_nodes, max_loops))
+
+    if p.model == "uniform":
+        draws = rng.integers(p.low[:, None].astype(np.int64), p.high[:, None].astype(np.int64), size=size, endpoint=True)
+    elif p.model == "triangular":
+        draws = triangular_ppf(rng.random(size), p.low[:, None], p.mode[:, None], p.high[:, None])
+    else:
+        draws = rng.lognormal(p.mu[:, None], p.sigma[:, None], size=size)
+    return trials, draws
+
+
+def attempts_from_design(
+    rng: np.random.Generator,
+    runs: int,
+    module_params: ModuleParameters,
+    max_loops: int,
+    sampling: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `sample_attempts` from a designed uniform sample. Columns are ordered by
+    attempt (first durations, then each failure trial and rework duration);
+    the first durations drive most of the variance and lead the design.
+    """
+    p = module_params
+    u = block_uniforms(rng, runs, p.n_nodes * (2 * max_loops + 1), sampling, leading=p.n_nodes)
+    u = u.reshape(runs, 2 * max_loops + 1, p.n_nodes).transpose(0, 2, 1)
+    trials, u_draws = u[:, :, 1::2], u[:, :, 0::2]
+
+    if p.model == "uniform":
+        span = (p.high - p.low + 1)[:, None]
+        draws = np.minimum(p.low[:, None] + np.floor(u_draws * span), p.high[:, None]).astype(np.int64)
+    elif p.model == "triangular":
+        draws = triangular_ppf(u_draws, p.low[:, None], p.mode[:, None], p.high[:, None])
+    else:
+        draws = np.exp(p.mu[:, None] + p.sigma[:, None] * normal_ppf(u_draws))
+    return trials, draws
+
+
+def attempt_durations(
+    trials: np.ndarray,
+    draws: np.ndarray,
+    thresholds: np.ndarray,
+    cap: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Total durations and loop counts from raw attempts; `thresholds` is
+    (n_nodes, max_loops) as from `ModuleParameters.failure_thresholds`.
+    """
+    # A module loops k times when its first k failure trials all fail.
+    loops = np.cumprod(trials < thresholds, axis=2).sum(axis=2)
+    attempted = np.arange(draws.shape[2]) <= loops[..., None]
+    durations = (draws * attempted).sum(axis=2)
+
+    # Overrides (e.g. deemed approval after 120 days) end a module early
+    if np.isfinite(cap).any():
+        durations = np.minimum(durations, cap)
+
+    return durations, loops
+
+
+def triangular_ppf(u: np.ndarray, low: np.ndarray, mode: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """
+    Inverse CDF of the triangular distribution; degenerate (low == high) gives low.
+    """
+    width = high - low
+    split = np.divide(mode - low, width, out=np.zeros_like(width), where=width > 0)
+    rising = low + np.sqrt(u * width * (mode - low))
+    falling = high - np.sqrt((1 - u) * width * (high - mode))
+    return np.where(u < split, rising, falling)
+
+
+class EdgeDraws:
+    """
+    One batch of random outcomes for EdgeRules, node-major like `critical_path`:
+    - active: (n_edges, runs) bool, False where a conditional edge is skipped; None if no conditions
+    - feedback_loops: (n_feedback, runs) times each feedback edge re-queued its span
+    """
+
+    def __init__(self, rules: EdgeRules, active: Optional[np.ndarray], feedback_loops: np.ndarray):
+        self.rules = rules
+        self.active = active
+        self.feedback_loops = feedback_loops
+
+    def tile(self, reps: int) -> "EdgeDraws":
+        """
+        Repeat the draws along the run axis, for scenarios stacked on the same batch.
+        """
+        return EdgeDraws(
+            self.rules,
+            None if self.active is None else np.tile(self.active, (1, reps)),
+            np.tile(self.feedback_loops, (1, reps)),
+        )
+
+
+def sample_edge_draws(rng: np.random.Generator, runs: int, rules: EdgeRules, max_loops: int) -> EdgeDraws:
+    active = None
+    if rules.has_conditions:
+        conditional = np.flatnonzero(rules.skip_prob > 0)
+        active = np.ones((rules.n_edges, runs), dtype=bool)
+        active[conditional] = rng.random((len(conditional), runs)) >= rules.skip_prob[conditional, None]
+
+    # Same truncated-geometric rule as module rework loops
+    fails = rng.random((len(rules.feedback_src), runs, max_loops)) < rules.feedback_prob[:, None, None]
+    feedback_loops = np.cumprod(fails, axis=2).sum(axis=2)
+    return EdgeDraws(rules, active, feedback_loops)
+
+
+def critical_path(
+    durations: np.ndarray,
+    schedule: Tuple[list, list],
+    with_slack: bool = True,
+    edges: Optional[EdgeDraws] = None
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Earliest-finish times, makespan and slack for a batch of runs.
+
+    `durations` is (runs, n_modules); `schedule` is `CompiledComposition.schedule`.
+    Each pass handles one DAG level at a time, so the Python loop runs over the
+    graph depth while every step is vectorized across runs and level members.
+    Work is done node-major so each level gathers contiguous rows.
+
+    With `edges`, typed-edge rules are applied per level as array operations:
+    override edges release their target after the threshold, skipped
+    conditional edges impose no wait, and feedback edges add their re-queued
+    span to the source module's finish.
+
+    Returns (finish, makespan, slack) shaped (runs, n), (runs,) and (runs, n);
+    slack is None when `with_slack` is False (skips the backward pass).
+    """
+    forward, backward = schedule
+    dur = np.ascontiguousarray(durations.T, dtype=np.float64)
+
+    relief = active = None
+    feedback_at = {}
+    if edges is not None:
+        rules = edges.rules
+        active = edges.active
+        if rules.has_overrides:
+            # An override edge stops waiting on its source after `threshold` days
+            relief = np.zeros((rules.n_edges, dur.shape[1]))
+            overridden = np.flatnonzero(np.isfinite(rules.thresholds))
+            relief[overridden] = np.maximum(dur[rules.edge_src[overridden]] - rules.thresholds[overridden, None], 0)
+        for f, level in enumerate(rules.feedback_level.tolist()):
+            feedback_at.setdefault(level, []).append(f)
+        if feedback_at:
+            # Feedback rework lengthens the source's effective duration; never alias `durations`
+            dur = dur.copy()
+
+    # Forward pass: finish[v] = duration[v] + max(finish[preds])
+    finish = dur.copy()
+    for level, (nodes, preds, offsets, edge_ids) in enumerate(forward, start=1):
+        incoming = finish[preds]
+        if relief is not None:
+            incoming = incoming - relief[edge_ids]
+        if active is not None:
+            incoming = incoming * active[edge_ids]
+        finish[nodes] += np.maximum.reduceat(incoming, offsets, axis=0)
+
+        if level in feedback_at:
+            f = np.array(feedback_at[level])
+            src, dst = rules.feedback_src[f], rules.feedback_dst[f]
+            # Redo everything from the upstream module's start to this finish
+            span = np.maximum(finish[src] - (finish[dst] - dur[dst]), 0)
+            added = edges.feedback_loops[f] * span
+            np.add.at(finish, src, added)
+            np.add.at(dur, src, added)
+
+    makespan = finish.max(axis=0, initial=0)
+    if not with_slack:
+        return finish.T, makespan, None
+
+    # Backward pass: latest[v] = min(latest[succ] - duration[succ]), sinks end at makespan
+    latest = np.broadcast_to(makespan, finish.shape).copy()
+    latest_start = latest - dur
+    for nodes, succs, offsets, edge_ids in backward:
+        outgoing = latest_start[succs]
+        if relief is not None:
+            outgoing = outgoing + relief[edge_ids]
+        if active is not None:
+            outgoing = np.where(active[edge_ids], outgoing, np.inf)
+            latest[nodes] = np.minimum(np.minimum.reduceat(outgoing, offsets, axis=0), makespan)
+        else:
+            latest[nodes] = np.minimum.reduceat(outgoing, offsets, axis=0)
+        latest_start[nodes] = latest[nodes] - dur[nodes]
+
+    return finish.T, makespan, (latest - finish).T
+
+
+class KernelPlan:
+    """
+    Everything needed to simulate chunks of runs for one composition.
+    Plain arrays and dicts only, so it pickles cheaply to worker processes.
+    """
+
+    def __init__(
+        self,
+        n_nodes: int,
+        schedule: Tuple[list, list],
+        params: dict,
+        module_params: ModuleParameters,
+        edge_rules: Optional[EdgeRules] = None
+    ):
+        self.n_nodes = n_nodes
+        self.schedule = schedule
+        self.params = params
+        self.module_params = module_params
+        self.edge_rules = edge_rules
+
+
+def simulate_chunk(plan: KernelPlan, runs: int, seed_seq: np.random.SeedSequence) -> SimulationAccumulator:
+    """
+    Simulate `runs` runs from their own seed stream and return the aggregate.
+    """
+    rng = np.random.default_rng(seed_seq)
+    max_loops = int(plan.params["max_feedback_loops"])
+    sampling = sampling_strategy(plan.params)
+    batch = batch_size_for(plan.n_nodes, max_loops, runs)
+    if sampling != "random":
+        # Whole design blocks per batch
+        batch = max(SAMPLING_BLOCK_RUNS, batch // SAMPLING_BLOCK_RUNS * SAMPLING_BLOCK_RUNS)
+
+    acc = SimulationAccumulator(plan.n_nodes, max_loops, sampling)
+    for start in range(0, runs, batch):
+        n = min(batch, runs - start)
+        durations, loops = sample_module_durations(rng, n, plan.module_params, max_loops, sampling)
+        edges = sample_edge_draws(rng, n, plan.edge_rules, max_loops) if plan.edge_rules else None
+        _, makespan, slack = critical_path(durations, plan.schedule, edges=edges)
+        acc.update(durations, loops, makespan, slack)
+    return acc
@@ -19,6 +19,7 @@ st.markdown("A governance intelligence interface for exploring compositions and
 # Load Memory
 # ─────────────────────────────────────────────────────────────
 memory = load_memory()
+memory.refresh()
 
 if st.sidebar.checkbox("🛠 Show Debug Info"):
     st.code(f"📁 MEMORY PATH → {memory.memory_path}")
@@ -4,7 +4,16 @@ import os
 import streamlit as st
 
 
-def render_dag_pyvis(modules, edges, memory, composition_id, show_symbolic=False):
+def criticality_color(fraction):
+    """
+    Blend from pale amber (never critical) to deep red (always critical).
+    """
+    low, high = (0xFF, 0xE0, 0xB2), (0xC6, 0x28, 0x28)
+    rgb = [round(a + (b - a) * min(max(fraction, 0.0), 1.0)) for a, b in zip(low, high)]
+    return "#{:02X}{:02X}{:02X}".format(*rgb)
+
+
+def render_dag_pyvis(modules, edges, memory, composition_id, show_symbolic=False, criticality=None):
     net = Network(height="600px", width="100%", directed=True)
     net.barnes_hut(gravity=-30000)
 
@@ -30,28 +39,21 @@ def render_dag_pyvis(modules, edges, memory, composition_id, show_symbolic=False
         "feedback_loop": {"color": "#66BB6A", "label": "🌀", "dashes": True},
     }
 
-    # Preload overlays
-    symbolic_scaffolds = {obj.data.get("module_id") for obj in memory.get_by_type("SymbolicScaffold")}
-    failure_events = {obj.data.get("module_id") for obj in memory.get_by_type("FailureEvent")}
-    override_protocols = {obj.data.get("module_id") for obj in memory.get_by_type("OverrideProtocol")}
-    feedback_loops = memory.get_by_type("FeedbackLoop")
-    feedback_triggers = {loop.data.get("trigger_module_id"): loop for loop in feedback_loops}
-
-    # Tag and color for each node
+    # Tag and color for each node, from the overlays linked to it
     def get_tag_info(mid):
         tags = []
         color = "#3DAEE9"  # default
 
-        if mid in symbolic_scaffolds:
+        if memory.get_linked(mid, "SymbolicScaffold", "module_id"):
             tags.append("🧿")
             color = "#D08AE6"
-        if mid in failure_events:
+        if memory.get_linked(mid, "FailureEvent", "module_id"):
             tags.append("⚠️")
             color = "#FF6F61"
-        if mid in override_protocols:
+        if memory.get_linked(mid, "OverrideProtocol", "module_id"):
             tags.append("🚨")
             color = "#F4A259"
-        if mid in feedback_triggers:
+        if memory.get_linked(mid, "FeedbackLoop", "trigger_module_id"):
             tags.append("🌀")
             color = "#FFD700"
 
@@ -63,7 +65,18 @@ def render_dag_pyvis(modules, edges, memory, composition_id, show_symbolic=False
         base_label = f"{mod_id}\n({obj.object_type})" if obj else mod_id
         tag_badges, tag_color = get_tag_info(mod_id)
         label = f"{tag_badges} {base_label}" if tag_badges else base_label
-        net.add_node(mod_id, label=label, color=tag_color)
+        title = None
+        # Simulated criticality replaces the heuristic colors when provided
+        if criticality and mod_id in criticality:
+            stats = criticality[mod_id]
+            tag_color = criticality_color(stats["critical_fraction"])
+            label = f"🔥 {stats['critical_fraction']:.0%} {label}"
+            title = (
+                f"critical in {stats['critical_fraction']:.0%} of runs · "
+                f"mean {stats['mean_contribution']:.1f}d / P90 {stats['p90_contribution']:.1f}d on path · "
+                f"mean slack {stats['mean_slack']:.1f}d"
+            )
+        net.add_node(mod_id, label=label, color=tag_color, title=title)
 
     # Render edges with type-aware styles
     for edge in edges:
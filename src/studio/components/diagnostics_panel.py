@@ -1,4 +1,5 @@
 import streamlit as st
+import matplotlib.pyplot as plt
 
 def render_diagnostics_panel(results: dict):
     st.subheader("🧪 Diagnostics Result")
@@ -25,3 +26,50 @@ def render_diagnostics_panel(results: dict):
         st.code("\n".join(results["feedback_loops"]))
     else:
         st.info("ℹ️ No feedback loops detected (or none defined).")
+
+
+def render_bottleneck_panel(sensitivity: dict, top: int = 10):
+    st.subheader("🔬 Bottlenecks (sensitivity)")
+    st.caption(
+        f"{sensitivity['runs']} shared-draw runs · ±{sensitivity['delta']:.0%} perturbations · "
+        f"baseline {sensitivity['baseline']:.1f} days"
+    )
+
+    rows = sensitivity["bottlenecks"][:top]
+    st.dataframe([
+        {
+            "module": row["module_id"],
+            "swing (days)": round(row["swing"], 1),
+            "duration −/+": f"{row['duration_low']:+.1f} / {row['duration_high']:+.1f}",
+            "failure −/+": f"{row['failure_low']:+.1f} / {row['failure_high']:+.1f}",
+            "correlation": round(row["correlation"], 2),
+            "first-order index": round(row["first_order"], 3),
+        }
+        for row in rows
+    ])
+
+    if rows:
+        # Tornado chart: widest swing on top
+        labels = [row["module_name"] for row in rows][::-1]
+        fig, ax = plt.subplots()
+        ax.barh(labels, [row["duration_low"] for row in rows][::-1], color="#64B5F6", label="duration −")
+        ax.barh(labels, [row["duration_high"] for row in rows][::-1], color="#F08080", label="duration +")
+        ax.axvline(0, color="black", linewidth=0.8)
+        ax.set_xlabel("Change in mean completion time (days)")
+        ax.legend()
+        st.pyplot(fig)
+
+
+def render_criticality_panel(criticality: dict, top: int = 10):
+    st.subheader("🔥 Critical Path (simulated)")
+    rows = sorted(criticality.items(), key=lambda item: -item[1]["critical_fraction"])[:top]
+    st.dataframe([
+        {
+            "module": mid,
+            "critical (% runs)": round(100 * stats["critical_fraction"], 1),
+            "mean on path (days)": round(stats["mean_contribution"], 1),
+            "P90 on path (days)": round(stats["p90_contribution"], 1),
+            "mean slack (days)": round(stats["mean_slack"], 1),
+        }
+        for mid, stats in rows
+    ])
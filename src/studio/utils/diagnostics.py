@@ -1,13 +1,11 @@
-import networkx as nx
-from typing import List, Dict
+from typing import Dict
+from compose.compiled_composition import CompiledComposition
 
-def run_diagnostics(modules: List[str], edges: List[List[str]], memory) -> Dict:
-    g = nx.DiGraph()
-    g.add_nodes_from(modules)
-    g.add_edges_from(edges)
+def run_diagnostics(compiled: CompiledComposition, memory) -> Dict:
+    modules = compiled.module_ids
 
-    has_cycle = not nx.is_directed_acyclic_graph(g)
-    disconnected = list(nx.isolates(g))
+    has_cycle = not compiled.is_dag
+    disconnected = compiled.node_ids(compiled.isolates)
 
     orphan_non_optional = []
     for node in disconnected:
@@ -1,6 +1,13 @@
 from pathlib import Path
+import streamlit as st
 from memory.polaris_memory import PolarisMemory
 
-def load_memory():
+@st.cache_resource
+def load_memory(lazy: bool = True):
+    """
+    One PolarisMemory shared by every rerun and session; the app calls
+    `refresh` on each rerun to pick up changed files. With `lazy`, SDMO
+    payloads are read from the snapshot only when a view uses them.
+    """
     path = Path(r"C:\Users\fagua\OneDrive - i-i.earth\i-core\library\domains\urban_permitting\denpasar_v1")
-    return PolarisMemory(path)
+    return PolarisMemory(path, lazy=lazy)
@@ -4,6 +4,8 @@ from memory.models import MemoryObject
 from compose.composition_engine import CompositionEngine
 import networkx as nx
 from studio.components.dag_canvas import render_dag_pyvis
+from simulate.incremental import IncrementalSimulator
+from simulate.parameters import DEFAULT_STUDIO_PARAMS
 
 from interpret.flow_grammar import interpret_flow
 
@@ -100,6 +102,40 @@ def render_compose_view(memory):
     elif not typed_edge_inputs:
         st.warning("⚠️ No edges defined. Flow will be disconnected.")
 
+    # ─────────────────────────────────────────────────────────────
+    # Step 2.5: Live What-If Simulation
+    # ─────────────────────────────────────────────────────────────
+    if st.checkbox("⚡ Live what-if simulation", value=False, help="Each edit re-simulates only what it changes"):
+        simulator = st.session_state.get("what_if_simulator")
+        if simulator is None or simulator.memory is not memory:
+            simulator = IncrementalSimulator(memory, dict(DEFAULT_STUDIO_PARAMS), runs=2_000, seed=42)
+            st.session_state["what_if_simulator"] = simulator
+            st.session_state.pop("what_if_last", None)
+
+        draft = MemoryObject(
+            id="what-if-composition",
+            object_type="Composition",
+            jurisdiction=selected_jurisdiction,
+            data={"jurisdiction": selected_jurisdiction, "modules": selected_modules, "edges": typed_edge_inputs}
+        )
+        try:
+            result = simulator.simulate(draft)
+        except ValueError as e:
+            st.warning(f"⚠️ {e}")
+        else:
+            previous = st.session_state.get("what_if_last")
+            completion = result["completion_time"]
+
+            def change(key):
+                return f"{completion[key] - previous['completion_time'][key]:+.1f}" if previous else None
+
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Mean Completion (days)", f"{completion['mean']:.1f}", change("mean"), delta_color="inverse")
+            col2.metric("P90 (days)", f"{completion['p90']:.0f}", change("p90"), delta_color="inverse")
+            update = result["incremental"]
+            col3.metric("Modules Recomputed", f"{max(update['forward'], update['backward'])}/{update['nodes']}")
+            st.session_state["what_if_last"] = result
+
     # ─────────────────────────────────────────────────────────────
     # Step 3: DAG Preview
     # ─────────────────────────────────────────────────────────────
@@ -1,17 +1,13 @@
 import streamlit as st
 from studio.components.sidebar import render_composition_selector
 from studio.utils.diagnostics import run_diagnostics
-from studio.components.diagnostics_panel import render_diagnostics_panel
-
-
-def format_edges_for_nx(edge_dicts):
-    """
-    Convert list of edge dicts to NetworkX-compatible (from, to, attrs) tuples.
-    """
-    return [
-        (e["from_node"], e["to_node"], {k: v for k, v in e.items() if k not in ("from_node", "to_node")})
-        for e in edge_dicts
-    ]
+from studio.components.diagnostics_panel import (
+    render_bottleneck_panel, render_criticality_panel, render_diagnostics_panel
+)
+from compose.compiled_composition import compile_composition
+from simulate.parameters import DEFAULT_STUDIO_PARAMS
+from simulate.sensitivity import run_sensitivity
+from simulate.simulation_engine import run_simulation
 
 
 def render_diagnose_view(memory):
@@ -22,9 +18,6 @@ def render_diagnose_view(memory):
     st.subheader(f"🧪 Diagnosing: {selected_obj.id}")
 
     data = selected_obj.data.get("data", {})
-    modules = data.get("modules", [])
-    edge_dicts = data.get("edges", [])
-
     symbolic = data.get("symbolic_scaffolds", [])
     overrides = data.get("override_protocols", [])
     feedbacks = data.get("feedback_loops", [])
@@ -37,9 +30,27 @@ def render_diagnose_view(memory):
         st.markdown(f"⚠️ **Failures:** {len(failures)} → {failures}")
 
     if st.button("Run Diagnostics"):
-        formatted_edges = format_edges_for_nx(edge_dicts)
         try:
-            results = run_diagnostics(modules, formatted_edges, memory)
+            compiled = compile_composition(selected_obj, memory)
+            results = run_diagnostics(compiled, memory)
             render_diagnostics_panel(results)
         except Exception as e:
-            st.error(f"❌ Diagnostic error: {e}")
\ No newline at end of file
+            st.error(f"❌ Diagnostic error: {e}")
+
+    st.markdown("### 🔬 Sensitivity")
+    col1, col2 = st.columns(2)
+    runs = col1.number_input("Runs", value=2_000, min_value=100, step=500)
+    delta = col2.slider("Perturbation (±%)", 5, 50, 20)
+    module_data = st.checkbox("Use module durations and risk data", value=True)
+    if st.button("Find Bottlenecks"):
+        params = dict(DEFAULT_STUDIO_PARAMS)
+        if not module_data:
+            params.update(duration_model="uniform", module_risk=False)
+        try:
+            with st.spinner("⏳ Running sensitivity analysis..."):
+                sensitivity = run_sensitivity(selected_obj, memory, params, runs=int(runs), delta=delta / 100, seed=42)
+                simulation = run_simulation(selected_obj, memory, params, runs=int(runs), seed=42)
+            render_bottleneck_panel(sensitivity)
+            render_criticality_panel(simulation["criticality"])
+        except Exception as e:
+            st.error(f"❌ Sensitivity error: {e}")
@@ -2,6 +2,8 @@ import streamlit as st
 import streamlit.components.v1 as components
 from studio.components.sidebar import render_composition_selector
 from studio.components.dag_canvas import render_dag_pyvis
+from simulate.parameters import DEFAULT_STUDIO_PARAMS
+from simulate.simulation_engine import run_simulation
 
 def render_explore_view(memory):
     selected_obj = render_composition_selector(memory)
@@ -20,6 +22,7 @@ def render_explore_view(memory):
     # Symbolic Overlay Toggle + Legend
     # ─────────────────────────────────────────────────────────────
     show_symbolic = st.checkbox("🌀 Show Symbolic Overlay", value=False)
+    show_criticality = st.checkbox("🔥 Color by Simulated Criticality", value=False)
 
     with st.expander("🧭 Symbolic Overlay Legend"):
         st.markdown("""
@@ -28,6 +31,7 @@ def render_explore_view(memory):
         - ⚠️ **Fragile Path**: Module prone to failure events (red)  
         - 🌀 **Loop Trigger**: Feedback loop originates here (yellow)  
         - 🚨 **Override Protocol**: Special rule or override attached (orange)
+        - 🔥 **Criticality**: Share of simulated runs the module is on the critical path (amber → red)
         """)
 
     # ─────────────────────────────────────────────────────────────
@@ -47,12 +51,22 @@ def render_explore_view(memory):
         st.session_state["render_dag"] = True
 
     if st.session_state.get("render_dag", False):
+        criticality = None
+        if show_criticality:
+            params = dict(DEFAULT_STUDIO_PARAMS)
+            try:
+                with st.spinner("⏳ Simulating criticality..."):
+                    criticality = run_simulation(selected_obj, memory, params, runs=2_000, seed=42)["criticality"]
+            except Exception as e:
+                st.error(f"❌ Simulation error: {e}")
+
         html_file = render_dag_pyvis(
             modules=modules,
             edges=edges,
             memory=memory,
             composition_id=selected_obj.id,
-            show_symbolic=show_symbolic
+            show_symbolic=show_symbolic,
+            criticality=criticality
         )
         with open(html_file, "r", encoding="utf-8") as f:
             components.html(f.read(), height=650, scrolling=True)
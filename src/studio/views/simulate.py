@@ -4,22 +4,14 @@ import streamlit as st
 import streamlit.components.v1 as components
 from memory.polaris_memory import PolarisMemory
 from simulate.simulation_engine import run_simulation
+from simulate.parameters import DURATION_MODELS
+from simulate.sampling import SAMPLING_STRATEGIES
 from memory.models import MemoryObject
 from pathlib import Path
 import json
 import matplotlib.pyplot as plt
 
 
-def format_edges_for_nx(edge_dicts):
-    """
-    Convert dict-style edges into NetworkX-compatible (from, to, attrs) tuples.
-    """
-    return [
-        (e["from_node"], e["to_node"], {k: v for k, v in e.items() if k not in ("from_node", "to_node")})
-        for e in edge_dicts if isinstance(e, dict)
-    ]
-
-
 def render_simulate_view(memory: PolarisMemory):
     st.title("🧠 Simulate Governance Flow")
 
@@ -58,15 +50,48 @@ def render_simulate_view(memory: PolarisMemory):
     max_dur = st.number_input("Max Task Duration (days)", value=20, min_value=min_dur)
     failure_rate = st.slider("Failure Rate (%)", 0, 100, 10)
     max_loops = st.number_input("Max Feedback Loops", value=2, min_value=0)
-    override_days = st.number_input("Override Threshold (days)", value=45, min_value=0)
-    num_iterations = st.slider("Monte Carlo Iterations", 10, 2000, 1000, step=10)
+    override_days = st.number_input(
+        "Override Threshold (days, 0 = none)", value=0, min_value=0,
+        help="Caps modules with a discretionary override protocol; protocols with their own trigger keep it"
+    )
+    duration_model = st.selectbox(
+        "Duration Distribution", list(DURATION_MODELS),
+        help="triangular/lognormal draw around each module's duration_days"
+    )
+    module_risk = st.checkbox("⚠️ Use module failure severity and loop stability", value=False)
+    apply_overrides = st.checkbox("🚨 Apply override protocols and override edges", value=True)
+    conditional_skip = st.slider("Conditional Edge Skip Rate (%)", 0, 100, 50)
+    sampling = st.selectbox(
+        "Sampling Strategy", list(SAMPLING_STRATEGIES),
+        help="antithetic / lhs / sobol reach the same precision with fewer runs"
+    )
+    # A fixed default seed lets repeated views of the same study hit the result cache
+    seed_text = st.text_input("Random Seed (blank = fresh draw)", value="42")
+    seed = int(seed_text) if seed_text.strip().isdigit() else None
+    save_record = st.checkbox("💾 Save result record to memory", value=False)
+    deadline = st.number_input("Deadline (days, 0 = none)", value=0, min_value=0)
+    adaptive = st.checkbox("🎯 Stop when converged", value=False)
+    if adaptive:
+        target_metric = st.selectbox("Convergence Metric", ["mean", "p90"])
+        target_half_width = st.number_input("Target CI Half-Width (days)", value=1.0, min_value=0.01)
+        num_iterations = st.number_input("Max Monte Carlo Iterations", value=100_000, min_value=1_000, step=1_000)
+    else:
+        target_metric, target_half_width = "mean", None
+        num_iterations = st.slider("Monte Carlo Iterations", 10, 2000, 1000, step=10)
 
     params = {
         "task_duration_range": (min_dur, max_dur),
         "failure_rate": failure_rate / 100,
         "max_feedback_loops": max_loops,
-        "override_days": override_days
+        "duration_model": duration_model,
+        "module_risk": module_risk,
+        "apply_overrides": apply_overrides,
+        "conditional_skip_rate": conditional_skip / 100
     }
+    if override_days > 0:
+        params["override_days"] = override_days
+    if sampling != "random":
+        params["sampling"] = sampling
 
     if st.button("▶️ Run Simulation"):
         try:
@@ -86,25 +111,72 @@ def render_simulate_view(memory: PolarisMemory):
             else:
                 st.success(f"✅ Found: {mid} ({obj.object_type})")
 
-        formatted_edges = format_edges_for_nx(edges)
-
         with st.spinner("⏳ Running Monte Carlo simulation..."):
             try:
-                # ✅ Pass formatted_edges explicitly and inject into composition
-
                 result = run_simulation(
                     composition=selected_comp,
                     memory=memory,
                     params=params,
-                    runs=num_iterations,
-                    formatted_edges=formatted_edges,
+                    runs=int(num_iterations),
+                    target_half_width=target_half_width,
+                    target_metric=target_metric,
+                    seed=seed,
+                    record=save_record,
+                    deadline=deadline or None,
                 )
             except Exception as e:
                 st.error(f"❌ Simulation error: {e}")
                 return
 
-        st.success("✅ Simulation Complete")
-        st.metric("Average Completion Time (days)", f"{result['avg_duration']:.2f}")
+        st.success(f"✅ Simulation Complete (seed {result['seed']})")
+        if result.get("record_id"):
+            st.caption(f"💾 Result record: `{result['record_id']}`")
+        if result["convergence"]:
+            conv = result["convergence"]
+            status = "converged" if conv["converged"] else "hit the iteration cap"
+            st.info(
+                f"🎯 {result['runs']} runs, {status}: {conv['metric']} ± {conv['half_width']:.2f} days "
+                f"at {conv['confidence']:.0%} confidence"
+            )
+        col1, col2 = st.columns(2)
+        col1.metric("Average Completion Time (days)", f"{result['avg_duration']:.2f}")
+        col2.metric("Average Summed Effort (days)", f"{result['avg_effort']:.2f}")
+        completion = result["completion_time"]
+        factors = result["sampling"]["variance_reduction"]
+        if result["sampling"]["strategy"] != "random" and factors["mean"] is not None:
+            st.caption(
+                f"📉 {result['sampling']['strategy']} sampling: variance reduced {factors['mean']:.1f}x for the mean"
+                + (f", {factors['p90']:.1f}x for P90" if factors["p90"] is not None else "")
+            )
+        col1, col2, col3 = st.columns(3)
+        col1.metric("P50 (days)", f"{completion['p50']:.0f}")
+        col2.metric("P90 (days)", f"{completion['p90']:.0f}")
+        col3.metric("P99 (days)", f"{completion['p99']:.0f}")
+        if result["deadline"]:
+            st.metric(
+                f"P(finish within {result['deadline']['days']:g} days)",
+                f"{result['deadline']['probability']:.1%}"
+            )
+
+        st.markdown("### ⏱️ Completion Time Distribution")
+        distribution = result["distribution"]
+        if distribution["counts"]:
+            edges = distribution["bin_edges"]
+            fig, ax = plt.subplots()
+            ax.bar(edges[:-1], distribution["counts"], width=edges[1] - edges[0], align="edge", color="#3DAEE9")
+            ax.set_xlabel("Completion Time (days)")
+            ax.set_ylabel("Runs")
+            cdf_ax = ax.twinx()
+            cdf_ax.step(edges[1:], distribution["cdf"], where="post", color="#C62828")
+            cdf_ax.set_ylabel("Cumulative Share")
+            cdf_ax.set_ylim(0, 1)
+            if result["deadline"]:
+                ax.axvline(result["deadline"]["days"], color="black", linestyle="--")
+            st.pyplot(fig)
+        with st.expander("🎛️ Per-Module Parameters"):
+            st.json(result["module_parameters"])
+        st.markdown("### Module Slack (mean days)")
+        st.json(result["slack"])
         st.markdown("### Module Failure Frequencies")
         st.json(result["failures"])
 
@@ -125,8 +197,12 @@ def render_simulate_view(memory: PolarisMemory):
             export_data = {
                 "composition_id": selected_comp.id,
                 "parameters": params,
-                "iterations": num_iterations,
+                "iterations": result["runs"],
+                "seed": result["seed"],
                 "avg_duration": result["avg_duration"],
+                "completion_time": result["completion_time"],
+                "distribution": result["distribution"],
+                "deadline": result["deadline"],
                 "failures": result["failures"]
             }
             export_path = Path("export") / f"simulation_{selected_comp.id}.json"
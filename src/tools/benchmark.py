@@ -0,0 +1,217 @@
+# src/tools/benchmark.py
+"""
+Scaling benchmark for the load → compose → validate → interpret → simulate
+pipeline on synthetic compositions.
+
+    cd src
+    python -m tools.benchmark                         # compare against the baseline
+    python -m tools.benchmark --update-baseline       # record a new baseline
+    python -m tools.benchmark --sizes 100 1000 50000 --runs 1000 100000
+
+Exits with status 1 when any timing regresses past the threshold.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import contextlib
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from memory.polaris_memory import PolarisMemory
+from compose.composition_engine import CompositionEngine
+from compose.compiled_composition import CompiledComposition
+from interpret.flow_grammar import interpret_flow
+from simulate.parameters import DEFAULT_STUDIO_PARAMS
+from simulate.simulation_engine import run_simulation
+from studio.utils.diagnostics import run_diagnostics
+from tools.synthetic_composition import (
+    SYNTHETIC_JURISDICTION, generate_synthetic_domain, synthetic_composition_id, write_synthetic_domain
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "benchmarks" / "baseline.json"
+DEFAULT_SIZES = (100, 1_000, 5_000)
+DEFAULT_RUNS = (1_000, 10_000)
+# A timing regresses when it is this much slower than the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and slower by at least this many seconds (timer noise on tiny cases).
+MIN_REGRESSION_SECONDS = 0.05
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Silence the per-object progress prints while timing.
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def best_time(fn: Callable, repeat: int):
+    """
+    (fastest wall time of `repeat` calls, result of the last call).
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with quiet():
+            result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_size(
+    n_modules: int,
+    runs: Tuple[int, ...],
+    repeat: int = 3,
+    layer_width: int = 20,
+    edge_density: float = 0.1,
+    overlay_share: float = 0.05,
+    seed: int = 0
+) -> Dict[str, float]:
+    """
+    Time each pipeline phase on one synthetic composition of `n_modules`;
+    "load_cold" is the first load of the fresh directory, "load" the best reload.
+    FailureEvents, FeedbackLoops and OverrideProtocols each cover
+    `overlay_share` of the modules.
+    """
+    overlays = max(1, int(n_modules * overlay_share))
+    records = generate_synthetic_domain(
+        n_modules, layer_width, edge_density,
+        failures=overlays, feedback_loops=overlays, overrides=overlays, seed=seed
+    )
+    timings: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = write_synthetic_domain(records, Path(tmp))
+        # The first load parses every file and writes the snapshot; later ones read the snapshot
+        timings["load_cold"], _ = best_time(lambda: PolarisMemory(directory), 1)
+        timings["load"], memory = best_time(lambda: PolarisMemory(directory), repeat)
+        composition = memory.get_by_id(synthetic_composition_id(n_modules))
+
+        def compose():
+            engine = CompositionEngine(memory)
+            engine.load_modules(SYNTHETIC_JURISDICTION)
+            engine.build_graph()
+            return engine
+
+        timings["compose"], engine = best_time(compose, repeat)
+        timings["compile"], compiled = best_time(lambda: CompiledComposition(composition, memory), repeat)
+        timings["validate"], _ = best_time(lambda: (engine.validate_graph(), run_diagnostics(compiled, memory)), repeat)
+        timings["interpret"], _ = best_time(lambda: interpret_flow(composition, memory), repeat)
+        for n_runs in runs:
+            timings[f"simulate_{n_runs}"], _ = best_time(
+                lambda: run_simulation(composition, memory, DEFAULT_STUDIO_PARAMS, runs=n_runs, seed=seed, use_cache=False),
+                repeat
+            )
+    return timings
+
+
+def run_benchmarks(
+    sizes: Tuple[int, ...] = DEFAULT_SIZES,
+    runs: Tuple[int, ...] = DEFAULT_RUNS,
+    repeat: int = 3,
+    **generator_options
+) -> Dict[str, float]:
+    """
+    Flat {"<modules>/<phase>": seconds} timings for every size.
+    """
+    results: Dict[str, float] = {}
+    for n_modules in sizes:
+        print(f"⏱️ Benchmarking {n_modules} modules...")
+        for phase, seconds in benchmark_size(n_modules, runs, repeat, **generator_options).items():
+            results[f"{n_modules}/{phase}"] = seconds
+            print(f"   - {phase}: {seconds * 1000:.1f} ms")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(path: Path, timings: Dict[str, float]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "timings": timings}, f, indent=2, sort_keys=True)
+    print(f"💾 Baseline written to: {path}")
+
+
+def find_regressions(
+    timings: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = MIN_REGRESSION_SECONDS
+) -> List[Dict]:
+    """
+    Cases present in both runs that got more than `threshold` (relative) and
+    `min_seconds` (absolute) slower.
+    """
+    regressions = []
+    for case, seconds in timings.items():
+        before = baseline.get(case)
+        if before is None:
+            continue
+        if seconds > before * (1 + threshold) and seconds - before > min_seconds:
+            regressions.append({"case": case, "baseline": before, "current": seconds, "ratio": seconds / before})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the simulation pipeline on synthetic compositions")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Module counts (100 to 50000)")
+    parser.add_argument("--runs", type=int, nargs="+", default=list(DEFAULT_RUNS), help="Simulation run counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Keep the fastest of this many timings")
+    parser.add_argument("--layer-width", type=int, default=20)
+    parser.add_argument("--edge-density", type=float, default=0.1)
+    parser.add_argument("--overlay-share", type=float, default=0.05, help="Share of modules with each overlay type")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    timings = run_benchmarks(
+        tuple(args.sizes), tuple(args.runs), args.repeat,
+        layer_width=args.layer_width, edge_density=args.edge_density, overlay_share=args.overlay_share
+    )
+
+    if args.update_baseline:
+        save_baseline(args.baseline, timings)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    regressions = find_regressions(timings, baseline.get("timings", {}), args.threshold)
+    if baseline.get("environment") != environment():
+        print("⚠️ Baseline was recorded on a different environment; comparisons may be noisy.")
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%}.")
+        return 0
+    print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for row in regressions:
+        print(f"   - {row['case']}: {row['baseline'] * 1000:.1f} → {row['current'] * 1000:.1f} ms ({row['ratio']:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,13 +17,13 @@ for file in DATA_DIR.glob("*.json"):
 
             for obj in records:
                 object_id = (
-                    obj.get("module_id") or
                     obj.get("failure_id") or
                     obj.get("loop_id") or
                     obj.get("reform_id") or
                     obj.get("override_id") or
                     obj.get("actor_map_id") or
                     obj.get("scaffold_id") or
+                    obj.get("module_id") or
                     obj.get("term") or
                     f"auto-{file.stem}"
                 )
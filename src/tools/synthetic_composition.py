@@ -0,0 +1,146 @@
+# src/tools/synthetic_composition.py
+
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+
+SYNTHETIC_JURISDICTION = "Synthetic"
+
+
+def synthetic_edges(
+    n_modules: int,
+    layer_width: int,
+    edge_density: float,
+    rng: np.random.Generator
+) -> List[List[int]]:
+    """
+    Layered DAG over module indices 0..n_modules-1, `layer_width` per layer.
+    Every module after the first layer gets one random parent in the previous
+    layer, plus each other module of that layer with probability `edge_density`;
+    every module before the last layer gets at least one child, so none is isolated.
+    """
+    edges = []
+    for start in range(layer_width, n_modules, layer_width):
+        prev = np.arange(start - layer_width, start)
+        layer = np.arange(start, min(start + layer_width, n_modules))
+        links = rng.random((len(prev), len(layer))) < edge_density
+        links[rng.integers(0, len(prev), size=len(layer)), np.arange(len(layer))] = True
+        links[np.arange(len(prev)), rng.integers(0, len(layer), size=len(prev))] = True
+        src, dst = np.nonzero(links)
+        edges.extend(zip(prev[src].tolist(), layer[dst].tolist()))
+    return edges
+
+
+def generate_synthetic_domain(
+    n_modules: int,
+    layer_width: int = 20,
+    edge_density: float = 0.1,
+    failures: int = 0,
+    feedback_loops: int = 0,
+    overrides: int = 0,
+    seed: int = 0
+) -> List[Dict]:
+    """
+    Raw SDMO records for a synthetic permitting domain: `n_modules`
+    PermittingModules in a layered DAG (see `synthetic_edges`), the requested
+    numbers of FailureEvent / FeedbackLoop / OverrideProtocol overlays on random
+    modules, and one Composition over everything. Each FeedbackLoop also adds
+    a feedback_loop edge back to a module one layer up. Same seed, same domain.
+    """
+    rng = np.random.default_rng(seed)
+    ids = [f"mod-syn-{i:05d}" for i in range(n_modules)]
+    edges = synthetic_edges(n_modules, layer_width, edge_density, rng)
+
+    dependencies: Dict[int, List[str]] = {}
+    for src, dst in edges:
+        dependencies.setdefault(dst, []).append(ids[src])
+
+    records: List[Dict] = []
+    durations = rng.integers(5, 60, size=n_modules)
+    for i, mid in enumerate(ids):
+        records.append({
+            "object_type": "PermittingModule",
+            "module_id": mid,
+            "module_name": f"Synthetic Module {i}",
+            "jurisdiction": SYNTHETIC_JURISDICTION,
+            "jurisdiction_version": "v1",
+            "sequence_order": i // layer_width + 1,
+            "procedure_type": "regulatory",
+            "duration_days": int(durations[i]),
+            "dependencies": dependencies.get(i, []),
+        })
+
+    for k, i in enumerate(rng.choice(n_modules, size=min(failures, n_modules), replace=False).tolist()):
+        records.append({
+            "object_type": "FailureEvent",
+            "failure_id": f"failure-syn-{k:05d}",
+            "jurisdiction": SYNTHETIC_JURISDICTION,
+            "jurisdiction_version": "v1",
+            "module_id": ids[i],
+            "failure_type": "delay",
+            "severity_rating": round(float(rng.uniform(0.05, 0.6)), 2),
+        })
+
+    typed_edges = [[ids[src], ids[dst]] for src, dst in edges]
+    # Loops need a module one layer up to point back to
+    candidates = np.arange(layer_width, n_modules)
+    for k, i in enumerate(rng.choice(candidates, size=min(feedback_loops, len(candidates)), replace=False).tolist()):
+        records.append({
+            "object_type": "FeedbackLoop",
+            "loop_id": f"loop-syn-{k:05d}",
+            "jurisdiction": SYNTHETIC_JURISDICTION,
+            "jurisdiction_version": "v1",
+            "trigger_module_id": ids[i],
+            "loop_type": "technical_revision",
+            "stability_rating": round(float(rng.uniform(0.5, 0.95)), 2),
+        })
+        target = dependencies[i][0]
+        typed_edges.append({"from_node": ids[i], "to_node": target, "type": "feedback_loop"})
+
+    for k, i in enumerate(rng.choice(n_modules, size=min(overrides, n_modules), replace=False).tolist()):
+        records.append({
+            "id": f"override-syn-{k:05d}",
+            "object_type": "OverrideProtocol",
+            "override_id": f"override-syn-{k:05d}",
+            "jurisdiction": SYNTHETIC_JURISDICTION,
+            "jurisdiction_version": "v1",
+            "module_id": ids[i],
+            "override_type": "timebound_default",
+            "trigger_condition": {"type": "deadline_lapse", "value": f"{int(durations[i]) * 2}_days"},
+        })
+
+    records.append({
+        "id": synthetic_composition_id(n_modules),
+        "object_type": "Composition",
+        "jurisdiction": SYNTHETIC_JURISDICTION,
+        "version": "v1",
+        "created_by": "synthetic",
+        "tags": [],
+        "data": {
+            "title": f"Synthetic Flow ({n_modules} modules)",
+            "jurisdiction": SYNTHETIC_JURISDICTION,
+            "modules": ids,
+            "edges": typed_edges,
+        },
+    })
+    return records
+
+
+def synthetic_composition_id(n_modules: int) -> str:
+    return f"composition-synthetic-{n_modules}"
+
+
+def write_synthetic_domain(records: List[Dict], directory: Path) -> Path:
+    """
+    Write records as a loadable memory directory, one JSON list per object type.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    grouped: Dict[str, List[Dict]] = {}
+    for record in records:
+        grouped.setdefault(record["object_type"], []).append(record)
+    for object_type, items in grouped.items():
+        with open(directory / f"synthetic_{object_type}.json", "w", encoding="utf-8") as f:
+            json.dump(items, f)
+    return directory
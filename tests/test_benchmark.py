@@ -0,0 +1,40 @@
+# tests/test_benchmark.py
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from memory.polaris_memory import PolarisMemory
+from compose.compiled_composition import compile_composition
+from tools.synthetic_composition import generate_synthetic_domain, synthetic_composition_id, write_synthetic_domain
+from tools.benchmark import benchmark_size, find_regressions
+
+
+def test_synthetic_domain_is_a_connected_layered_dag(tmp_path):
+    records = generate_synthetic_domain(250, layer_width=10, edge_density=0.2, failures=5, feedback_loops=4, overrides=3, seed=1)
+    assert records == generate_synthetic_domain(250, layer_width=10, edge_density=0.2, failures=5, feedback_loops=4, overrides=3, seed=1)
+
+    memory = PolarisMemory(write_synthetic_domain(records, tmp_path))
+    assert len(memory.get_by_type("PermittingModule")) == 250
+    assert len(memory.get_by_type("FailureEvent")) == 5
+    assert len(memory.get_by_type("FeedbackLoop")) == 4
+    assert len(memory.get_by_type("OverrideProtocol")) == 3
+
+    compiled = compile_composition(memory.get_by_id(synthetic_composition_id(250)), memory)
+    assert compiled.is_dag
+    assert len(compiled.isolates) == 0
+    assert len(compiled.feedback_edges) == 4
+    # 25 layers; the forward schedule starts after the source layer
+    assert len(compiled.schedule[0]) == 24
+
+
+def test_benchmark_times_every_phase_and_flags_regressions():
+    timings = benchmark_size(100, runs=(200,), repeat=1)
+    assert set(timings) == {"load_cold", "load", "compose", "compile", "validate", "interpret", "simulate_200"}
+    assert all(seconds > 0 for seconds in timings.values())
+
+    baseline = {"100/load": 0.010, "100/simulate_200": 1.0, "100/gone": 1.0}
+    current = {"100/load": 0.030, "100/simulate_200": 1.5, "100/new": 9.0}
+    # load tripled but only by 20 ms (noise); simulate is 50% and 0.5 s slower
+    assert [row["case"] for row in find_regressions(current, baseline, threshold=0.25)] == ["100/simulate_200"]
+    assert find_regressions(current, baseline, threshold=0.6) == []
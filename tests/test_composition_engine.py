@@ -138,4 +138,40 @@ def test_export_and_save_composition():
     with open(saved_path, "r", encoding="utf-8") as f:
         saved_data = json.load(f)
         assert saved_data["object_type"] == "Composition"
-        assert len(saved_data["data"]["edges"]) >= 1
\ No newline at end of file
+        assert len(saved_data["data"]["edges"]) >= 1
+
+def test_compiled_composition_is_shared_and_normalizes_edges():
+    from compose.compiled_composition import compile_composition
+
+    memory = PolarisMemory(memory_path=Path("tests/mock-memory"))
+    memory.objects = {
+        mid: MemoryObject(id=mid, object_type="PermittingModule", data={})
+        for mid in ("mod-A", "mod-B", "mod-C")
+    }
+
+    # Mixed legacy pair + typed dict edges, nested SDMO-on-disk layout
+    comp = MemoryObject(
+        id="composition-test-compiled",
+        object_type="Composition",
+        data={"data": {
+            "modules": ["mod-A", "mod-B", "mod-C"],
+            "edges": [["mod-A", "mod-B"], {"from_node": "mod-B", "to_node": "mod-C", "type": "temporal"}],
+        }},
+    )
+
+    compiled = compile_composition(comp, memory)
+    assert compile_composition(comp, memory) is compiled
+    assert compiled.is_dag
+    assert compiled.node_ids(compiled.topological_order) == ["mod-A", "mod-B", "mod-C"]
+    assert compiled.node_ids(compiled.sources) == ["mod-A"]
+    assert compiled.node_ids(compiled.sinks) == ["mod-C"]
+    assert compiled.edge_types == ("dependency", "temporal")
+    assert list(compiled.succ_indices[compiled.succ_indptr[0]:compiled.succ_indptr[1]]) == [1]
+    assert set(compiled.modules) == {"mod-A", "mod-B", "mod-C"}
+
+    # Changing the content yields a fresh compilation
+    comp.data["data"]["edges"].append(["mod-C", "mod-A"])
+    recompiled = compile_composition(comp, memory)
+    assert recompiled is not compiled
+    assert not recompiled.is_dag
+    assert recompiled.topological_order is None
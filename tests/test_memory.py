@@ -67,3 +67,190 @@ def test_query_filter_fn(sample_memory):
     results = sample_memory.query(lambda o: "Environmental" in o.data.get("module_name", ""))
     assert isinstance(results, list)
     assert all("Environmental" in o.data.get("module_name", "") for o in results)
+
+
+def test_secondary_indexes_follow_every_change(sample_memory):
+    objects = list(sample_memory.objects.values())
+    for object_type in {obj.object_type for obj in objects}:
+        assert sample_memory.get_by_type(object_type) == [o for o in objects if o.object_type == object_type]
+    assert sample_memory.get_by_jurisdiction("Denpasar", "v1") == [
+        o for o in objects if o.jurisdiction == "Denpasar" and o.version == "v1"
+    ]
+
+    module_id = "mod-denpasar-environmental-assessment"
+    failures = sample_memory.get_linked(module_id, "FailureEvent")
+    assert failures == [o for o in sample_memory.get_by_type("FailureEvent") if o.data.get("module_id") == module_id]
+    assert all(o.data.get("trigger_module_id") == module_id
+               for o in sample_memory.get_linked(module_id, field="trigger_module_id"))
+    assert sample_memory.query(object_type="FailureEvent", linked_to=module_id) == failures
+
+    # Direct writes into `objects`, tag changes and deletes all reach the indexes
+    overlay = MemoryObject(id="failure-test", object_type="FailureEvent", jurisdiction="Denpasar",
+                           version="v2", data={"module_id": module_id})
+    sample_memory.objects[overlay.id] = overlay
+    assert sample_memory.get_linked(module_id, "FailureEvent")[-1] is overlay
+    assert sample_memory.get_by_jurisdiction("Denpasar", "v2") == [overlay]
+
+    sample_memory.add_tag(overlay.id, "#audit")
+    sample_memory.remove_tag(overlay.id, "#audit")
+    assert sample_memory.query_by_tag("#audit") == []
+
+    assert sample_memory.delete_object(overlay.id)
+    assert not sample_memory.delete_object(overlay.id)
+    assert sample_memory.get_linked(module_id, "FailureEvent") == failures
+    assert overlay not in sample_memory.get_by_type("FailureEvent")
+    assert sample_memory.get_by_jurisdiction("Denpasar", "v2") == []
+
+
+def test_boolean_tag_queries(sample_memory, tmp_path):
+    # Library modules only: objects saved by other tests have ids save_all rewrites
+    modules = sorted(obj.id for obj in sample_memory.get_by_type("PermittingModule") if obj.id.startswith("mod-"))
+    a, b, c = modules[:3]
+    for object_id, tags in ((a, ["#grid", "#slow"]), (b, ["#grid"]), (c, ["#slow", "#retired"])):
+        for tag in tags:
+            sample_memory.add_tag(object_id, tag)
+
+    def ids(objs):
+        return {obj.id for obj in objs}
+
+    assert ids(sample_memory.query_tags(all_of=["#grid", "#slow"])) == {a}
+    assert ids(sample_memory.query_tags(any_of=["#grid", "#slow"])) == {a, b, c}
+    assert ids(sample_memory.query_tags(any_of=["#grid", "#slow"], none_of=["#retired"])) == {a, b}
+    assert ids(sample_memory.query_tags(all_of=["#slow"], any_of=["#grid", "#missing"])) == {a}
+    assert c not in ids(sample_memory.query_tags(none_of=["#retired"]))
+    assert len(sample_memory.query_tags(none_of=["#retired"])) == len(sample_memory.objects) - 1
+
+    sample_memory.remove_tag(a, "#slow")
+    assert sample_memory.query_tags(all_of=["#grid", "#slow"]) == []
+    assert sample_memory.index.get_by_tag("#slow") == [c]
+
+    export_dir = sample_memory.save_all(tmp_path / "export", only_tag="#grid", verbose=False)
+    assert {f.stem for f in export_dir.rglob("*.json")} == {a, b}
+
+
+def test_snapshot_reloads_memory_until_files_change(tmp_path, capsys):
+    import json
+    import shutil
+    from memory.snapshot import SNAPSHOT_NAME
+
+    directory = tmp_path / "denpasar_v1"
+    shutil.copytree("library/domains/urban_permitting/denpasar_v1/", directory)
+    (directory / SNAPSHOT_NAME).unlink(missing_ok=True)
+
+    fresh = PolarisMemory(directory)
+    assert (directory / SNAPSHOT_NAME).exists()
+    capsys.readouterr()
+
+    cached = PolarisMemory(directory)
+    assert "from snapshot" in capsys.readouterr().out
+    assert list(cached.objects) == list(fresh.objects)
+    for object_id, obj in fresh.objects.items():
+        assert cached.objects[object_id].model_dump(exclude={"created_on"}) == obj.model_dump(exclude={"created_on"})
+    assert [o.id for o in cached.get_by_type("FailureEvent")] == [o.id for o in fresh.get_by_type("FailureEvent")]
+    module_id = "mod-denpasar-environmental-assessment"
+    assert [o.id for o in cached.get_linked(module_id)] == [o.id for o in fresh.get_linked(module_id)]
+
+    # Editing any file invalidates the snapshot
+    site = directory / "mod-denpasar-site-control.json"
+    record = json.loads(site.read_text())
+    record["duration_days"] = 99
+    site.write_text(json.dumps(record))
+    reloaded = PolarisMemory(directory)
+    assert "from snapshot" not in capsys.readouterr().out
+    assert reloaded.get_by_id("mod-denpasar-site-control").data["duration_days"] == 99
+
+
+def test_lazy_memory_loads_payloads_on_demand(tmp_path, capsys):
+    import shutil
+    from memory.snapshot import SNAPSHOT_NAME
+
+    directory = tmp_path / "denpasar_v1"
+    shutil.copytree("library/domains/urban_permitting/denpasar_v1/", directory)
+    (directory / SNAPSHOT_NAME).unlink(missing_ok=True)
+
+    # A full load writes the snapshot, then reopens it header-only
+    first_open = PolarisMemory(directory, lazy=True, payload_cache=2)
+    assert first_open.payloads is not None and first_open.payloads.resident == 0
+
+    eager = PolarisMemory(directory)
+    capsys.readouterr()
+    lazy = PolarisMemory(directory, lazy=True, payload_cache=2)
+    assert "payloads on demand" in capsys.readouterr().out
+    assert list(lazy.objects) == list(eager.objects)
+    assert [o.id for o in lazy.get_by_type("PermittingModule")] == [o.id for o in eager.get_by_type("PermittingModule")]
+    assert lazy.payloads.loads == 0
+
+    for object_id, obj in eager.objects.items():
+        assert lazy.objects[object_id].data == obj.data
+    assert lazy.payloads.resident == 2
+    assert lazy.payloads.loads == len(eager.objects)
+
+    # Dropped payloads are read again on their next access
+    first = next(iter(lazy.objects.values()))
+    assert "data" not in first.__dict__
+    assert first.data == eager.objects[first.id].data
+
+    module_id = "mod-denpasar-environmental-assessment"
+    assert [o.id for o in lazy.get_linked(module_id)] == [o.id for o in eager.get_linked(module_id)]
+
+
+def test_refresh_rereads_only_changed_files(tmp_path, capsys):
+    import json
+    import os
+    import shutil
+    import time
+    from memory.snapshot import SNAPSHOT_NAME
+
+    directory = tmp_path / "denpasar_v1"
+    shutil.copytree("library/domains/urban_permitting/denpasar_v1/", directory)
+    (directory / SNAPSHOT_NAME).unlink(missing_ok=True)
+    PolarisMemory(directory)
+    # Sources come back with the snapshot, so this instance can refresh too
+    memory = PolarisMemory(directory)
+    capsys.readouterr()
+
+    def touch(path):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert memory.refresh() == {"added": [], "updated": [], "removed": []}
+    assert "Scanning" not in capsys.readouterr().out
+
+    untouched = memory.get_by_id("mod-denpasar-environmental-assessment")
+    site = directory / "mod-denpasar-site-control.json"
+    record = json.loads(site.read_text())
+    record["duration_days"] = 99
+    site.write_text(json.dumps(record))
+    touch(site)
+    changes = memory.refresh()
+    assert changes["updated"] == ["mod-denpasar-site-control"]
+    assert capsys.readouterr().out.count("Scanning") == 1
+    assert memory.get_by_id("mod-denpasar-site-control").data["duration_days"] == 99
+    assert memory.get_by_id("mod-denpasar-environmental-assessment") is untouched
+
+    module_id = "mod-denpasar-environmental-assessment"
+    failure = directory / "failure-refresh-test.json"
+    failure.write_text(json.dumps({
+        "failure_id": "failure-refresh-test", "object_type": "FailureEvent", "module_id": module_id
+    }))
+    assert memory.refresh()["added"] == ["failure-refresh-test"]
+    assert "failure-refresh-test" in [o.id for o in memory.get_linked(module_id, "FailureEvent")]
+
+    failure.unlink()
+    assert memory.refresh()["removed"] == ["failure-refresh-test"]
+    assert "failure-refresh-test" not in [o.id for o in memory.get_linked(module_id)]
+
+    # A watcher picks changes up on its own
+    events = []
+    watcher = memory.watch(interval=0.02, on_change=events.append)
+    try:
+        record["duration_days"] = 7
+        site.write_text(json.dumps(record))
+        touch(site)
+        deadline = time.time() + 5
+        while not events and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+    assert events and events[0]["updated"] == ["mod-denpasar-site-control"]
+    assert memory.get_by_id("mod-denpasar-site-control").data["duration_days"] == 7
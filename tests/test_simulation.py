@@ -0,0 +1,719 @@
+# tests/test_simulation.py
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+import numpy as np
+import networkx as nx
+from pathlib import Path
+from memory.polaris_memory import PolarisMemory
+from memory.models import MemoryObject
+from simulate.simulation_engine import run_simulation
+
+COMPOSITION_ID = "composition-denpasar-denpasar_bess_permitting_flow"
+
+
+@pytest.fixture(autouse=True)
+def isolated_result_cache(tmp_path):
+    from simulate.result_cache import configure_cache
+    return configure_cache(tmp_path / "simulation_cache")
+
+
+@pytest.fixture(scope="module")
+def denpasar_memory():
+    return PolarisMemory(Path("library/domains/urban_permitting/denpasar_v1/"))
+
+
+def base_params(**overrides):
+    params = {
+        "task_duration_range": (5, 20),
+        "failure_rate": 0.1,
+        "max_feedback_loops": 2,
+    }
+    params.update(overrides)
+    return params
+
+
+def test_run_simulation_result_shape(denpasar_memory):
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+    result = run_simulation(composition, denpasar_memory, base_params(), runs=500)
+
+    assert result["runs"] == 500
+    assert set(result["failures"]) == set(composition.data["data"]["modules"])
+    assert all(0 <= count <= 500 for count in result["failures"].values())
+
+
+def test_run_simulation_deterministic_bounds(denpasar_memory):
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+    module_count = len(composition.data["data"]["modules"])
+    graph = nx.DiGraph()
+    graph.add_nodes_from(composition.data["data"]["modules"])
+    graph.add_edges_from(composition.data["data"]["edges"])
+    chain_length = nx.dag_longest_path_length(graph) + 1
+
+    never_fails = run_simulation(
+        composition, denpasar_memory, base_params(task_duration_range=(5, 5), failure_rate=0.0), runs=50
+    )
+    assert never_fails["avg_duration"] == 5 * chain_length
+    assert never_fails["avg_effort"] == 5 * module_count
+    assert all(count == 0 for count in never_fails["failures"].values())
+
+    always_fails = run_simulation(
+        composition, denpasar_memory, base_params(task_duration_range=(5, 5), failure_rate=1.0), runs=50
+    )
+    assert always_fails["avg_duration"] == 5 * 3 * chain_length
+    assert always_fails["avg_effort"] == 5 * 3 * module_count
+    assert all(count == 50 for count in always_fails["failures"].values())
+
+
+def mock_memory(module_ids):
+    memory = PolarisMemory(memory_path=Path("tests/mock-memory"))
+    memory.objects = {
+        mid: MemoryObject(id=mid, object_type="PermittingModule", data={})
+        for mid in module_ids
+    }
+    return memory
+
+
+def test_run_simulation_uses_critical_path():
+    # A → B → C in series, D in parallel with the whole chain
+    memory = mock_memory(["mod-A", "mod-B", "mod-C", "mod-D"])
+    composition = MemoryObject(
+        id="composition-test-parallel",
+        object_type="Composition",
+        data={
+            "modules": ["mod-A", "mod-B", "mod-C", "mod-D"],
+            "edges": [["mod-A", "mod-B"], ["mod-B", "mod-C"], ["mod-A", "mod-D"]],
+        },
+    )
+
+    result = run_simulation(
+        composition, memory, base_params(task_duration_range=(5, 5), failure_rate=0.0), runs=20
+    )
+
+    assert result["avg_duration"] == 15
+    assert result["avg_effort"] == 20
+    assert result["slack"] == {"mod-A": 0.0, "mod-B": 0.0, "mod-C": 0.0, "mod-D": 5.0}
+    assert result["criticality"]["mod-D"] == {
+        "critical_fraction": 0.0, "mean_contribution": 0.0, "p90_contribution": 0.0, "mean_slack": 5.0
+    }
+    for mid in ("mod-A", "mod-B", "mod-C"):
+        assert result["criticality"][mid] == {
+            "critical_fraction": 1.0, "mean_contribution": 5.0, "p90_contribution": 5.0, "mean_slack": 0.0
+        }
+
+
+def test_criticality_splits_between_competing_branches():
+    # B and C race into D; each is the longer branch about half the time
+    memory = mock_memory(["mod-A", "mod-B", "mod-C", "mod-D"])
+    composition = MemoryObject(
+        id="composition-test-race",
+        object_type="Composition",
+        data={
+            "modules": ["mod-A", "mod-B", "mod-C", "mod-D"],
+            "edges": [["mod-A", "mod-B"], ["mod-A", "mod-C"], ["mod-B", "mod-D"], ["mod-C", "mod-D"]],
+        },
+    )
+    result = run_simulation(
+        composition, memory, base_params(duration_model="lognormal", failure_rate=0.0), runs=20_000, seed=5
+    )
+    criticality = result["criticality"]
+
+    assert criticality["mod-A"]["critical_fraction"] == 1.0
+    assert criticality["mod-D"]["critical_fraction"] == 1.0
+    for mid in ("mod-B", "mod-C"):
+        assert criticality[mid]["critical_fraction"] == pytest.approx(0.5, abs=0.02)
+        assert 0 < criticality[mid]["mean_contribution"] < criticality[mid]["p90_contribution"]
+        assert criticality[mid]["mean_slack"] > 0
+
+
+def test_seeded_runs_match_across_worker_counts(denpasar_memory):
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+
+    single = run_simulation(composition, denpasar_memory, base_params(), runs=25_000, seed=11)
+    pooled = run_simulation(composition, denpasar_memory, base_params(), runs=25_000, seed=11, workers=2, use_cache=False)
+    other_seed = run_simulation(composition, denpasar_memory, base_params(), runs=25_000, seed=12)
+
+    assert single == pooled
+    assert single != other_seed
+
+
+def test_streaming_accumulators_merge_like_one_pass():
+    import numpy as np
+    from simulate.accumulators import RunningStats, QuantileSketch
+
+    values = np.random.default_rng(3).integers(0, 500, size=10_000)
+
+    stats, left, right = RunningStats(), RunningStats(), RunningStats()
+    stats.update(values)
+    left.update(values[:3_000])
+    right.update(values[3_000:])
+    left.merge(right)
+    assert left.count == stats.count
+    assert left.mean == pytest.approx(values.mean())
+    assert left.std == pytest.approx(values.std(ddof=1))
+    assert (left.min, left.max) == (values.min(), values.max())
+
+    # A tiny bucket budget forces coarsening; merging mismatched widths must still work
+    exact, coarse = QuantileSketch(), QuantileSketch(max_buckets=64)
+    exact.update(values[:5_000])
+    coarse.update(values[5_000:])
+    exact.merge(coarse)
+    assert exact.total == values.size
+    assert abs(exact.quantile(0.9) - np.quantile(values, 0.9)) <= exact.width
+
+    # Several series share one width; each column keeps its own quantiles
+    columns = np.stack([values, values // 10], axis=1)
+    multi, multi_right = QuantileSketch(n_series=2), QuantileSketch(n_series=2, max_buckets=64)
+    multi.update(columns[:5_000])
+    multi_right.update(columns[5_000:])
+    multi.merge(multi_right)
+    expected = np.quantile(columns, 0.9, axis=0)
+    assert np.all(np.abs(multi.quantile(0.9) - expected) <= multi.width)
+
+
+def test_run_simulation_reports_distribution(denpasar_memory):
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+    result = run_simulation(composition, denpasar_memory, base_params(), runs=2_000, seed=5)
+
+    summary = result["completion_time"]
+    assert summary["min"] <= summary["p50"] <= summary["p90"] <= summary["p99"] <= summary["max"]
+    assert summary["mean"] == result["avg_duration"]
+    for mid, histogram in result["rework_histogram"].items():
+        assert len(histogram) == 3
+        assert sum(histogram) == 2_000
+        assert 2_000 - histogram[0] == result["failures"][mid]
+
+    distribution = result["distribution"]
+    assert len(distribution["counts"]) <= 64
+    assert len(distribution["bin_edges"]) == len(distribution["counts"]) + 1
+    assert sum(distribution["counts"]) == 2_000
+    assert distribution["bin_edges"][0] <= summary["min"] and summary["max"] < distribution["bin_edges"][-1]
+    assert distribution["cdf"][-1] == 1.0
+    assert all(a <= b for a, b in zip(distribution["cdf"], distribution["cdf"][1:]))
+    assert distribution["quantiles"]["p50"] == summary["p50"]
+    assert result["deadline"] is None
+
+
+def test_deadline_probability_matches_run_share():
+    # A → B with integer durations 1..4 each: P(A + B <= 4) = 6 / 16
+    memory = mock_memory(["mod-A", "mod-B"])
+    chain = typed_composition([["mod-A", "mod-B"]])
+    params = base_params(task_duration_range=(1, 4), failure_rate=0.0)
+
+    result = run_simulation(chain, memory, params, runs=40_000, seed=9, deadline=4)
+    assert result["deadline"]["days"] == 4
+    assert result["deadline"]["probability"] == pytest.approx(6 / 16, abs=0.01)
+    assert result["distribution"]["bin_edges"] == [2, 3, 4, 5, 6, 7, 8, 9]
+    assert result["distribution"]["quantiles"]["p10"] == 3
+
+    later = run_simulation(chain, memory, params, runs=40_000, seed=9, deadline=8)
+    assert later["deadline"]["probability"] == 1.0
+    assert later["distribution"] == result["distribution"]
+
+
+def test_sketch_interpolates_continuous_values_within_buckets():
+    import numpy as np
+    from simulate.accumulators import QuantileSketch
+
+    values = np.random.default_rng(4).lognormal(3.0, 0.5, size=50_000)
+    sketch = QuantileSketch(max_buckets=64)
+    sketch.update(values)
+    assert sketch.width == 4 and not sketch.integral
+    # Bucket-edge answers would be off by up to a whole bucket; interpolation is far closer
+    for deadline in (12.3, 20.7, 31.1):
+        assert sketch.cdf(deadline) == pytest.approx(np.mean(values <= deadline), abs=0.01)
+    for q in (0.1, 0.5, 0.9):
+        assert abs(sketch.quantile(q) - np.quantile(values, q)) < sketch.width / 4
+
+    # A continuous model with a non-integer deadline reports the resolution it was read at
+    memory = mock_memory(["mod-A", "mod-B"])
+    chain = typed_composition([["mod-A", "mod-B"]])
+    result = run_simulation(chain, memory, base_params(duration_model="lognormal"), runs=4_000, seed=2, deadline=30.5)
+    distribution = result["distribution"]
+    assert result["deadline"]["bucket_width"] == distribution["bucket_width"]
+    edges, cdf = distribution["bin_edges"], [0.0] + distribution["cdf"]
+    bucket = next(i for i in range(len(edges) - 1) if edges[i] <= 30.5 < edges[i + 1])
+    assert cdf[bucket] < result["deadline"]["probability"] < cdf[bucket + 1]
+
+
+def test_adaptive_stopping_reaches_target(denpasar_memory):
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+
+    result = run_simulation(
+        composition, denpasar_memory, base_params(), runs=200_000, seed=2, target_half_width=0.5
+    )
+    assert result["convergence"]["converged"]
+    assert result["convergence"]["half_width"] <= 0.5
+    assert result["runs"] < 200_000
+
+    pooled = run_simulation(
+        composition, denpasar_memory, base_params(), runs=200_000, seed=2, target_half_width=0.5, workers=3,
+        use_cache=False
+    )
+    assert pooled == result
+
+    capped = run_simulation(
+        composition, denpasar_memory, base_params(), runs=2_000, seed=2, target_half_width=0.01, target_metric="p90"
+    )
+    assert not capped["convergence"]["converged"]
+    assert capped["runs"] == 2_000
+
+
+def test_variance_reduced_sampling_is_unbiased_and_tighter(denpasar_memory):
+    from simulate.sampling import design_uniforms
+
+    rng = np.random.default_rng(0)
+    for strategy in ("antithetic", "lhs", "sobol"):
+        u = design_uniforms(rng, 256, 40, strategy, leading=40)
+        assert u.shape == (256, 40) and 0 < u.min() and u.max() < 1
+        if strategy != "antithetic":
+            # Every column hits each of the 256 strata exactly once
+            assert all(len(set((u[:, j] * 256).astype(int))) == 256 for j in range(40))
+
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+    params = base_params(duration_model="triangular", module_risk=True)
+    plain = run_simulation(composition, denpasar_memory, params, runs=20_000, seed=6)
+    assert plain["sampling"]["strategy"] == "random"
+    assert plain["sampling"]["blocks"] == 78
+    assert 0.5 < plain["sampling"]["variance_reduction"]["mean"] < 2
+
+    for strategy in ("antithetic", "lhs", "sobol"):
+        result = run_simulation(composition, denpasar_memory, {**params, "sampling": strategy}, runs=20_000, seed=6)
+        factors = result["sampling"]["variance_reduction"]
+        assert factors["mean"] > 1.5 and factors["p90"] > 1
+        assert result["sampling"]["effective_runs"]["mean"] == pytest.approx(20_000 * factors["mean"])
+        assert result["avg_duration"] == pytest.approx(plain["avg_duration"], rel=0.01)
+
+    with pytest.raises(ValueError):
+        run_simulation(composition, denpasar_memory, {**params, "sampling": "halton"}, runs=100)
+
+
+def test_incremental_resimulation_matches_fresh_run_and_recomputes_less(denpasar_memory):
+    from simulate.incremental import IncrementalSimulator
+
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+    params = base_params()
+    simulator = IncrementalSimulator(denpasar_memory, params, runs=4000, seed=3)
+    base = simulator.simulate(composition)
+    full = run_simulation(composition, denpasar_memory, params, runs=4000, seed=3)
+    assert base["avg_duration"] == pytest.approx(full["avg_duration"], rel=0.05)
+    assert base["incremental"]["forward"] == base["incremental"]["nodes"]
+
+    # Drop the last edge: only the affected modules are recomputed, on the same draws
+    from compose.compiled_composition import composition_payload
+    payload = composition_payload(composition)
+    edited = MemoryObject(
+        id=composition.id,
+        object_type="Composition",
+        jurisdiction=composition.jurisdiction,
+        data={**payload, "edges": payload["edges"][:-1]},
+    )
+    result = simulator.simulate(edited)
+    update = result.pop("incremental")
+    assert not update["full"] and update["redrawn"] == 0
+    assert update["forward"] < update["nodes"]
+
+    fresh = IncrementalSimulator(denpasar_memory, params, runs=4000, seed=3).simulate(edited)
+    fresh.pop("incremental")
+    assert result == fresh
+
+    # Undoing the edit restores the original result exactly
+    undone = simulator.simulate(composition)
+    undone.pop("incremental"); base.pop("incremental")
+    assert undone == base
+
+
+def test_reform_sweep_ranks_scenarios_on_common_draws(denpasar_memory):
+    from math import comb
+    from simulate.reform_sweep import run_reform_sweep, applicable_reforms
+    from compose.compiled_composition import compile_composition
+
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+    n_reforms = len(applicable_reforms(compile_composition(composition, denpasar_memory), denpasar_memory))
+    sweep = run_reform_sweep(
+        composition, denpasar_memory, base_params(), runs=5_000, max_combination=2, seed=4
+    )
+
+    assert sweep["runs"] == 5_000
+    assert sweep["baseline"]["reforms"] == []
+    assert sweep["baseline"]["days_saved"] == 0
+    assert len(sweep["scenarios"]) == comb(n_reforms, 1) + comb(n_reforms, 2)
+
+    saved = [row["days_saved"] for row in sweep["scenarios"]]
+    assert saved == sorted(saved, reverse=True)
+    for row in sweep["scenarios"]:
+        # Reforms only shorten durations, so every paired difference is ≥ 0
+        assert row["days_saved"] >= 0
+        assert row["ci_low"] <= row["days_saved"] <= row["ci_high"]
+
+
+def test_module_parameters_follow_module_data(denpasar_memory):
+    from compose.compiled_composition import compile_composition
+    from simulate.parameters import compile_parameters
+
+    composition = denpasar_memory.get_by_id(COMPOSITION_ID)
+    compiled = compile_composition(composition, denpasar_memory)
+    amdal = compiled.index["mod-denpasar-environmental-assessment"]
+    site = compiled.index["mod-denpasar-site-control"]
+
+    params = compile_parameters(
+        compiled, denpasar_memory, base_params(duration_model="triangular", module_risk=True, failure_rate=0.0)
+    )
+    assert params.mode[site] == 45
+    assert params.low[site] < 45 < params.high[site]
+    # AMDAL: FailureEvent severity 0.7, FeedbackLoop stability 0.5; site control has neither
+    assert params.fail_prob[amdal] == pytest.approx(0.7)
+    assert params.loop_prob[amdal] == pytest.approx(0.5)
+    assert params.fail_prob[site] == 0.0
+
+    # Lognormal durations keep each module's duration_days as their mean
+    result = run_simulation(
+        composition, denpasar_memory,
+        base_params(duration_model="lognormal", failure_rate=0.0, max_feedback_loops=0, apply_overrides=False),
+        runs=20_000, seed=8
+    )
+    total_days = sum(m.data["duration_days"] for m in compiled.permitting_modules().values())
+    assert result["avg_effort"] == pytest.approx(total_days, rel=0.01)
+
+
+def typed_composition(edges):
+    return MemoryObject(
+        id="composition-test-typed",
+        object_type="Composition",
+        data={"modules": ["mod-A", "mod-B"], "edges": edges},
+    )
+
+
+def test_kernel_applies_override_and_edge_semantics():
+    fixed = dict(task_duration_range=(100, 100), failure_rate=0.0)
+
+    # Deemed approval after 60 days caps A; B still waits for A
+    memory = mock_memory(["mod-A", "mod-B"])
+    memory.objects["override-A"] = MemoryObject(
+        id="override-A",
+        object_type="OverrideProtocol",
+        data={"module_id": "mod-A", "override_type": "timebound_default", "trigger_condition": {"value": "60_days"}},
+    )
+    chain = typed_composition([["mod-A", "mod-B"]])
+    assert run_simulation(chain, memory, base_params(**fixed), runs=10)["avg_duration"] == 160
+    uncapped = run_simulation(chain, memory, base_params(apply_overrides=False, **fixed), runs=10)
+    assert uncapped["avg_duration"] == 200
+
+    # An override edge releases B once A has run `override_days`
+    memory = mock_memory(["mod-A", "mod-B"])
+    override_edge = typed_composition([{"from_node": "mod-A", "to_node": "mod-B", "type": "override"}])
+    assert run_simulation(override_edge, memory, base_params(override_days=30, **fixed), runs=10)["avg_duration"] == 130
+
+    # A conditional edge that never holds imposes no wait
+    conditional = typed_composition([{"from_node": "mod-A", "to_node": "mod-B", "type": "conditional"}])
+    skipped = run_simulation(conditional, memory, base_params(conditional_skip_rate=1.0, **fixed), runs=10)
+    assert skipped["avg_duration"] == 100
+    assert skipped["slack"] == {"mod-A": 0.0, "mod-B": 0.0}
+    held = run_simulation(conditional, memory, base_params(conditional_skip_rate=0.0, **fixed), runs=10)
+    assert held["avg_duration"] == 200
+
+    # A feedback edge B → A that always fires redoes A..B twice (the loop cap)
+    feedback = typed_composition([
+        ["mod-A", "mod-B"],
+        {"from_node": "mod-B", "to_node": "mod-A", "type": "feedback_loop"},
+    ])
+    looped = run_simulation(feedback, memory, base_params(feedback_rate=1.0, **fixed), runs=10)
+    assert looped["avg_duration"] == 3 * 200
+    assert looped["slack"] == {"mod-A": 0.0, "mod-B": 0.0}
+
+
+def test_feedback_edge_to_a_non_ancestor_is_ignored(capsys):
+    # V sits deeper than U's chain start but is not upstream of U
+    memory = mock_memory(["mod-X", "mod-V", "mod-A", "mod-B", "mod-U"])
+    composition = MemoryObject(
+        id="composition-test-stray-feedback",
+        object_type="Composition",
+        data={
+            "modules": ["mod-X", "mod-V", "mod-A", "mod-B", "mod-U"],
+            "edges": [
+                ["mod-X", "mod-V"], ["mod-A", "mod-B"], ["mod-B", "mod-U"],
+                {"from_node": "mod-U", "to_node": "mod-V", "type": "feedback_loop"},
+            ],
+        },
+    )
+    fixed = dict(task_duration_range=(10, 10), failure_rate=0.0, feedback_rate=1.0)
+    result = run_simulation(composition, memory, base_params(**fixed), runs=10, use_cache=False)
+    assert "Ignoring feedback edge mod-U → mod-V" in capsys.readouterr().out
+    assert result["avg_duration"] == 30
+    assert result["slack"] == {"mod-X": 10.0, "mod-V": 10.0, "mod-A": 0.0, "mod-B": 0.0, "mod-U": 0.0}
+
+
+def test_result_records_reproduce_and_are_reused(tmp_path):
+    from simulate.result_record import params_hash
+
+    memory = mock_memory(["mod-A", "mod-B", "mod-C"])
+    memory.memory_path = tmp_path
+    composition = MemoryObject(
+        id="composition-test-record",
+        object_type="Composition",
+        data={"modules": ["mod-A", "mod-B", "mod-C"], "edges": [["mod-A", "mod-B"], ["mod-B", "mod-C"]]},
+    )
+
+    # An unseeded run reports the entropy it drew, which reproduces it exactly
+    fresh = run_simulation(composition, memory, base_params(), runs=2_000)
+    assert run_simulation(composition, memory, base_params(), runs=2_000, seed=fresh["seed"], use_cache=False) == fresh
+
+    first = run_simulation(composition, memory, base_params(), runs=2_000, seed=21, record=True)
+    saved = memory.get_by_id(first["record_id"])
+    assert saved.object_type == "SimulationResult"
+    assert (tmp_path / f"{saved.id}.json").exists()
+    assert saved.data["seed"] == 21
+    assert saved.data["params_hash"] == params_hash(base_params(task_duration_range=[5.0, 20.0]))
+    assert saved.data["data_digest"]
+
+    # Equivalent params hit the saved record; a different seed does not
+    def recomputed(obj):
+        raise RuntimeError("request was recomputed")
+
+    memory.save_object = recomputed
+    again = run_simulation(composition, memory, base_params(duration_model="uniform"), runs=2_000, seed=21, record=True)
+    assert again == first
+    with pytest.raises(RuntimeError):
+        run_simulation(composition, memory, base_params(), runs=2_000, seed=22, record=True)
+
+    # Nor is a record reused once the module data it ran on has changed
+    memory.objects["override-B"] = MemoryObject(
+        id="override-B",
+        object_type="OverrideProtocol",
+        data={"module_id": "mod-B", "override_type": "timebound_default", "trigger_condition": {"value": "3_days"}},
+    )
+    with pytest.raises(RuntimeError):
+        run_simulation(composition, memory, base_params(), runs=2_000, seed=21, record=True)
+
+
+def test_unseeded_runs_are_not_cached(isolated_result_cache):
+    from simulate.batch import run_simulation_batch
+
+    memory = mock_memory(["mod-A", "mod-B"])
+    composition = typed_composition([["mod-A", "mod-B"]])
+    run_simulation(composition, memory, base_params(), runs=200)
+    run_simulation_batch([composition], memory, base_params(), runs=200)
+    assert isolated_result_cache.misses == 0
+    assert not list(isolated_result_cache.directory.glob("*.json"))
+
+
+def test_result_cache_serves_repeats_from_memory_and_disk(isolated_result_cache, tmp_path):
+    from simulate.result_cache import ResultCache, configure_cache
+
+    memory = mock_memory(["mod-A", "mod-B"])
+    composition = typed_composition([["mod-A", "mod-B"]])
+
+    first = run_simulation(composition, memory, base_params(), runs=1_000, seed=5)
+    assert isolated_result_cache.misses == 1
+    assert run_simulation(composition, memory, base_params(), runs=1_000, seed=5) == first
+    assert isolated_result_cache.hits == 1
+    # Any change to runs, seed or params is a different key
+    run_simulation(composition, memory, base_params(), runs=1_001, seed=5)
+    run_simulation(composition, memory, base_params(failure_rate=0.2), runs=1_000, seed=5)
+    assert isolated_result_cache.misses == 3
+
+    # So is any change to the module data the composition resolves to
+    params = base_params(duration_model="triangular")
+    run_simulation(composition, memory, params, runs=1_000, seed=5)
+    edited = mock_memory(["mod-A", "mod-B"])
+    edited.objects["mod-B"] = MemoryObject(id="mod-B", object_type="PermittingModule", data={"duration_days": 900})
+    slower = run_simulation(composition, edited, params, runs=1_000, seed=5)
+    assert isolated_result_cache.misses == 5
+    assert slower == run_simulation(composition, edited, params, runs=1_000, seed=5, use_cache=False)
+
+    # A fresh process-wide cache over the same directory hits the disk tier
+    reloaded = configure_cache(isolated_result_cache.directory)
+    assert run_simulation(composition, memory, base_params(), runs=1_000, seed=5) == first
+    assert reloaded.hits == 1
+
+    # The disk tier evicts least recently used entries past its byte budget
+    small = ResultCache(tmp_path / "small", max_entries=1, max_bytes=1)
+    small.put("a", {"value": 1})
+    small.put("b", {"value": 2})
+    assert len(list(small.directory.glob("*.json"))) <= 1
+    assert small.get("a") is None
+
+
+def test_simulation_sees_module_edits_after_refresh(tmp_path):
+    import json
+    import os
+    import shutil
+
+    directory = tmp_path / "denpasar_v1"
+    shutil.copytree("library/domains/urban_permitting/denpasar_v1/", directory)
+    memory = PolarisMemory(directory)
+    composition = memory.get_by_id(COMPOSITION_ID)
+    params = base_params(duration_model="triangular")
+    before = run_simulation(composition, memory, params, runs=1_000, seed=2, use_cache=False)
+
+    module = directory / "mod-denpasar-final-inspections.json"
+    record = json.loads(module.read_text())
+    record["duration_days"] = 900
+    module.write_text(json.dumps(record))
+    stat = module.stat()
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    generation = memory.generation
+    assert memory.refresh()["updated"] == ["mod-denpasar-final-inspections"]
+    assert memory.generation > generation
+
+    after = run_simulation(composition, memory, params, runs=1_000, seed=2, use_cache=False)
+    assert after["avg_duration"] > before["avg_duration"] + 500
+    assert after == run_simulation(composition, PolarisMemory(directory), params, runs=1_000, seed=2, use_cache=False)
+
+
+def test_sensitivity_ranks_critical_chain_above_parallel_branch():
+    from simulate.sensitivity import run_sensitivity
+
+    memory = mock_memory(["mod-A", "mod-B", "mod-C", "mod-D"])
+    composition = MemoryObject(
+        id="composition-test-sensitivity",
+        object_type="Composition",
+        data={
+            "modules": ["mod-A", "mod-B", "mod-C", "mod-D"],
+            "edges": [["mod-A", "mod-B"], ["mod-B", "mod-C"]],
+        },
+    )
+    report = run_sensitivity(composition, memory, base_params(failure_rate=0.0), runs=4_000, delta=0.2, seed=3)
+
+    assert report["bottlenecks"][-1]["module_id"] == "mod-D"
+    chain = [report["modules"][mid] for mid in ("mod-A", "mod-B", "mod-C")]
+    for row in chain:
+        # Mean duration 12.5 days, always critical: ±20% moves the makespan ±2.5 days
+        assert row["duration_high"] == pytest.approx(2.5, abs=0.1)
+        assert row["duration_low"] == pytest.approx(-2.5, abs=0.1)
+        assert row["failure_swing"] == 0
+        assert row["first_order"] == pytest.approx(1 / 3, abs=0.1)
+        assert row["correlation"] == pytest.approx(3 ** -0.5, abs=0.1)
+    assert abs(report["modules"]["mod-D"]["duration_swing"]) < 0.1
+
+
+def test_sensitivity_keeps_override_caps():
+    from simulate.sensitivity import run_sensitivity
+
+    # B always runs 100 days but deemed approval ends it at 60: scaling can't move it
+    memory = mock_memory(["mod-A", "mod-B"])
+    memory.objects["override-B"] = MemoryObject(
+        id="override-B",
+        object_type="OverrideProtocol",
+        data={"module_id": "mod-B", "override_type": "timebound_default", "trigger_condition": {"value": "60_days"}},
+    )
+    composition = typed_composition([["mod-A", "mod-B"]])
+    fixed = base_params(task_duration_range=(100, 100), failure_rate=0.0)
+    report = run_sensitivity(composition, memory, fixed, runs=200, delta=0.2, seed=3)
+
+    assert report["modules"]["mod-B"]["duration_high"] == 0
+    assert report["modules"]["mod-B"]["duration_low"] == 0
+    assert report["modules"]["mod-A"]["duration_high"] == pytest.approx(20)
+    assert report["bottlenecks"][0]["module_id"] == "mod-A"
+
+
+def test_simulation_batch_matches_individual_runs(denpasar_memory, tmp_path):
+    import json
+    from simulate.batch import run_simulation_batch, select_compositions, write_batch_results
+
+    selected = select_compositions(denpasar_memory, ["composition-denpasar-*", "composition-test-empty"])
+    assert [c.id for c in selected] == sorted(c.id for c in selected)
+    assert COMPOSITION_ID in {c.id for c in selected}
+    assert select_compositions(denpasar_memory, jurisdiction="nowhere") == []
+
+    params = base_params()
+    rows = run_simulation_batch(selected, denpasar_memory, params, runs=12_000, seed=4, workers=2, use_cache=False)
+    by_id = {row["composition_id"]: row for row in rows}
+    assert by_id["composition-test-empty"]["error"] and by_id["composition-test-empty"]["result"] is None
+
+    single = run_simulation(denpasar_memory.get_by_id(COMPOSITION_ID), denpasar_memory, params, runs=12_000, seed=4)
+    assert by_id[COMPOSITION_ID]["result"] == single
+
+    # The individual run filled the cache, so a cached batch reuses it
+    cached = run_simulation_batch(selected, denpasar_memory, params, runs=12_000, seed=4)
+    assert {row["composition_id"]: row["cached"] for row in cached}[COMPOSITION_ID]
+
+    path = write_batch_results(rows, tmp_path / "batch.json", params)
+    columns = json.loads(path.read_text())["columns"]
+    assert columns["composition_id"] == [c.id for c in selected]
+    assert all(len(values) == len(selected) for values in columns.values())
+    assert columns["avg_duration"][columns["composition_id"].index(COMPOSITION_ID)] == single["avg_duration"]
+
+
+def test_capacity_simulation_queues_projects_at_shared_actors():
+    from simulate.capacity import run_capacity_simulation
+
+    memory = mock_memory(["mod-A", "mod-B"])
+    for mid in ("mod-A", "mod-B"):
+        memory.objects[mid].data["actor_responsible"] = "Agency"
+    chain = typed_composition([["mod-A", "mod-B"]])
+    params = base_params(task_duration_range=(5, 5), failure_rate=0.0)
+
+    # One reviewer, 10 days of work per project, a project every 20 days: no queue
+    idle = run_capacity_simulation(chain, memory, params, projects=10, arrival_rate=0.05, arrival_process="fixed")
+    assert idle["cycle_time"]["max"] == 10
+    assert idle["actors"]["Agency"]["max_queue_length"] == 0
+    assert idle["actors"]["Agency"]["offered_load"] == pytest.approx(0.5)
+    assert not idle["unstable"]
+
+    # A project a day into 10 days of serial work: the reviewer never idles
+    busy = run_capacity_simulation(chain, memory, params, projects=10, arrival_rate=1.0, arrival_process="fixed")
+    agency = busy["actors"]["Agency"]
+    assert agency["served"] == 20
+    assert agency["offered_load"] == pytest.approx(10)
+    assert busy["unstable"]
+    assert busy["horizon"] == 100
+    assert agency["utilization"] == pytest.approx(1.0)
+    assert busy["throughput"] == pytest.approx(10 / 100)
+    # On a chain, cycle time is service plus time queued
+    assert busy["mean_project_wait"] == pytest.approx(busy["cycle_time"]["mean"] - 10)
+    assert busy["mean_project_wait"] > 0
+    # Little's law: time-averaged queue length = total waiting / horizon
+    assert agency["mean_queue_length"] == pytest.approx(busy["mean_project_wait"] * 10 / 100)
+
+    # Enough reviewers remove all waiting
+    staffed = run_capacity_simulation(
+        chain, memory, params, projects=10, arrival_rate=1.0, arrival_process="fixed", actor_capacity={"agency": 10}
+    )
+    assert staffed["mean_project_wait"] == 0
+    assert staffed["cycle_time"]["mean"] == 10
+
+    for capacity in ({"default_capacity": 0}, {"actor_capacity": {"agency": 0}}):
+        with pytest.raises(ValueError):
+            run_capacity_simulation(chain, memory, params, projects=10, **capacity)
+
+
+def test_jurisdiction_comparison_pairs_aligned_roles(tmp_path):
+    import json
+    import shutil
+    from simulate.comparison import compare_jurisdictions, comparison_table, load_jurisdiction
+
+    source = Path("library/domains/urban_permitting/denpasar_v1/")
+    slower = tmp_path / "slower_v1"
+    shutil.copytree(source, slower)
+    site = slower / "mod-denpasar-site-control.json"
+    record = json.loads(site.read_text())
+    record["duration_days"] *= 2
+    site.write_text(json.dumps(record))
+
+    # Each directory is loaded and compiled once per process
+    assert load_jurisdiction(slower) is load_jurisdiction(str(slower))
+
+    params = base_params(duration_model="triangular")
+    report = compare_jurisdictions([(source, COMPOSITION_ID), (slower, None)], params, runs=2000, seed=5)
+    baseline, other = report["jurisdictions"]
+    assert other["composition_id"] == COMPOSITION_ID
+    assert baseline["difference"] == 0
+
+    # Shared role streams: only the slowed step differs, so the gap is tight
+    for role in report["roles"]:
+        durations = [module["mean_duration"] for module in role["modules"].values()]
+        if role["role"] == "functional_role:site eligibility verification":
+            assert durations[1] == pytest.approx(2 * durations[0])
+        else:
+            assert durations[0] == durations[1]
+    assert other["ci_low"] > 0
+    assert other["ci_high"] - other["ci_low"] < 0.05 * other["difference"]
+    assert other["difference"] == pytest.approx(other["avg_duration"] - baseline["avg_duration"])
+
+    table = comparison_table(report)
+    assert table[0] == {"row": "completion mean (days)", "denpasar_v1": baseline["avg_duration"], "slower_v1": other["avg_duration"]}
+    assert len(table) == 3 + len(report["roles"])